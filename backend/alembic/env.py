@@ -4,7 +4,7 @@ from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 
 from alembic import context
-from app.models import job, user
+from app.models import job, salary_sketch, user
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
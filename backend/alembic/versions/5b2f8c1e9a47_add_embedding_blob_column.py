@@ -0,0 +1,32 @@
+"""Add embedding blob column
+
+Revision ID: 5b2f8c1e9a47
+Revises: d1d0021aa485
+Create Date: 2026-10-18 10:12:31.418206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2f8c1e9a47'
+down_revision: Union[str, None] = 'd1d0021aa485'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Existing JSON vectors stay in the ``embedding`` column until
+    ``python -m app.scripts.backfill_embedding_blobs`` converts them.
+    """
+    op.add_column('job_postings', sa.Column('embedding_blob', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('job_postings', 'embedding_blob')
@@ -0,0 +1,70 @@
+"""Add parsed salary, experience and state columns
+
+Revision ID: 9c3e7a2d4b61
+Revises: 5b2f8c1e9a47
+Create Date: 2026-10-18 16:40:12.902317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.job_facts import job_facts
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3e7a2d4b61'
+down_revision: Union[str, None] = '5b2f8c1e9a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Adds the columns parsed from ``salary_range``, ``experience`` and ``location``,
+    indexes ``job_title`` and backfills every existing row.
+    """
+    op.add_column('job_postings', sa.Column('salary_min', sa.Float(), nullable=True))
+    op.add_column('job_postings', sa.Column('salary_max', sa.Float(), nullable=True))
+    op.add_column('job_postings', sa.Column('experience_min', sa.Integer(), nullable=True))
+    op.add_column('job_postings', sa.Column('experience_max', sa.Integer(), nullable=True))
+    op.add_column('job_postings', sa.Column('state', sa.String(), nullable=True))
+    op.create_index('ix_job_postings_job_title', 'job_postings', ['job_title'])
+
+    jobs = sa.table(
+        'job_postings',
+        sa.column('id', sa.Integer), sa.column('salary_range', sa.String),
+        sa.column('experience', sa.String), sa.column('location', sa.String),
+        sa.column('salary_min', sa.Float), sa.column('salary_max', sa.Float),
+        sa.column('experience_min', sa.Integer), sa.column('experience_max', sa.Integer),
+        sa.column('state', sa.String),
+    )
+    bind = op.get_bind()
+    last_id = None
+    while True:
+        query = sa.select(jobs.c.id, jobs.c.salary_range, jobs.c.experience, jobs.c.location).order_by(jobs.c.id)
+        if last_id is not None:
+            query = query.where(jobs.c.id > last_id)
+        rows = bind.execute(query.limit(BACKFILL_BATCH_SIZE)).fetchall()
+        if not rows:
+            break
+        bind.execute(
+            jobs.update().where(jobs.c.id == sa.bindparam('job_id')),
+            [{'job_id': job_id, **job_facts(salary_range, experience, location)}
+             for job_id, salary_range, experience, location in rows],
+        )
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_postings_job_title', table_name='job_postings')
+    op.drop_column('job_postings', 'state')
+    op.drop_column('job_postings', 'experience_max')
+    op.drop_column('job_postings', 'experience_min')
+    op.drop_column('job_postings', 'salary_max')
+    op.drop_column('job_postings', 'salary_min')
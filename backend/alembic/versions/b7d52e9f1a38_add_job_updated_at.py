@@ -0,0 +1,34 @@
+"""Add job updated_at marker
+
+Revision ID: b7d52e9f1a38
+Revises: e4a81c6f3d27
+Create Date: 2026-10-18 20:12:31.540918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d52e9f1a38'
+down_revision: Union[str, None] = 'e4a81c6f3d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Adds ``updated_at``, stamped on every ORM insert and update. Existing rows stay NULL:
+    the text index already covers them through its id catch-up.
+    """
+    op.add_column('job_postings', sa.Column('updated_at', sa.Float(), nullable=True))
+    op.create_index('ix_job_postings_updated_at', 'job_postings', ['updated_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_postings_updated_at', table_name='job_postings')
+    op.drop_column('job_postings', 'updated_at')
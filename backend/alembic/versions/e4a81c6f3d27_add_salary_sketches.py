@@ -0,0 +1,43 @@
+"""Add salary sketches table
+
+Revision ID: e4a81c6f3d27
+Revises: 9c3e7a2d4b61
+Create Date: 2026-10-18 18:05:47.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a81c6f3d27'
+down_revision: Union[str, None] = '9c3e7a2d4b61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Creates ``salary_sketches`` unless the app's ``create_all`` already did. The sketches of
+    existing jobs are filled by ``python -m app.scripts.build_salary_sketches``, which reads the
+    current models, so this revision does not depend on them.
+    """
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('salary_sketches'):
+        op.create_table(
+            'salary_sketches',
+            sa.Column('job_title', sa.String(), nullable=False),
+            sa.Column('kind', sa.String(), nullable=False),
+            sa.Column('bucket', sa.String(), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.Column('data', sa.LargeBinary(), nullable=False),
+            sa.PrimaryKeyConstraint('job_title', 'kind', 'bucket'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('salary_sketches')
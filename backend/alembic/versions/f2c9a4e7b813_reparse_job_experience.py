@@ -0,0 +1,68 @@
+"""Re-parse job experience ranges
+
+Revision ID: f2c9a4e7b813
+Revises: b7d52e9f1a38
+Create Date: 2026-10-18 21:03:58.204117
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c9a4e7b813'
+down_revision: Union[str, None] = 'b7d52e9f1a38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+EXPERIENCE_YEARS = re.compile(r"\d+")
+
+
+# Experience rule as of this revision (kept here so later changes to job_facts do not change it):
+# one number -> (n, None), exactly two -> a range, anything else -> (None, None)
+def parse_experience_range(text):
+    if not isinstance(text, str):
+        return None, None
+    years = [int(y) for y in EXPERIENCE_YEARS.findall(text)]
+    if len(years) == 1:
+        return years[0], None
+    if len(years) == 2:
+        return years[0], years[1]
+    return None, None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Recomputes ``experience_min``/``experience_max`` now that values with more than two
+    numbers have no range (as in the old progression chart). The salary sketches are bucketed
+    by experience, so run ``python -m app.scripts.build_salary_sketches`` afterwards.
+    """
+    jobs = sa.table(
+        'job_postings',
+        sa.column('id', sa.Integer), sa.column('experience', sa.String),
+        sa.column('experience_min', sa.Integer), sa.column('experience_max', sa.Integer),
+    )
+    bind = op.get_bind()
+    last_id = None
+    while True:
+        query = sa.select(jobs.c.id, jobs.c.experience).order_by(jobs.c.id)
+        if last_id is not None:
+            query = query.where(jobs.c.id > last_id)
+        rows = bind.execute(query.limit(BACKFILL_BATCH_SIZE)).fetchall()
+        if not rows:
+            break
+        bind.execute(
+            jobs.update().where(jobs.c.id == sa.bindparam('job_id')),
+            [dict(zip(('job_id', 'experience_min', 'experience_max'), (job_id, *parse_experience_range(experience))))
+             for job_id, experience in rows],
+        )
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    """Downgrade schema (the parsed values stay as they are)."""
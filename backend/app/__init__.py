@@ -0,0 +1,5 @@
+# Load .env once, before any app module reads its configuration from the environment.
+# Every entry point (the API, the scripts, the inference sidecar) imports this package first.
+from dotenv import load_dotenv
+
+load_dotenv()
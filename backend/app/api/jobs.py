@@ -1,11 +1,12 @@
 # This file defines the API routes for job-related operations.
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.db.database import SessionLocal
-from app.schemas.job import JobOut, JobCreate, JobUpdate
+from app.schemas.job import JobOut, JobCreate, JobUpdate, JobNearbyOut
 from app.services import job_crud
+from app.services.salary_sketches import get_salary_distribution
 
 # The router is created with a prefix and tags for organization.
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
@@ -23,6 +24,30 @@ def get_db():
 def list_jobs(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
     return job_crud.get_jobs(db, skip, limit) # List all jobs with pagination
 
+# List jobs within radius_km of a point, nearest first (declared before /{job_id})
+@router.get("/nearby", response_model=List[JobNearbyOut])
+def list_jobs_nearby(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(50.0, gt=0),
+    skip: int = 0,
+    limit: int = 10,
+    db: Session = Depends(get_db),
+):
+    nearby = job_crud.get_jobs_near(db, lat, lon, radius_km, skip, limit) # Spatial index lookup
+    return [
+        JobNearbyOut(**JobOut.model_validate(job).model_dump(), distance_km=round(distance, 2))
+        for job, distance in nearby
+    ]
+
+# Salary percentiles and histograms of a job title by state and by experience (declared before /{job_id})
+@router.get("/salary-distribution")
+def salary_distribution(title: str = Query(..., min_length=1), db: Session = Depends(get_db)):
+    distribution = get_salary_distribution(db, title) # Read the precomputed sketches of the title
+    if not distribution:
+        raise HTTPException(status_code=404, detail="No salary data for this job title")
+    return distribution
+
 # Get a specific job by ID
 @router.get("/{job_id}", response_model=JobOut)
 def get_job(job_id: int, db: Session = Depends(get_db)):
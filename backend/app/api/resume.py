@@ -1,20 +1,157 @@
 # This file defines the API routes for resume-related operations.
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from app.services.resume_matcher import process_resume_and_match_jobs
+import asyncio
+import json
+import time
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from app.schemas.job import JobMatchFilters
+from app.services.embeddings import embedding_cache
+from app.services.llm_cache import llm_cache
+from app.services.resume_matcher import match_request_pool, process_resume_and_match_jobs, process_resumes_batch
+from app.services.task_queue import RETRY_AFTER_SECONDS, QueueFullError, resume_tasks
 
 # The router is created with a prefix and tags for organization.
 router = APIRouter(prefix="/resume", tags=["Resume"])
 
+# Optional filters applied to the jobs before they are scored, read from the form fields of
+# every matching route
+def match_filters(
+    work_type: Optional[str] = Form(None),
+    country: Optional[str] = Form(None),
+    min_salary: Optional[float] = Form(None),
+    posted_after: Optional[date] = Form(None),
+    latitude: Optional[float] = Form(None),
+    longitude: Optional[float] = Form(None),
+    radius_km: Optional[float] = Form(None),
+) -> JobMatchFilters:
+    return JobMatchFilters(
+        work_type=work_type, country=country, min_salary=min_salary, posted_after=posted_after,
+        latitude=latitude, longitude=longitude, radius_km=radius_km,
+    )
+
 # Define the API route for resume matching
 @router.post("/match")
-async def match_resume(file: UploadFile = File(...)):
+async def match_resume(
+    file: UploadFile = File(...),
+    filters: JobMatchFilters = Depends(match_filters),
+):
     if not file.filename.endswith(".pdf"): # Check if the file is a PDF
         raise HTTPException(status_code=400, detail="Only PDF resumes are supported.") # Raise an error if not a PDF
 
     resume_bytes = await file.read() # Read the file content
 
     try:
-        result = process_resume_and_match_jobs(resume_bytes) # Process the resume and match jobs
+        # Process the resume and match jobs on the matcher's own threads, keeping the event loop free
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(match_request_pool, process_resume_and_match_jobs, resume_bytes, filters)
         return result # Return the matching jobs
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing resume: {e}") # Raise an error if processing fails
+
+# Format one server-sent event
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+# Define the API route streaming the match response as server-sent events, one per section as
+# soon as it is ready: resume_skills, resumeProfile, word_cloud_skills_freq, matches (embedding
+# order), rerank (Gemini fields patched into the matches), salaryTrend, then done or error
+@router.post("/match/stream")
+async def match_resume_stream(
+    file: UploadFile = File(...),
+    filters: JobMatchFilters = Depends(match_filters),
+):
+    if not file.filename.endswith(".pdf"): # Check if the file is a PDF
+        raise HTTPException(status_code=400, detail="Only PDF resumes are supported.")
+
+    resume_bytes = await file.read()
+
+    # Pipeline threads hand sections to the event loop through this queue; None ends the stream
+    loop = asyncio.get_running_loop()
+    sections = asyncio.Queue()
+
+    def emit(event, data):
+        loop.call_soon_threadsafe(sections.put_nowait, (event, data))
+
+    def run():
+        start = time.perf_counter()
+        try:
+            process_resume_and_match_jobs(resume_bytes, filters, emit)
+            emit("done", {"seconds": round(time.perf_counter() - start, 3)})
+        except Exception as e:
+            emit("error", {"detail": f"Error processing resume: {e}"})
+        finally:
+            emit(None, None)
+
+    async def events():
+        while True:
+            event, data = await sections.get()
+            if event is None:
+                break
+            yield sse_event(event, data)
+
+    loop.run_in_executor(match_request_pool, run)
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# Define the API route for matching many resumes in one request
+@router.post("/match/batch")
+async def match_resume_batch(
+    files: List[UploadFile] = File(...),
+    filters: JobMatchFilters = Depends(match_filters),
+):
+    for file in files:
+        if not file.filename.endswith(".pdf"): # Check that every file is a PDF
+            raise HTTPException(status_code=400, detail=f"Only PDF resumes are supported ({file.filename}).")
+
+    resume_bytes = [await file.read() for file in files] # Read every file
+
+    start = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(match_request_pool, process_resumes_batch, resume_bytes, filters) # Process all resumes together
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing resumes: {e}")
+    seconds = time.perf_counter() - start
+
+    # Report throughput so batch sizes can be tuned
+    throughput = len(files) / seconds if seconds > 0 else 0.0
+    print(f"📈 Batch matched {len(files)} resumes in {seconds:.2f}s ({throughput:.2f} resumes/s)")
+    return {
+        "results": [{"filename": file.filename, **result} for file, result in zip(files, results)],
+        "stats": {"resumes": len(files), "seconds": round(seconds, 3), "resumesPerSecond": round(throughput, 3)},
+    }
+
+# Define the API route queueing a resume for matching; poll GET /resume/tasks/{task_id} for the result
+@router.post("/tasks", status_code=202)
+async def submit_resume_task(
+    file: UploadFile = File(...),
+    filters: JobMatchFilters = Depends(match_filters),
+):
+    if not file.filename.endswith(".pdf"): # Check if the file is a PDF
+        raise HTTPException(status_code=400, detail="Only PDF resumes are supported.")
+
+    resume_bytes = await file.read()
+
+    try:
+        task_id = resume_tasks.submit(process_resume_and_match_jobs, resume_bytes, filters)
+    except QueueFullError as e:
+        # Backpressure: the client should retry later instead of holding a connection open
+        raise HTTPException(status_code=429, detail=f"Too many resumes in progress: {e}",
+                            headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+    return {"taskId": task_id, "status": "queued", "statusUrl": f"{router.prefix}/tasks/{task_id}"}
+
+# Define the API route returning a queued task's status, and its result once done
+@router.get("/tasks/{task_id}")
+def get_resume_task(task_id: str):
+    task = resume_tasks.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found or expired.")
+    return task
+
+# Define the API route reporting cache hit rates
+@router.get("/cache-stats")
+def cache_stats():
+    return {"embeddings": embedding_cache.stats(), "llm": llm_cache.stats()}
@@ -0,0 +1,52 @@
+# Custom column types shared by the ORM models.
+import os
+import struct
+import numpy as np
+from sqlalchemy.types import TypeDecorator, LargeBinary
+
+# Embedding blob layout: magic, format version, dtype code, dimension, then the raw
+# little-endian vector. float16 halves the storage at a small precision cost.
+EMBEDDING_MAGIC = b"EV"
+EMBEDDING_VERSION = 1
+EMBEDDING_HEADER = struct.Struct("<2sBBI")
+EMBEDDING_DTYPES = {0: np.dtype("<f4"), 1: np.dtype("<f2")}
+EMBEDDING_DTYPE_CODES = {"float32": 0, "float16": 1}
+EMBEDDING_STORAGE_DTYPE = os.getenv("EMBEDDING_STORAGE_DTYPE", "float32")
+
+
+# Pack a vector into the binary embedding format
+def pack_embedding(vector, dtype: str = EMBEDDING_STORAGE_DTYPE) -> bytes:
+    code = EMBEDDING_DTYPE_CODES[dtype]
+    values = np.asarray(vector, dtype=EMBEDDING_DTYPES[code]).ravel()
+    return EMBEDDING_HEADER.pack(EMBEDDING_MAGIC, EMBEDDING_VERSION, code, values.shape[0]) + values.tobytes()
+
+
+# Unpack a binary embedding into a float32 vector, validating the header
+def unpack_embedding(blob: bytes) -> np.ndarray:
+    if len(blob) < EMBEDDING_HEADER.size:
+        raise ValueError("Embedding blob is too short")
+    magic, version, code, dim = EMBEDDING_HEADER.unpack_from(blob)
+    if magic != EMBEDDING_MAGIC or version != EMBEDDING_VERSION:
+        raise ValueError(f"Unsupported embedding header {magic!r} v{version}")
+    if code not in EMBEDDING_DTYPES:
+        raise ValueError(f"Unknown embedding dtype code {code}")
+    dtype = EMBEDDING_DTYPES[code]
+    if len(blob) != EMBEDDING_HEADER.size + dim * dtype.itemsize:
+        raise ValueError(f"Embedding blob size does not match dimension {dim}")
+    return np.frombuffer(blob, dtype=dtype, count=dim, offset=EMBEDDING_HEADER.size).astype(np.float32)
+
+
+# Column type storing vectors as packed binary; reads return float32 numpy arrays
+class EmbeddingBlob(TypeDecorator):
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return pack_embedding(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return unpack_embedding(value)
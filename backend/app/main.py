@@ -1,15 +1,25 @@
 # This file is the main entry point for the FastAPI application.
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from app.auth import auth_router
 from app.api import jobs, resume
 from app.db.database import Base, engine
+from app.services.model_registry import MODEL_WARMUP, models
 from fastapi.middleware.cors import CORSMiddleware
 
 # Create all tables in the database
 Base.metadata.create_all(bind=engine)
 
+# Models load lazily; optionally warm them up in the background once the app is serving
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if MODEL_WARMUP:
+        models.start_warmup()
+    yield
+
 # Create an instance of FastAPI
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Middleware to handle CORS (Cross-Origin Resource Sharing)
 app.add_middleware(
@@ -30,6 +40,12 @@ app.include_router(jobs.router)
 async def root():
     return {"message": "Hello World"}
 
+# Readiness probe: 503 until the background model warmup has finished
+@app.get("/ready")
+async def ready():
+    body = {"ready": models.ready(), "models": models.status()}
+    return JSONResponse(body, status_code=200 if body["ready"] else 503)
+
 # Define a simple endpoint to say hello for testing
 @app.get("/hello/{name}")
 async def say_hello(name: str):
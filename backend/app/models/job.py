@@ -1,5 +1,10 @@
-from sqlalchemy import Column, String, Integer, Float, Date, JSON
+import time
+from sqlalchemy import Column, String, Integer, Float, Date, JSON, event
+from sqlalchemy.orm import Session, deferred
 from app.db.database import Base
+from app.db.types import EmbeddingBlob
+from app.services.job_facts import apply_job_facts
+from app.services.salary_sketches import update_salary_sketches
 
 # JobPosting model
 class JobPosting(Base):
@@ -19,7 +24,7 @@ class JobPosting(Base):
     preference = Column(String)
     contact_person = Column(String)
     contact = Column(String)
-    job_title = Column(String)
+    job_title = Column(String, index=True)
     role = Column(String)
     job_portal = Column(String)
     job_description = Column(String)
@@ -28,4 +33,24 @@ class JobPosting(Base):
     responsibilities = Column(String)
     company = Column(String)
     company_profile = Column(JSON)  # <- parsed dict
-    embedding = Column(JSON, nullable=True)
\ No newline at end of file
+    embedding = Column("embedding_blob", EmbeddingBlob, nullable=True)  # <- packed float32 vector
+    salary_min = Column(Float)  # <- parsed from salary_range, in dollars (see job_facts)
+    salary_max = Column(Float)
+    experience_min = Column(Integer)  # <- parsed from experience, in years
+    experience_max = Column(Integer)
+    state = Column(String)  # <- from location
+    updated_at = Column(Float, index=True)  # <- epoch seconds of the last ORM insert or update
+    legacy_embedding = deferred(Column("embedding", JSON(none_as_null=True), nullable=True))  # <- pre-blob JSON vectors, see backfill_embedding_blobs
+
+# Keep the parsed columns in step with the raw fields, and stamp the row, on every ORM insert and update
+@event.listens_for(JobPosting, "before_insert")
+@event.listens_for(JobPosting, "before_update")
+def refresh_job_facts(mapper, connection, job):
+    apply_job_facts(job)
+    job.updated_at = time.time()
+
+# Keep the salary sketches in step with every ORM flush of jobs (API CRUD and loaders alike)
+@event.listens_for(Session, "before_flush")
+def track_salary_sketches(session, flush_context, instances):
+    jobs = lambda objects: [obj for obj in objects if isinstance(obj, JobPosting)]
+    update_salary_sketches(session, jobs(session.new), jobs(session.dirty), jobs(session.deleted))
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, Integer, LargeBinary
+from app.db.database import Base
+
+# SalarySketch model: one quantile sketch of mean job salaries per (title, kind, bucket)
+class SalarySketch(Base):
+    __tablename__ = "salary_sketches"
+
+    job_title = Column(String, primary_key=True)
+    kind = Column(String, primary_key=True)    # <- "state" or "experience"
+    bucket = Column(String, primary_key=True)  # <- state code or mean years of experience
+    count = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)  # <- packed DDSketch buckets, see salary_sketches
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
+from datetime import date
 
 
 # Helper to convert snake_case to camelCase
@@ -40,3 +41,26 @@ class JobOut(JobBase):
         alias_generator=to_camel,
         populate_by_name=True
     )
+
+# Optional structured filters applied before resume matching
+class JobMatchFilters(BaseModel):
+    work_type: Optional[str] = None
+    country: Optional[str] = None
+    min_salary: Optional[float] = None  # yearly, in dollars
+    posted_after: Optional[date] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    radius_km: Optional[float] = None  # only jobs within this distance of (latitude, longitude)
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
+
+    # True if no filter is set
+    def is_empty(self) -> bool:
+        return all(value is None or value == "" for value in self.model_dump().values())
+
+# Job returned by the radius search, with its distance from the query point
+class JobNearbyOut(JobOut):
+    distance_km: float
@@ -0,0 +1,63 @@
+# This script converts embeddings stored in the legacy JSON column into packed binary blobs.
+# Rows are processed in id order in small batches, so it can be stopped and rerun at any time.
+# Rows that fail to convert keep their JSON value and are reported.
+import json
+import numpy as np
+from sqlalchemy import type_coerce, Text
+from sqlalchemy.orm import Session
+from app.db.database import SessionLocal
+from app.models.job import JobPosting
+
+# Constants
+BATCH_SIZE = 1000
+
+# Function to move every JSON embedding into the blob column
+def backfill_embedding_blobs():
+    db: Session = SessionLocal()
+    last_id = 0
+    converted = 0
+    failed = 0
+
+    # Read the JSON as text so one malformed row is reported instead of aborting the batch
+    raw_json = type_coerce(JobPosting.legacy_embedding, Text)
+
+    while True:
+        # Keyset pagination: only read the next batch of rows still holding a JSON vector
+        rows = (
+            db.query(JobPosting.id, raw_json)
+            .filter(JobPosting.id > last_id, JobPosting.legacy_embedding != None)
+            .order_by(JobPosting.id)
+            .limit(BATCH_SIZE)
+            .all()
+        )
+        if not rows:
+            break
+
+        updates = []
+        for job_id, raw in rows:
+            try:
+                raw = json.loads(raw)
+                # Some loaders stored the list double-encoded as a JSON string
+                if isinstance(raw, str):
+                    raw = json.loads(raw)
+                vector = np.asarray(raw, dtype=np.float32)
+                if vector.ndim != 1 or not np.isfinite(vector).all():
+                    raise ValueError(f"Unexpected shape {vector.shape} or non-finite values")
+                updates.append({"id": job_id, "embedding": vector, "legacy_embedding": None})
+            except Exception as e:
+                failed += 1
+                print(f"❌ Job {job_id} could not be converted: {e}")
+
+        # Write the blob and clear the JSON copy in the same transaction
+        db.bulk_update_mappings(JobPosting, updates)
+        db.commit()
+        converted += len(updates)
+        last_id = rows[-1][0]
+        print(f"📦 Converted {converted} embeddings (last id {last_id})")
+
+    db.close()
+    print(f"✅ Backfill complete: {converted} converted, {failed} failed.")
+
+# Run the function if this script is executed directly
+if __name__ == "__main__":
+    backfill_embedding_blobs()
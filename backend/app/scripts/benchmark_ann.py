@@ -0,0 +1,76 @@
+# This script compares the IVF index against exact search and reports recall@100 and latency
+# for a range of nprobe values, so we can pick the operating point for JOB_INDEX_NPROBE.
+import argparse
+import time
+import numpy as np
+from app.db.database import SessionLocal
+from app.services.ann_index import ExactSearcher, IVFSearcher
+from app.services.job_index import JobEmbeddingIndex, normalize_rows
+
+# Constants
+TOP_K = 100
+NPROBE_VALUES = [1, 2, 4, 8, 16, 32, 64, 128]
+
+# Load the job matrix from the database, or generate a clustered synthetic catalog
+def load_matrix(synthetic: int, dim: int = 384, seed: int = 0) -> np.ndarray:
+    if synthetic:
+        rng = np.random.default_rng(seed)
+        centers = rng.normal(size=(max(1, synthetic // 500), dim))
+        matrix = centers[rng.integers(0, centers.shape[0], synthetic)] + 0.5 * rng.normal(size=(synthetic, dim))
+        return normalize_rows(matrix)
+    db = SessionLocal()
+    index = JobEmbeddingIndex()
+    index.build(db)
+    db.close()
+    return index.matrix
+
+# Queries are perturbed catalog rows, which resembles a resume close to a few postings
+def make_queries(matrix: np.ndarray, n_queries: int, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    rows = matrix[rng.integers(0, matrix.shape[0], n_queries)]
+    return normalize_rows(rows + 0.3 * rng.normal(size=rows.shape) / np.sqrt(matrix.shape[1]))
+
+# Time a searcher over all queries and return (results, latencies in ms)
+def run(searcher, queries: np.ndarray, **kwargs):
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        positions, _ = searcher.search(query, TOP_K, **kwargs)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(positions)
+    return results, np.array(latencies)
+
+# Main benchmark
+def benchmark_ann(synthetic: int = 0, n_queries: int = 200, n_lists: int = None):
+    matrix = load_matrix(synthetic)
+    if matrix.shape[0] == 0:
+        print("⚠️ No job embeddings found.")
+        return
+    queries = make_queries(matrix, n_queries)
+
+    start = time.perf_counter()
+    ivf = IVFSearcher.build(matrix, n_lists=n_lists)
+    print(f"🧭 Built IVF with {ivf.n_lists} lists over {matrix.shape[0]} jobs in {time.perf_counter() - start:.2f}s")
+
+    exact_results, exact_latency = run(ExactSearcher(matrix), queries)
+    print(f"\n{'mode':<14}{'recall@100':>12}{'p50 ms':>10}{'p95 ms':>10}")
+    print(f"{'exact':<14}{1.0:>12.3f}{np.percentile(exact_latency, 50):>10.2f}{np.percentile(exact_latency, 95):>10.2f}")
+
+    for nprobe in NPROBE_VALUES:
+        if nprobe > ivf.n_lists:
+            break
+        results, latency = run(ivf, queries, nprobe=nprobe)
+        recall = np.mean([
+            len(np.intersect1d(found, truth)) / max(1, len(truth))
+            for found, truth in zip(results, exact_results)
+        ])
+        label = f"ivf nprobe={nprobe}"
+        print(f"{label:<14}{recall:>12.3f}{np.percentile(latency, 50):>10.2f}{np.percentile(latency, 95):>10.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="IVF vs exact search recall/latency report")
+    parser.add_argument("--synthetic", type=int, default=0, help="benchmark a synthetic catalog of this many jobs instead of the database")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--lists", type=int, default=None)
+    args = parser.parse_args()
+    benchmark_ann(args.synthetic, args.queries, args.lists)
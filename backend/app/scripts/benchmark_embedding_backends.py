@@ -0,0 +1,92 @@
+# This script checks the int8 ONNX embedding backend against the PyTorch model and times both.
+# Parity: cosine similarity between the two vectors for each sample text, plus agreement of the
+# nearest neighbours among the samples. Speed: single-text latency (the resume request path) and
+# batch throughput (compute_job_embeddings). Exits with status 1 when parity is below threshold.
+import argparse
+import sys
+import time
+import numpy as np
+from app.db.database import SessionLocal
+from app.models.job import JobPosting
+from app.services.embedding_cache import normalize_skills
+from app.services.embeddings import OnnxEmbeddingBackend, TorchEmbeddingBackend
+
+# Constants
+MIN_MEAN_COSINE = 0.99
+MIN_WORST_COSINE = 0.97
+TOP_K = 10
+FALLBACK_TEXTS = [
+    "python, sql, machine learning", "java, spring boot, microservices", "excel, financial modeling",
+    "react, typescript, css", "kubernetes, docker, aws, terraform", "customer service, sales",
+    "deep learning, pytorch, computer vision", "accounting, bookkeeping, quickbooks",
+]
+
+# Normalized skill lists from the job table (the texts the API actually encodes)
+def load_texts(limit: int) -> list[str]:
+    db = SessionLocal()
+    rows = db.query(JobPosting.skills).filter(JobPosting.skills != None).limit(limit).all()
+    db.close()
+    texts = list(dict.fromkeys(normalize_skills(skills) for (skills,) in rows if skills))
+    return [t for t in texts if t] or FALLBACK_TEXTS
+
+# Per-text latency (ms) of one-text encode calls
+def single_latencies(backend, texts: list[str], repeats: int) -> np.ndarray:
+    latencies = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        backend.encode([texts[i % len(texts)]])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies)
+
+# Texts per second of one batched encode over all samples
+def throughput(backend, texts: list[str], batch_size: int) -> float:
+    start = time.perf_counter()
+    backend.encode(texts, batch_size=batch_size)
+    return len(texts) / (time.perf_counter() - start)
+
+# Main benchmark
+def benchmark_embedding_backends(limit: int = 2000, repeats: int = 200, batch_size: int = 64) -> bool:
+    texts = load_texts(limit)
+    torch_backend, onnx_backend = TorchEmbeddingBackend(), OnnxEmbeddingBackend()
+    print(f"🧮 {len(texts)} distinct skill texts")
+
+    # Parity of the vectors themselves and of the neighbours they produce
+    reference = torch_backend.encode(texts, batch_size=batch_size)
+    quantized = onnx_backend.encode(texts, batch_size=batch_size)
+    cosine = np.sum(reference * quantized, axis=1)
+    k = min(TOP_K, len(texts) - 1)
+    overlap = 0.0
+    if k > 0:
+        ref_top = np.argsort(-(reference @ reference.T), axis=1)[:, 1:k + 1]
+        int8_top = np.argsort(-(quantized @ quantized.T), axis=1)[:, 1:k + 1]
+        overlap = np.mean([len(np.intersect1d(a, b)) / k for a, b in zip(ref_top, int8_top)])
+    print(f"🎯 cosine(torch, onnx-int8): mean {cosine.mean():.4f}, p1 {np.percentile(cosine, 1):.4f}, "
+          f"min {cosine.min():.4f}; top-{k} neighbour overlap {overlap:.3f}")
+
+    # Warm up both backends before timing
+    for backend in (torch_backend, onnx_backend):
+        backend.encode(texts[:batch_size], batch_size=batch_size)
+
+    print(f"\n{'backend':<12}{'p50 ms':>9}{'p99 ms':>9}{'texts/s':>10}")
+    results = {}
+    for backend in (torch_backend, onnx_backend):
+        latency = single_latencies(backend, texts, repeats)
+        rate = throughput(backend, texts, batch_size)
+        results[backend.name] = (np.percentile(latency, 50), rate)
+        print(f"{backend.name:<12}{np.percentile(latency, 50):>9.2f}{np.percentile(latency, 99):>9.2f}{rate:>10.1f}")
+    torch_p50, torch_rate = results[torch_backend.name]
+    onnx_p50, onnx_rate = results[onnx_backend.name]
+    print(f"⚡ onnx-int8: {torch_p50 / onnx_p50:.2f}x lower p50 latency, {onnx_rate / torch_rate:.2f}x throughput")
+
+    passed = cosine.mean() >= MIN_MEAN_COSINE and cosine.min() >= MIN_WORST_COSINE
+    print("✅ Parity check passed." if passed else
+          f"❌ Parity check failed (need mean >= {MIN_MEAN_COSINE}, min >= {MIN_WORST_COSINE}).")
+    return passed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ONNX int8 vs PyTorch embedding parity and speed report")
+    parser.add_argument("--limit", type=int, default=2000, help="job skill lists sampled from the database")
+    parser.add_argument("--repeats", type=int, default=200, help="single-text encodes timed per backend")
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+    sys.exit(0 if benchmark_embedding_backends(args.limit, args.repeats, args.batch_size) else 1)
@@ -0,0 +1,92 @@
+# This script measures how resume uploads affect the latency of other API requests.
+# It drives the app in-process over ASGI: a probe requests /jobs back to back, first alone and
+# then while several clients keep uploading a resume to /resume/match. If a match request
+# blocks the event loop, the /jobs p99 under load grows to the length of a whole match.
+import argparse
+import asyncio
+import time
+import numpy as np
+import httpx
+from app.main import app
+
+# Constants
+PROBE_PATH = "/jobs/?limit=10"
+SAMPLE_RESUME_TEXT = (
+    "Jane Doe - Data Engineer\n"
+    "Skills: Python, SQL, Apache Spark, Airflow, AWS, Docker, Kubernetes, machine learning\n"
+    "Experience: 5 years building data pipelines and analytics dashboards."
+)
+
+# A one-page PDF with a sample resume, for runs without --pdf
+def sample_pdf() -> bytes:
+    import fitz
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), SAMPLE_RESUME_TEXT)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+# Request the probe path back to back for the given time; returns latencies in ms
+async def probe(client: httpx.AsyncClient, seconds: float, interval: float) -> np.ndarray:
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get(PROBE_PATH)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+    return np.array(latencies)
+
+# Upload the resume until stop is set; returns the number of completed matches
+async def upload(client: httpx.AsyncClient, pdf_bytes: bytes, stop: asyncio.Event) -> int:
+    completed = 0
+    while not stop.is_set():
+        response = await client.post("/resume/match", files={"file": ("resume.pdf", pdf_bytes, "application/pdf")})
+        if response.status_code != 200:
+            print(f"❌ Upload failed with {response.status_code}: {response.text[:200]}")
+            await asyncio.sleep(1)
+            continue
+        completed += 1
+    return completed
+
+def report(label: str, latencies: np.ndarray):
+    print(f"{label:<16}{len(latencies):>8}{np.percentile(latencies, 50):>10.1f}"
+          f"{np.percentile(latencies, 99):>10.1f}{latencies.max():>10.1f}")
+
+# Main benchmark
+async def benchmark_event_loop(pdf_bytes: bytes, uploads: int, seconds: float, interval: float):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        # Warm up: load the models and indexes before timing anything
+        await client.get(PROBE_PATH)
+        await client.post("/resume/match", files={"file": ("resume.pdf", pdf_bytes, "application/pdf")})
+
+        idle = await probe(client, seconds, interval)
+
+        stop = asyncio.Event()
+        uploaders = [asyncio.create_task(upload(client, pdf_bytes, stop)) for _ in range(uploads)]
+        loaded = await probe(client, seconds, interval)
+        stop.set()
+        completed = sum(await asyncio.gather(*uploaders))
+
+    print(f"\n{'GET /jobs':<16}{'requests':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    report("idle", idle)
+    report(f"{uploads} uploaders", loaded)
+    print(f"📄 {completed} resume matches completed during the loaded phase ({completed / seconds:.2f}/s)")
+    print(f"⚡ p99 under load is {np.percentile(loaded, 99) / np.percentile(idle, 99):.1f}x the idle p99")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="/jobs latency while resumes are being matched")
+    parser.add_argument("--pdf", help="resume PDF to upload (default: a generated one-page resume)")
+    parser.add_argument("--uploads", type=int, default=4, help="concurrent upload clients")
+    parser.add_argument("--seconds", type=float, default=20.0, help="duration of each phase")
+    parser.add_argument("--interval", type=float, default=0.05, help="pause between probe requests (s)")
+    args = parser.parse_args()
+    if args.pdf:
+        with open(args.pdf, "rb") as f:
+            pdf = f.read()
+    else:
+        pdf = sample_pdf()
+    asyncio.run(benchmark_event_loop(pdf, args.uploads, args.seconds, args.interval))
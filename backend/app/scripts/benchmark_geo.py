@@ -0,0 +1,65 @@
+# This script compares the grid spatial index with a full haversine scan over every job
+# for "jobs within N km" queries, checking that both return the same jobs.
+import argparse
+import time
+import numpy as np
+from app.db.database import SessionLocal
+from app.models.job import JobPosting
+from app.services.geo_index import GeoGridIndex, haversine_km, valid_coordinates
+
+# Constants
+RADII_KM = [10, 50, 200, 1000]
+
+# Load job coordinates, or generate points spread over the continental US
+def load_coordinates(synthetic: int, seed: int = 0):
+    if synthetic:
+        rng = np.random.default_rng(seed)
+        return rng.uniform(25, 49, synthetic), rng.uniform(-124, -67, synthetic)
+    db = SessionLocal()
+    rows = db.query(JobPosting.latitude, JobPosting.longitude).all()
+    db.close()
+    lats = np.array([r[0] if r[0] is not None else np.nan for r in rows], dtype=np.float64)
+    lons = np.array([r[1] if r[1] is not None else np.nan for r in rows], dtype=np.float64)
+    return lats, lons
+
+# The baseline: compute the distance to every job and keep the close ones
+def scan_radius(lats, lons, lat, lon, radius_km):
+    distances = haversine_km(lat, lon, lats, lons)
+    inside = np.flatnonzero((distances <= radius_km) & valid_coordinates(lats, lons))
+    return inside[np.argsort(distances[inside], kind="stable")]
+
+# Main benchmark
+def benchmark_geo(synthetic: int = 0, n_queries: int = 200):
+    lats, lons = load_coordinates(synthetic)
+    start = time.perf_counter()
+    grid = GeoGridIndex(lats, lons)
+    print(f"🗺️ Indexed {len(grid)} of {lats.shape[0]} jobs in {(time.perf_counter() - start) * 1000:.1f} ms")
+    if len(grid) == 0:
+        print("⚠️ No job coordinates found.")
+        return
+
+    rng = np.random.default_rng(1)
+    centers = grid.positions[rng.integers(0, len(grid), n_queries)]
+    print(f"\n{'radius km':>10}{'avg hits':>10}{'scan ms':>10}{'grid ms':>10}{'speedup':>9}{'same':>6}")
+    for radius in RADII_KM:
+        scan_time = grid_time = hits = 0.0
+        same = True
+        for position in centers:
+            lat, lon = lats[position], lons[position]
+            start = time.perf_counter()
+            expected = scan_radius(lats, lons, lat, lon, radius)
+            scan_time += time.perf_counter() - start
+            start = time.perf_counter()
+            found, _ = grid.query_radius(lat, lon, radius)
+            grid_time += time.perf_counter() - start
+            hits += found.shape[0]
+            same = same and np.array_equal(np.sort(found), np.sort(expected))
+        scan_ms, grid_ms = scan_time / n_queries * 1000, grid_time / n_queries * 1000
+        print(f"{radius:>10}{hits / n_queries:>10.1f}{scan_ms:>10.2f}{grid_ms:>10.2f}{scan_ms / grid_ms:>8.1f}x{'✅' if same else '❌':>5}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grid spatial index vs full scan for radius queries")
+    parser.add_argument("--synthetic", type=int, default=0, help="benchmark this many synthetic US locations instead of the database")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    benchmark_geo(args.synthetic, args.queries)
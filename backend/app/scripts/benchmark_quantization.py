@@ -0,0 +1,67 @@
+# This script compares int8 first-stage scoring (with exact re-ranking) against exact float32
+# search: memory of the scanned matrix, query latency and agreement of the final top-100.
+import argparse
+import time
+import numpy as np
+from app.scripts.benchmark_ann import load_matrix, make_queries
+from app.services.ann_index import ExactSearcher, Int8Searcher
+
+# Constants (same cut as get_top_job_matches)
+TOP_K = 100
+MIN_SCORE = 0.3
+RERANK_VALUES = [100, 200, 300, 500, 1000]
+
+# Apply the matcher's score threshold to a search result
+def matcher_cut(positions, scores):
+    return positions[scores > MIN_SCORE]
+
+# Time a search function over all queries
+def run(search, queries: np.ndarray):
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(search(query))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return results, np.array(latencies)
+
+# Fraction of exact top-10 positions reproduced in the same order
+def top10_order_agreement(found, truth):
+    n = min(10, len(truth))
+    return float(np.mean(found[:n] == truth[:n])) if n and len(found) >= n else 1.0
+
+# Main benchmark
+def benchmark_quantization(synthetic: int = 0, n_queries: int = 200):
+    matrix = np.ascontiguousarray(load_matrix(synthetic)[:])
+    if matrix.shape[0] == 0:
+        print("⚠️ No job embeddings found.")
+        return
+    queries = make_queries(matrix, n_queries)
+
+    start = time.perf_counter()
+    int8 = Int8Searcher.build(matrix)
+    build_seconds = time.perf_counter() - start
+    float_mb = matrix.nbytes / 2**20
+    int8_mb = int8.codes.nbytes / 2**20
+    print(f"🧮 {matrix.shape[0]} jobs x {matrix.shape[1]} dims, quantized in {build_seconds:.2f}s")
+    print(f"💾 Scanned matrix: float32 {float_mb:.1f} MB -> int8 {int8_mb:.1f} MB ({100 * (1 - int8_mb / float_mb):.0f}% saved)")
+
+    exact = ExactSearcher(matrix)
+    truth, exact_latency = run(lambda q: matcher_cut(*exact.search(q, TOP_K)), queries)
+    exact_p50 = np.percentile(exact_latency, 50)
+
+    print(f"\n{'mode':<20}{'overlap@100':>12}{'top10 order':>13}{'p50 ms':>9}{'p95 ms':>9}{'speedup':>9}")
+    print(f"{'float32 exact':<20}{1.0:>12.3f}{1.0:>13.3f}{exact_p50:>9.2f}{np.percentile(exact_latency, 95):>9.2f}{1.0:>8.2f}x")
+    for rerank in RERANK_VALUES:
+        results, latency = run(lambda q: matcher_cut(*int8.search(q, TOP_K, rerank_candidates=rerank)), queries)
+        overlap = np.mean([len(np.intersect1d(f, t)) / max(1, len(t)) for f, t in zip(results, truth)])
+        order = np.mean([top10_order_agreement(f, t) for f, t in zip(results, truth)])
+        label = f"int8 rerank={rerank}"
+        p50 = np.percentile(latency, 50)
+        print(f"{label:<20}{overlap:>12.3f}{order:>13.3f}{p50:>9.2f}{np.percentile(latency, 95):>9.2f}{exact_p50 / p50:>8.2f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="int8 quantized vs float32 exact matching report")
+    parser.add_argument("--synthetic", type=int, default=0, help="benchmark a synthetic catalog of this many jobs instead of the database")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    benchmark_quantization(args.synthetic, args.queries)
@@ -0,0 +1,85 @@
+# This script compares the Aho-Corasick skill matcher behind the word cloud with the old
+# per-keyword substring scan. It runs both on resumes of realistic sizes. The old scan
+# re-read the skills CSV on every call and lowered the resume once per keyword. Resumes are
+# generated from the vocabulary and common resume wording, or read from PDFs with --pdf.
+import argparse
+import random
+import time
+from app.services.extract_skills import SKILLS_CSV_PATH, load_keywords
+from app.services.skill_automaton import SkillAutomaton
+
+# Constants
+PAGE_CHARS = 3000  # roughly one page of resume text
+PAGES = [1, 2, 4, 10]
+FILLER_WORDS = (
+    "led team of engineers developed built designed implemented maintained improved reduced "
+    "latency by percent across services delivered projects stakeholders customers using with "
+    "and the for in on to of experience responsible production pipelines reporting analysis "
+    "university bachelor master degree intern senior software data cloud platform"
+).split()
+
+# The previous csv_skills: read the CSV, then one lower-cased substring search per keyword
+def legacy_csv_skills(text: str, csv_path: str) -> dict:
+    skills = {}
+    for keyword in load_keywords(csv_path):
+        if keyword.lower() in text.lower():
+            skills[keyword] = skills.get(keyword, 0) + 1
+    return skills
+
+# A resume of about n_chars characters, with a few vocabulary skills mixed into the wording
+def synthetic_resume(keywords: list[str], n_chars: int, rng: random.Random) -> str:
+    skills = rng.sample(keywords, min(len(keywords), 40))
+    words, size = [], 0
+    while size < n_chars:
+        word = rng.choice(skills) if rng.random() < 0.08 else rng.choice(FILLER_WORDS)
+        word = word + rng.choice([",", ".", "", "", ""])
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+# Time fn(text) over the resumes, in ms per resume
+def time_per_resume(fn, resumes: list[str], repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for text in resumes:
+            fn(text)
+    return (time.perf_counter() - start) / (repeats * len(resumes)) * 1000
+
+# Main benchmark
+def benchmark_skill_matching(csv_path: str = SKILLS_CSV_PATH, pdfs: list[str] = None, n_resumes: int = 5, repeats: int = 3):
+    keywords = sorted(load_keywords(csv_path))
+    start = time.perf_counter()
+    automaton = SkillAutomaton(keywords)
+    print(f"🔤 Built automaton for {len(automaton)} skills in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    rng = random.Random(0)
+    if pdfs:
+        from app.services.parser import extract_text_from_pdf
+        groups = []
+        for path in pdfs:
+            with open(path, "rb") as f:
+                groups.append((path, [extract_text_from_pdf(f.read())]))
+    else:
+        groups = [(f"{pages} page(s)", [synthetic_resume(keywords, pages * PAGE_CHARS, rng) for _ in range(n_resumes)])
+                  for pages in PAGES]
+
+    print(f"\n{'resume':>14}{'chars':>8}{'old ms':>10}{'new ms':>10}{'speedup':>9}{'skills':>8}{'boundary':>10}{'occurrences':>13}")
+    for label, resumes in groups:
+        old_ms = time_per_resume(lambda text: legacy_csv_skills(text, csv_path), resumes, repeats)
+        new_ms = time_per_resume(automaton.count, resumes, repeats)
+        old_found = legacy_csv_skills(resumes[0], csv_path)
+        new_found = automaton.count(resumes[0])
+        dropped = len(set(k.lower() for k in old_found) - set(k.lower() for k in new_found))
+        chars = sum(len(text) for text in resumes) // len(resumes)
+        print(f"{label:>14}{chars:>8}{old_ms:>10.2f}{new_ms:>10.2f}{old_ms / new_ms:>8.1f}x"
+              f"{len(new_found):>8}{dropped:>10}{sum(new_found.values()):>13}")
+    print("\n'boundary' counts skills the old scan found only inside other words (e.g. \"java\" in \"javascript\").")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark skill matching for the resume word cloud")
+    parser.add_argument("--skills-csv", default=SKILLS_CSV_PATH)
+    parser.add_argument("--pdf", nargs="*", help="resume PDFs to use instead of generated resumes")
+    parser.add_argument("--resumes", type=int, default=5, help="generated resumes per size")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    benchmark_skill_matching(args.skills_csv, args.pdf, args.resumes, args.repeats)
@@ -0,0 +1,69 @@
+# This script measures how quickly a fresh API process starts serving.
+# Each run starts a new Python process that imports app.main, answers its first GET /jobs and
+# GET / requests over ASGI, and then loads every model through the registry warmup. The
+# medians show what a worker restart costs before the API responds, and how long the models
+# take to become ready behind it.
+import argparse
+import json
+import subprocess
+import sys
+import numpy as np
+
+# Code run in each fresh process; prints one JSON line of timings (seconds)
+CHILD_CODE = """
+import json, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+import asyncio, httpx
+async def first_requests():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+        (await client.get("/jobs/?limit=10")).raise_for_status()
+        (await client.get("/")).raise_for_status()
+asyncio.run(first_requests())
+serving = time.perf_counter()
+
+from app.services.model_registry import models
+models.warmup()
+warm = time.perf_counter()
+print("STARTUP " + json.dumps({
+    "import": imported - start, "firstRequest": serving - imported, "serving": serving - start,
+    "warmup": warm - serving, "models": {name: info["seconds"] for name, info in models.status().items()},
+}))
+"""
+
+# Start one fresh process and return its timings
+def measure_once() -> dict:
+    completed = subprocess.run([sys.executable, "-c", CHILD_CODE], capture_output=True, text=True)
+    for line in completed.stdout.splitlines():
+        if line.startswith("STARTUP "):
+            return json.loads(line[len("STARTUP "):])
+    raise RuntimeError(f"Startup run failed:\n{completed.stderr[-2000:]}")
+
+# Main benchmark
+def benchmark_startup(runs: int = 5, target_seconds: float = 1.0) -> bool:
+    results = [measure_once() for _ in range(runs)]
+    median = lambda key: float(np.median([r[key] for r in results]))
+
+    print(f"🚀 {runs} fresh processes (median seconds)")
+    for label, key in (("import app.main", "import"), ("first /jobs and /", "firstRequest"),
+                       ("serving after", "serving"), ("model warmup", "warmup")):
+        print(f"   {label:<22} {median(key):.3f}")
+    for name in results[-1]["models"]:
+        seconds = [r["models"][name] for r in results if r["models"].get(name) is not None]
+        if seconds:
+            print(f"     {name:<20} {float(np.median(seconds)):.3f}")
+
+    passed = median("serving") <= target_seconds
+    print(f"✅ Serving within {target_seconds:.1f}s." if passed else
+          f"❌ Serving took {median('serving'):.2f}s (target {target_seconds:.1f}s).")
+    return passed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time from process start until the API serves requests")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target", type=float, default=1.0, help="seconds allowed until /jobs is served")
+    args = parser.parse_args()
+    sys.exit(0 if benchmark_startup(args.runs, args.target) else 1)
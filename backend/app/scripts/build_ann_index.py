@@ -0,0 +1,23 @@
+# This script (re)builds the IVF index over the job embeddings and saves it to disk.
+from app.db.database import SessionLocal
+from app.services.ann_index import IVFSearcher, IVF_INDEX_PATH
+from app.services.job_index import JobEmbeddingIndex
+
+# Function to build and persist the IVF index
+def build_ann_index(n_lists: int = None):
+    db = SessionLocal()
+    index = JobEmbeddingIndex()
+    index.build(db)
+    db.close()
+
+    if len(index) == 0:
+        print("⚠️ No job embeddings found, nothing to index.")
+        return
+
+    searcher = IVFSearcher.build(index.matrix, n_lists=n_lists)
+    searcher.save(IVF_INDEX_PATH, index.ids)
+    print(f"✅ Saved IVF index with {searcher.n_lists} lists for {len(index)} jobs to {IVF_INDEX_PATH}.")
+
+# Run the function if this script is executed directly
+if __name__ == "__main__":
+    build_ann_index()
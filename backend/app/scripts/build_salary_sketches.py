@@ -0,0 +1,15 @@
+# This script rebuilds the salary sketches from the job_postings table.
+# The sketches are maintained on every ORM write, so this is only needed for an existing
+# database (run it after `alembic upgrade head`; the migrations leave the sketches to it), or
+# after rows were changed with raw SQL or bulk updates that skip the ORM events.
+from app.db.database import SessionLocal
+from app.services.salary_sketches import rebuild_salary_sketches
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        print("📊 Rebuilding salary sketches...")
+        n_sketches = rebuild_salary_sketches(db)
+        print(f"✅ Built {n_sketches} salary sketches.")
+    finally:
+        db.close()
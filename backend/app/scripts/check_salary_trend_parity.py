@@ -0,0 +1,112 @@
+# This script compares the SQL salary trends with the old per-request Python parsing, row by row.
+# The parsed columns intentionally differ from the old rules on a few inputs:
+#   - salaries are read as dollars by parse_salary_range, so "$59,000-$99,000" is 79 (thousands)
+#     where the old digit-stripping parser gave 79000, and "$59.5K" is 59.5 instead of 595;
+#   - a single amount ("$80K") counts as min = max instead of being skipped;
+#   - locations are stripped and empty ones have no state.
+# Every row the old and new rules read differently is listed by reason, and the trends are
+# compared per title on the buckets whose rows both rules read the same way.
+import argparse
+import re
+from collections import Counter, defaultdict
+from app.db.database import SessionLocal
+from app.models.job import JobPosting
+from app.services.job_facts import job_facts
+from app.services.resume_matcher import get_salary_trend
+
+# Old parser of the salary trend charts: keeps every digit ("$59K" -> 59)
+def legacy_parse_salary(text):
+    try:
+        return int(re.sub(r"[^\d]", "", text))
+    except:
+        return None
+
+# Old mean salary of a row (in the units of its digits), or None if the old charts skipped it
+def legacy_mean_salary(salary_range):
+    try:
+        salary = salary_range.split("-")
+    except AttributeError:
+        return None
+    if len(salary) != 2:
+        return None
+    min_sal, max_sal = legacy_parse_salary(salary[0]), legacy_parse_salary(salary[1])
+    if min_sal is None or max_sal is None:
+        return None
+    return (min_sal + max_sal) / 2
+
+# Old mean years of experience, or None if the progression chart skipped the row
+def legacy_mean_experience(experience):
+    try:
+        exp_range = re.findall(r'\d+', experience)
+    except TypeError:
+        return None
+    return (int(exp_range[0]) + int(exp_range[1])) / 2 if len(exp_range) == 2 else None
+
+# Old state of a location ("Austin, TX" -> "TX"); None where the old chart crashed
+def legacy_state(location):
+    if not isinstance(location, str):
+        return None
+    return location[-2:] if len(location) > 2 else location
+
+# The values each rule set reads from one row: (mean salary in thousands, mean years, state)
+def legacy_values(salary_range, experience, location):
+    return legacy_mean_salary(salary_range), legacy_mean_experience(experience), legacy_state(location)
+
+def new_values(salary_range, experience, location):
+    facts = job_facts(salary_range, experience, location)
+    salary = None
+    if facts["salary_min"] is not None and facts["salary_max"] is not None:
+        salary = (facts["salary_min"] + facts["salary_max"]) / 2 / 1000
+    years = None
+    if facts["experience_min"] is not None and facts["experience_max"] is not None:
+        years = (facts["experience_min"] + facts["experience_max"]) / 2
+    return salary, years, facts["state"]
+
+# Main check
+def check_salary_trend_parity(examples: int = 3) -> bool:
+    db = SessionLocal()
+    rows = db.query(JobPosting.job_title, JobPosting.salary_range, JobPosting.experience, JobPosting.location).all()
+    db.close()
+
+    reasons, samples = Counter(), defaultdict(list)
+    expected = defaultdict(list)  # <- (title, kind, bucket) -> mean salaries
+    affected = set()              # <- buckets holding a row the two rule sets read differently
+    for title, salary_range, experience, location in rows:
+        old, new = legacy_values(salary_range, experience, location), new_values(salary_range, experience, location)
+        differs = old != new
+        for name, old_value, new_value in zip(("salary", "experience", "state"), old, new):
+            if old_value != new_value:
+                reasons[name] += 1
+                if len(samples[name]) < examples:
+                    samples[name].append((salary_range, experience, location))
+        if new[0] is None:
+            continue
+        for kind, bucket in (("progression", new[1]), ("location", new[2])):
+            if bucket is not None:
+                expected[(title, kind, bucket)].append(new[0])
+                if differs:
+                    affected.add((title, kind, bucket))
+
+    print(f"🔎 {len(rows)} jobs; {sum(reasons.values())} field values read differently from the old charts")
+    for name, count in reasons.items():
+        print(f"   {name:<11} {count:>7} rows, e.g. {samples[name]}")
+
+    trend = get_salary_trend([{"jobTitle": title} for title in {key[0] for key in expected}])
+    mismatches = 0
+    for (title, kind, bucket), salaries in expected.items():
+        actual = trend[title][kind].get(bucket)
+        # Buckets made only of rows both rule sets read the same way must match the old average
+        if actual is None or (
+            (title, kind, bucket) not in affected
+            and abs(actual - sum(salaries) / len(salaries)) > 1e-6 * max(1.0, abs(actual))
+        ):
+            mismatches += 1
+    print(f"{'✅' if mismatches == 0 else '❌'} {mismatches} of {len(expected)} trend buckets differ "
+          f"({len(affected)} hold rows read differently and are not compared)")
+    return mismatches == 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare SQL salary trends with the old per-request parsing")
+    parser.add_argument("--examples", type=int, default=3, help="sample raw values shown per difference")
+    args = parser.parse_args()
+    raise SystemExit(0 if check_salary_trend_parity(args.examples) else 1)
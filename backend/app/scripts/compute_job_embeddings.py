@@ -1,33 +1,133 @@
 # This script computes the embeddings for job postings that do not have them yet.
+# Jobs are streamed in id order in chunks: each chunk is encoded with one batched model call,
+# written with one bulk update and committed, and its last id is saved to a checkpoint file,
+# so a stopped run resumes where it left off (a finished run removes the checkpoint).
+# --workers spreads encoding over several processes.
+import argparse
+import json
+import os
+import time
 from sqlalchemy.orm import Session
 from app.db.database import SessionLocal
 from app.models.job import JobPosting
-from sentence_transformers import SentenceTransformer
+from app.services.embeddings import embedding_cache, encode_texts, get_embedding_backend
+from app.scripts.export_embedding_store import export_embedding_store
+from app.services.embedding_store import EmbeddingStore
+from app.services.job_index import normalize_rows
+
+# Constants
+CHUNK_SIZE = 1000
+ENCODE_BATCH_SIZE = 64
+CHECKPOINT_PATH = "data/compute_job_embeddings.checkpoint.json"
+
+# Load the configured embedding backend
+backend = get_embedding_backend()
+
+
+# Last job id fully processed by a previous run (0 if none)
+def read_checkpoint(path: str) -> int:
+    try:
+        with open(path) as f:
+            return int(json.load(f)["last_id"])
+    except (OSError, ValueError, KeyError):
+        return 0
+
+
+# Save the last processed id; the file is replaced atomically so a crash never leaves it half-written
+def write_checkpoint(path: str, last_id: int):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"last_id": last_id}, f)
+    os.replace(tmp_path, path)
 
-# Load the pre-trained model
-model = SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
 
 # Function to compute embeddings for job postings
-def compute_embeddings():
+def compute_embeddings(chunk_size: int = CHUNK_SIZE, batch_size: int = ENCODE_BATCH_SIZE, workers: int = 0,
+                       checkpoint_path: str = CHECKPOINT_PATH, restart: bool = False):
     # Create a new database session
     db: Session = SessionLocal()
-    jobs = db.query(JobPosting).filter(JobPosting.embedding == None).all() # Get all job postings without embeddings
-
-    # Check if there are any jobs to process
-    for job in jobs:
-        # Skip jobs without skills
-        if not job.skills:
-            continue
-        # Compute the embedding for the job's skills
-        text = ", ".join(job.skills)
-        job.embedding = model.encode(text).tolist()
-        db.add(job)
-
-    # Commit the changes to the database
-    db.commit()
-    db.close()
-    print(f"✅ Computed embeddings for {len(jobs)} jobs.")
+    last_id = 0 if restart else read_checkpoint(checkpoint_path)
+
+    # Jobs without embeddings (JSON ones are converted by backfill_embedding_blobs)
+    total = (
+        db.query(JobPosting.id)
+        .filter(JobPosting.id > last_id, JobPosting.embedding == None, JobPosting.legacy_embedding == None)
+        .count()
+    )
+    print(f"🧮 {total} jobs without embeddings after id {last_id}.")
+
+    # Optional pool of encoder processes, one per worker (sentence-transformers backend only;
+    # onnxruntime already spreads one encode over the CPU cores)
+    model = getattr(backend, "model", None)
+    pool = model.start_multi_process_pool(["cpu"] * workers) if workers > 1 and model is not None else None
+    store = EmbeddingStore()
+    publish_to_store = store.exists()
+    started = time.perf_counter()
+    seen, encoded = 0, 0
+
+    try:
+        while True:
+            # Keyset pagination: only the id and skills of the next chunk are read
+            rows = (
+                db.query(JobPosting.id, JobPosting.skills)
+                .filter(JobPosting.id > last_id, JobPosting.embedding == None, JobPosting.legacy_embedding == None)
+                .order_by(JobPosting.id)
+                .limit(chunk_size)
+                .all()
+            )
+            if not rows:
+                # Finished: the next run scans from the first job again
+                if os.path.exists(checkpoint_path):
+                    os.remove(checkpoint_path)
+                break
+
+            # Skip jobs without skills
+            rows_with_skills = [(job_id, skills) for job_id, skills in rows if skills]
+            if rows_with_skills:
+                ids = [job_id for job_id, _ in rows_with_skills]
+                # Identical or reordered skill lists are encoded once (and reused across runs)
+                if pool is not None:
+                    encode = lambda texts: model.encode_multi_process(texts, pool, batch_size=batch_size,
+                                                                      normalize_embeddings=True)
+                else:
+                    encode = lambda texts: encode_texts(texts, batch_size=batch_size)
+                vectors = embedding_cache.encode_skill_lists([skills for _, skills in rows_with_skills], encode)
+
+                # One bulk update and commit per chunk
+                db.bulk_update_mappings(JobPosting, [{"id": job_id, "embedding": vector} for job_id, vector in zip(ids, vectors)])
+                db.commit()
+
+                # Publish the new vectors to the shared store read by the API workers
+                if publish_to_store:
+                    store.append(ids, normalize_rows(vectors))
+                encoded += len(ids)
+
+            last_id = rows[-1][0]
+            write_checkpoint(checkpoint_path, last_id)
+            seen += len(rows)
+            elapsed = time.perf_counter() - started
+            print(f"⚙️ {seen}/{total} jobs ({encoded} encoded), {seen / elapsed:.1f} jobs/s, last id {last_id}")
+    finally:
+        if pool is not None:
+            model.stop_multi_process_pool(pool)
+        db.close()
+
+    if not publish_to_store and encoded:
+        export_embedding_store()
+    elapsed = time.perf_counter() - started
+    print(f"✅ Computed embeddings for {encoded} jobs in {elapsed:.1f}s ({encoded / max(elapsed, 1e-9):.1f} jobs/s).")
+    print(f"🗃️ Embedding cache: {embedding_cache.stats()}")
+
 
 # Run the function if this script is executed directly
 if __name__ == "__main__":
-    compute_embeddings()
+    parser = argparse.ArgumentParser(description="Compute missing job embeddings in resumable chunks")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="jobs read, encoded and committed together")
+    parser.add_argument("--batch-size", type=int, default=ENCODE_BATCH_SIZE, help="model batch size")
+    parser.add_argument("--workers", type=int, default=0, help="encoder processes (0 = in-process, -1 = one per CPU)")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH)
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and scan from the first job")
+    args = parser.parse_args()
+    workers = (os.cpu_count() or 1) if args.workers < 0 else args.workers
+    compute_embeddings(args.chunk_size, args.batch_size, workers, args.checkpoint, args.restart)
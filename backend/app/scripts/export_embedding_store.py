@@ -0,0 +1,23 @@
+# This script (re)writes the shared on-disk embedding store from the database as a single segment.
+# Run it once to create the store, and from time to time to compact appended segments.
+from app.db.database import SessionLocal
+from app.services.embedding_store import EmbeddingStore
+from app.services.job_index import load_embeddings_from_db
+
+# Function to export every job embedding to the store
+def export_embedding_store():
+    db = SessionLocal()
+    store = EmbeddingStore()
+    ids, matrix = load_embeddings_from_db(db)
+    db.close()
+
+    if ids.shape[0] == 0:
+        print("⚠️ No job embeddings found, nothing to export.")
+        return
+
+    store.rewrite(ids, matrix)
+    print(f"✅ Wrote {ids.shape[0]} embeddings to {store.directory}.")
+
+# Run the function if this script is executed directly
+if __name__ == "__main__":
+    export_embedding_store()
@@ -0,0 +1,51 @@
+# This script exports all-MiniLM-L6-v2 to ONNX and quantizes its weights to int8, for the
+# EMBEDDING_BACKEND=onnx embedding backend. It needs torch, transformers and onnxruntime.
+# The files are written to EMBEDDING_ONNX_DIR, and the API loads them from there without
+# downloading anything.
+import os
+import torch
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from transformers import AutoModel, AutoTokenizer
+from app.services.embeddings import EMBEDDING_MODEL_NAME, EMBEDDING_ONNX_DIR, ONNX_MODEL_FILE
+
+# Constants
+HF_MODEL_ID = f"sentence-transformers/{EMBEDDING_MODEL_NAME}"
+FP32_MODEL_FILE = "model.onnx"
+INPUT_NAMES = ["input_ids", "attention_mask", "token_type_ids"]
+
+# Function to export and quantize the model
+def export_onnx_model(output_dir: str = EMBEDDING_ONNX_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(HF_MODEL_ID)
+    model = AutoModel.from_pretrained(HF_MODEL_ID)
+    model.eval()
+
+    # Writes tokenizer.json, which the backend reads with the tokenizers library
+    tokenizer.save_pretrained(output_dir)
+
+    # Export the transformer; pooling and normalization run in numpy in the backend
+    sample = tokenizer(["python, sql, machine learning"], return_tensors="pt")
+    fp32_path = os.path.join(output_dir, FP32_MODEL_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in INPUT_NAMES),
+            fp32_path,
+            input_names=INPUT_NAMES,
+            output_names=["last_hidden_state"],
+            dynamic_axes={name: {0: "batch", 1: "sequence"} for name in INPUT_NAMES + ["last_hidden_state"]},
+            opset_version=14,
+        )
+
+    # Dynamic quantization: int8 weights, activations quantized on the fly
+    quantized_path = os.path.join(output_dir, ONNX_MODEL_FILE)
+    quantize_dynamic(fp32_path, quantized_path, weight_type=QuantType.QInt8)
+
+    fp32_mb = os.path.getsize(fp32_path) / 1e6
+    int8_mb = os.path.getsize(quantized_path) / 1e6
+    print(f"✅ Exported {HF_MODEL_ID} to {quantized_path} ({fp32_mb:.1f} MB fp32 -> {int8_mb:.1f} MB int8).")
+    print("   Check it with python -m app.scripts.benchmark_embedding_backends")
+
+# Run the function if this script is executed directly
+if __name__ == "__main__":
+    export_onnx_model()
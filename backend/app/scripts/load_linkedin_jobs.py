@@ -5,10 +5,13 @@ import numpy as np
 from faker import Faker
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sentence_transformers import SentenceTransformer
 import ollama
 from app.db.database import SessionLocal
 from app.models.job import JobPosting
+from app.services.embeddings import encode_skill_lists
+from app.services.embedding_store import EmbeddingStore
+from app.services.job_index import normalize_rows
+from app.services.llm_cache import llm_cache
 
 # Constants
 CSV_PATH = "data/postings.csv"
@@ -17,15 +20,18 @@ END_ROW = 1000  # Adjust for batch size
 
 # Global variables
 fake = Faker()
-embedder = SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
 df = pd.read_csv(CSV_PATH).iloc[START_ROW:END_ROW].copy()
 
 # Call to Mistral model
 def extract_mistral(prompt: str):
-    try:
+    def call():
         # Call Mistral model using Ollama
         res = ollama.chat(model="mistral", messages=[{"role": "user", "content": prompt}])
         return res['message']['content'].strip()
+
+    try:
+        # Reruns over the same rows are answered from the cache
+        return llm_cache.get_or_call("mistral", prompt, call)
     except Exception as e:
         print(f"❌ Mistral error: {e}")
         return ""
@@ -69,6 +75,7 @@ def safe_timestamp(ts) -> datetime:
 
 # Connect to the database
 db: Session = SessionLocal()
+store = EmbeddingStore()
 # Load the CSV file as a DataFrame
 for _, row in df.iterrows():
     # Try to parse the row and insert it into the database
@@ -107,7 +114,7 @@ for _, row in df.iterrows():
             "CEO": fake.name()
         }
 
-        embedding = embedder.encode(", ".join(skills)).tolist() if skills else None
+        embedding = encode_skill_lists([skills])[0] if skills else None
 
         job = JobPosting(
             id=job_id,
@@ -138,6 +145,9 @@ for _, row in df.iterrows():
         # Add the job to the session and commit
         db.add(job)
         db.commit()
+        # Publish the vector to the shared store read by the API workers, if there is one
+        if embedding is not None and store.exists():
+            store.append([job_id], normalize_rows(np.atleast_2d(embedding)))
         print(f"✅ Inserted job {job_id}")
     except Exception as e:
         # Rollback in case of error
@@ -146,3 +156,4 @@ for _, row in df.iterrows():
 
 db.close()
 print("🎉 Done importing!")
+print(f"🗃️ LLM cache: {llm_cache.stats()}")
@@ -3,6 +3,7 @@ import time
 from sqlalchemy.orm import Session
 from app.db.database import SessionLocal
 from app.models.job import JobPosting
+from app.services.llm_cache import llm_cache
 from app.services.llm_skill_splitter import split_skills_with_llm  # or use your Ollama matcher
 
 def load_secondary_dataset(csv_path: str, max_jobs: int = 500):
@@ -27,6 +28,7 @@ def load_secondary_dataset(csv_path: str, max_jobs: int = 500):
             # No pre-listed skills → extract them from description
             skills_blob = row['description']
 
+        misses_before = llm_cache.misses
         skills = split_skills_with_llm(skills_blob)
 
         job = JobPosting(
@@ -45,10 +47,12 @@ def load_secondary_dataset(csv_path: str, max_jobs: int = 500):
         db.commit()
         inserted += 1
         print(f"✔️  Added job {inserted}: {job.job_title} @ {job.company}")
-        time.sleep(1.2)  # to protect CPU if using Ollama
+        if llm_cache.misses > misses_before:
+            time.sleep(1.2)  # to protect CPU if using Ollama (cached answers need no pause)
 
     db.close()
     print(f"✅ Finished loading {inserted} new jobs.")
+    print(f"🗃️ LLM cache: {llm_cache.stats()}")
 
 if __name__ == "__main__":
     load_secondary_dataset("data/new_dataset.csv")
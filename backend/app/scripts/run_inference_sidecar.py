@@ -0,0 +1,18 @@
+# This script runs the shared inference sidecar: one process that holds the embedding model
+# and spaCy for every API worker on the machine. Start it before the API and point the
+# workers at its socket with INFERENCE_SIDECAR_SOCKET. Workers fall back to in-process
+# inference whenever the sidecar is unreachable.
+import argparse
+from app.services.inference_sidecar import SIDECAR_BATCH_WINDOW_MS, SIDECAR_MAX_BATCH_TEXTS, serve
+
+# Constants
+DEFAULT_SOCKET = "/tmp/resume-inference.sock"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shared embedding/spaCy inference process for the API workers")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path (same as INFERENCE_SIDECAR_SOCKET)")
+    parser.add_argument("--window-ms", type=float, default=SIDECAR_BATCH_WINDOW_MS,
+                        help="how long to wait for more encode requests before running a batch")
+    parser.add_argument("--max-batch", type=int, default=SIDECAR_MAX_BATCH_TEXTS, help="texts per model call")
+    args = parser.parse_args()
+    serve(args.socket, args.window_ms, args.max_batch)
@@ -3,6 +3,7 @@ import time
 from sqlalchemy.orm import Session
 from app.db.database import SessionLocal
 from app.models.job import JobPosting
+from app.services.llm_cache import llm_cache
 from app.services.llm_skill_splitter import split_skills_with_llm
 
 # Batch control
@@ -57,6 +58,7 @@ def split_all_existing_skills():
                 print(f"🔧 Fixing skills for job {job.id}...")
 
                 # Use the LLM to split the skills
+                misses_before = llm_cache.misses
                 fixed_skills = split_skills_with_llm(raw_text)
 
                 # If the LLM returns a valid list of skills, update the job
@@ -68,7 +70,8 @@ def split_all_existing_skills():
                     total_updated += 1
                     if LOG_UPDATES:
                         print(f"✅ Job {job.id} updated with {len(fixed_skills)} skills.")
-                    time.sleep(SLEEP_SECONDS)
+                    if llm_cache.misses > misses_before:
+                        time.sleep(SLEEP_SECONDS)  # cached answers need no pause
                 else:
                     print(f"⚠️  LLM failed to parse job {job.id}")
             # If the skills field is already clean, skip the job
@@ -84,6 +87,7 @@ def split_all_existing_skills():
 
     db.close()
     print(f"\n🏁 Done! Total jobs updated: {total_updated}, skipped: {total_skipped}")
+    print(f"🗃️ LLM cache: {llm_cache.stats()}")
 
 # Main function to run the script
 if __name__ == "__main__":
@@ -1,8 +1,9 @@
 # Validate the embeddings in the database
-import json
 import numpy as np
+from sqlalchemy import type_coerce, LargeBinary
 from sqlalchemy.orm import Session
 from app.db.database import SessionLocal
+from app.db.types import unpack_embedding
 from app.models.job import JobPosting
 
 # Constants
@@ -11,19 +12,16 @@ EXPECTED_DIM = 384  # all-MiniLM-L6-v2
 # This script checks if the embeddings in the database are valid.
 def validate_embeddings():
     db: Session = SessionLocal() # Create a new session
-    jobs = db.query(JobPosting).filter(JobPosting.embedding != None).yield_per(100) # Fetch jobs with embeddings
+    raw_embedding = type_coerce(JobPosting.embedding, LargeBinary) # Read raw blobs so header errors are reported per job
+    jobs = db.query(JobPosting.id, raw_embedding).filter(JobPosting.embedding != None).yield_per(1000) # Fetch jobs with embeddings
 
     valid = 0
     invalid = []
 
     # Iterate through the jobs and validate the embeddings
-    for job in jobs:
+    for job_id, blob in jobs:
         try:
-            raw = job.embedding
-            # Deserialize if stored as JSON string
-            if isinstance(raw, str):
-                raw = json.loads(raw)
-            vec = np.array(raw, dtype=np.float32) # Convert to numpy array
+            vec = unpack_embedding(blob) # Decode and check the blob header
             # Check if the shape and values are valid
             if vec.shape != (EXPECTED_DIM,):
                 raise ValueError(f"Unexpected shape {vec.shape}")
@@ -32,9 +30,12 @@ def validate_embeddings():
             valid += 1
         # Handle exceptions for invalid embeddings
         except Exception as e:
-            print(f"❌ Job {job.id} invalid: {e}")
-            invalid.append(job.id)
+            print(f"❌ Job {job_id} invalid: {e}")
+            invalid.append(job_id)
+    legacy = db.query(JobPosting.id).filter(JobPosting.legacy_embedding != None).count()
     db.close()
+    if legacy:
+        print(f"⚠️ {legacy} jobs still have JSON embeddings, run app.scripts.backfill_embedding_blobs")
     print(f"\n✅ Valid embeddings: {valid}")
     print(f"❌ Invalid embeddings: {len(invalid)} -> {invalid[:10]}")
 
@@ -0,0 +1,295 @@
+# This module contains the search backends used by the job embedding index.
+# "exact" scores every job; "ivf" is an inverted-file index that only scores the jobs
+# in the clusters closest to the query, which keeps latency flat as the catalog grows;
+# "int8" scores a scalar-quantized copy and re-ranks the best candidates exactly.
+import os
+import zipfile
+import numpy as np
+
+# Backend selection and IVF tuning
+INDEX_BACKEND = os.getenv("JOB_INDEX_BACKEND", "exact")
+IVF_INDEX_PATH = os.getenv("JOB_INDEX_IVF_PATH", "data/job_index_ivf.npz")
+IVF_NPROBE = int(os.getenv("JOB_INDEX_NPROBE", "8"))
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_SIZE = 50000
+ASSIGN_CHUNK_SIZE = 20000
+INT8_RERANK_CANDIDATES = int(os.getenv("JOB_INDEX_RERANK_CANDIDATES", "300"))
+INT8_CHUNK_SIZE = 512
+# Above this fraction of allowed rows a filtered exact search scores everything and drops the rest
+DENSE_MASK_FRACTION = 0.5
+# Queries scored together by one matrix-matrix product in batch search
+BATCH_QUERY_CHUNK = 64
+
+
+# Return the positions of the k highest scores, best first
+def top_k_positions(scores: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < scores.shape[0]:
+        positions = np.argpartition(-scores, k - 1)[:k]
+    else:
+        positions = np.arange(scores.shape[0])
+    return positions[np.argsort(-scores[positions], kind="stable")]
+
+
+# Brute-force search over every row of the (normalized) matrix
+class ExactSearcher:
+    name = "exact"
+
+    def __init__(self, matrix: np.ndarray):
+        self.matrix = matrix
+
+    # Return (row positions, scores) of the k best rows for a normalized query.
+    # With a mask only the allowed rows are gathered and scored.
+    def search(self, query: np.ndarray, k: int, mask: np.ndarray = None):
+        if mask is None:
+            scores = self.matrix @ query
+            best = top_k_positions(scores, k)
+            return best, scores[best]
+
+        positions = np.flatnonzero(mask)
+        if positions.shape[0] > DENSE_MASK_FRACTION * mask.shape[0]:
+            scores = (self.matrix @ query)[positions]
+        else:
+            scores = self.matrix[positions] @ query
+        best = top_k_positions(scores, k)
+        return positions[best], scores[best]
+
+    # Score many normalized queries (m, d) with one matrix-matrix product per chunk of queries;
+    # returns one (row positions, scores) pair per query
+    def search_batch(self, queries: np.ndarray, k: int, mask: np.ndarray = None):
+        positions = np.flatnonzero(mask) if mask is not None else None
+        subset = self.matrix[positions] if positions is not None else self.matrix
+        results = []
+        for start in range(0, queries.shape[0], BATCH_QUERY_CHUNK):
+            scores = subset @ queries[start:start + BATCH_QUERY_CHUNK].T
+            for column in range(scores.shape[1]):
+                best = top_k_positions(scores[:, column], k)
+                rows = positions[best] if positions is not None else best
+                results.append((rows, scores[best, column]))
+        return results
+
+
+# Inverted-file index: rows are grouped by their nearest k-means centroid and a query
+# only scores the rows of its `nprobe` closest clusters
+class IVFSearcher:
+    name = "ivf"
+
+    def __init__(self, matrix: np.ndarray, centroids: np.ndarray, list_offsets: np.ndarray,
+                 list_positions: np.ndarray, nprobe: int = IVF_NPROBE):
+        self.matrix = matrix
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.list_positions = list_positions
+        self.nprobe = nprobe
+        self.new_rows = 0  # <- rows assigned to loaded centroids that the saved file does not have yet
+
+    @property
+    def n_lists(self) -> int:
+        return self.centroids.shape[0]
+
+    # Default number of clusters: about 4 * sqrt(n), the usual IVF rule of thumb
+    @staticmethod
+    def default_n_lists(n_rows: int) -> int:
+        return max(1, min(n_rows, int(4 * np.sqrt(n_rows))))
+
+    # Assign every row to its closest centroid, in chunks to bound memory
+    @staticmethod
+    def _assign(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        assignments = np.empty(matrix.shape[0], dtype=np.int64)
+        for start in range(0, matrix.shape[0], ASSIGN_CHUNK_SIZE):
+            chunk = matrix[start:start + ASSIGN_CHUNK_SIZE]
+            assignments[start:start + chunk.shape[0]] = np.argmax(chunk @ centroids.T, axis=1)
+        return assignments
+
+    # Train spherical k-means centroids on a sample and build the inverted lists
+    @classmethod
+    def build(cls, matrix: np.ndarray, n_lists: int = None, nprobe: int = IVF_NPROBE, seed: int = 0):
+        n_rows = matrix.shape[0]
+        n_lists = min(n_lists or cls.default_n_lists(n_rows), n_rows)
+        rng = np.random.default_rng(seed)
+
+        sample = matrix[rng.choice(n_rows, size=min(n_rows, KMEANS_SAMPLE_SIZE), replace=False)]
+        centroids = sample[rng.choice(sample.shape[0], size=n_lists, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            labels = cls._assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=n_lists)
+            # Keep the previous centroid for clusters that lost all their points
+            empty = counts == 0
+            sums[empty] = centroids[empty]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+
+        return cls.from_assignments(matrix, centroids, cls._assign(matrix, centroids), nprobe)
+
+    # Build the inverted lists from one cluster label per row
+    @classmethod
+    def from_assignments(cls, matrix: np.ndarray, centroids: np.ndarray, assignments: np.ndarray, nprobe: int = IVF_NPROBE):
+        list_positions = np.argsort(assignments, kind="stable")
+        counts = np.bincount(assignments, minlength=centroids.shape[0])
+        list_offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        return cls(matrix, centroids, list_offsets, list_positions, nprobe)
+
+    # Persist the trained index next to the ids it was built for. The file is written
+    # aside and renamed into place, so other workers never read a partial index.
+    def save(self, path: str, ids: np.ndarray):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, ids=ids, centroids=self.centroids,
+                     list_offsets=self.list_offsets, list_positions=self.list_positions)
+        os.replace(tmp_path, path)
+        self.new_rows = 0
+
+    # Load a persisted index for the current jobs. When the job set changed, the trained
+    # centroids are kept: known jobs stay in their cluster and only new rows are assigned.
+    # Returns None (retrain) if the file is missing, unreadable or incompatible, or if more
+    # rows are new than the centroids were trained on.
+    @classmethod
+    def load(cls, path: str, matrix: np.ndarray, ids: np.ndarray, nprobe: int = IVF_NPROBE):
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                saved_ids, centroids = data["ids"], data["centroids"]
+                list_offsets, list_positions = data["list_offsets"], data["list_positions"]
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as e:
+            print(f"⚠️ Ignoring unreadable IVF index {path}: {e}")
+            return None
+        if (centroids.ndim != 2 or centroids.shape[1] != matrix.shape[1]
+                or list_offsets.shape[0] != centroids.shape[0] + 1
+                or list_positions.shape[0] != saved_ids.shape[0] or list_offsets[-1] != saved_ids.shape[0]):
+            return None
+        if np.array_equal(saved_ids, ids):
+            return cls(matrix, centroids, list_offsets, list_positions, nprobe)
+
+        labels = np.empty(saved_ids.shape[0], dtype=np.int64)
+        labels[list_positions] = np.repeat(np.arange(centroids.shape[0]), np.diff(list_offsets))
+        order = np.argsort(saved_ids, kind="stable")
+        found = np.minimum(np.searchsorted(saved_ids[order], ids), max(saved_ids.shape[0] - 1, 0))
+        known = saved_ids[order][found] == ids if saved_ids.shape[0] else np.zeros(ids.shape[0], dtype=bool)
+        new = np.flatnonzero(~known)
+        if new.shape[0] > saved_ids.shape[0]:
+            return None
+
+        assignments = np.empty(ids.shape[0], dtype=np.int64)
+        assignments[known] = labels[order[found[known]]]
+        if new.shape[0]:
+            assignments[new] = cls._assign(np.asarray(matrix[new], dtype=np.float32), centroids)
+        searcher = cls.from_assignments(matrix, centroids, assignments, nprobe)
+        searcher.new_rows = int(new.shape[0])
+        return searcher
+
+    # Return (row positions, scores) of the k best rows among the probed clusters
+    def search(self, query: np.ndarray, k: int, nprobe: int = None, mask: np.ndarray = None):
+        nprobe = min(nprobe or self.nprobe, self.n_lists)
+        probed = top_k_positions(self.centroids @ query, nprobe)
+        candidates = np.concatenate([
+            self.list_positions[self.list_offsets[c]:self.list_offsets[c + 1]] for c in probed
+        ])
+        if mask is not None:
+            # A selective filter is cheaper (and exact) to brute-force than to probe
+            if np.count_nonzero(mask) <= candidates.shape[0]:
+                return ExactSearcher(self.matrix).search(query, k, mask)
+            candidates = candidates[mask[candidates]]
+        scores = self.matrix[candidates] @ query
+        best = top_k_positions(scores, k)
+        return candidates[best], scores[best]
+
+
+# Per-dimension affine int8 quantization: x ~ (code + 128) * scale + offset
+class ScalarQuantizer:
+    def __init__(self, offset: np.ndarray, scale: np.ndarray):
+        self.offset = offset
+        self.scale = scale
+
+    # Learn the per-dimension range of the matrix
+    @classmethod
+    def fit(cls, matrix) -> "ScalarQuantizer":
+        low = np.full(matrix.shape[1], np.inf, dtype=np.float32)
+        high = np.full(matrix.shape[1], -np.inf, dtype=np.float32)
+        for start in range(0, matrix.shape[0], ASSIGN_CHUNK_SIZE):
+            chunk = matrix[start:start + ASSIGN_CHUNK_SIZE]
+            low = np.minimum(low, chunk.min(axis=0))
+            high = np.maximum(high, chunk.max(axis=0))
+        scale = (high - low) / 255.0
+        scale[scale == 0] = 1.0
+        return cls(low, scale.astype(np.float32))
+
+    # Quantize rows to int8 codes
+    def encode(self, matrix) -> np.ndarray:
+        codes = np.empty(matrix.shape, dtype=np.int8)
+        for start in range(0, matrix.shape[0], ASSIGN_CHUNK_SIZE):
+            chunk = np.asarray(matrix[start:start + ASSIGN_CHUNK_SIZE], dtype=np.float32)
+            scaled = np.rint((chunk - self.offset) / self.scale) - 128
+            codes[start:start + chunk.shape[0]] = np.clip(scaled, -128, 127)
+        return codes
+
+    # Approximate dot products of every code row with a float query.
+    # Chunks are widened into one small reusable float32 buffer that stays in cache.
+    def score(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        weights = (query * self.scale).astype(np.float32)
+        bias = np.float32(128.0 * weights.sum() + query @ self.offset)
+        scores = np.empty(codes.shape[0], dtype=np.float32)
+        buffer = np.empty((INT8_CHUNK_SIZE, codes.shape[1]), dtype=np.float32)
+        for start in range(0, codes.shape[0], INT8_CHUNK_SIZE):
+            chunk = codes[start:start + INT8_CHUNK_SIZE]
+            widened = buffer[:chunk.shape[0]]
+            widened[...] = chunk
+            np.dot(widened, weights, out=scores[start:start + chunk.shape[0]])
+        return scores + bias
+
+
+# First pass over int8 codes, then exact re-scoring of the best candidates with the
+# full-precision rows (which may stay on disk in the memory-mapped store)
+class Int8Searcher:
+    name = "int8"
+
+    def __init__(self, matrix, quantizer: ScalarQuantizer, codes: np.ndarray,
+                 rerank_candidates: int = INT8_RERANK_CANDIDATES):
+        self.matrix = matrix
+        self.quantizer = quantizer
+        self.codes = codes
+        self.rerank_candidates = rerank_candidates
+
+    @classmethod
+    def build(cls, matrix, rerank_candidates: int = INT8_RERANK_CANDIDATES):
+        quantizer = ScalarQuantizer.fit(matrix)
+        return cls(matrix, quantizer, quantizer.encode(matrix), rerank_candidates)
+
+    # Return (row positions, exact scores) of the k best rows
+    def search(self, query: np.ndarray, k: int, rerank_candidates: int = None, mask: np.ndarray = None):
+        n_candidates = max(k, rerank_candidates or self.rerank_candidates)
+        if mask is None:
+            approx = self.quantizer.score(self.codes, query)
+            candidates = top_k_positions(approx, n_candidates)
+        else:
+            positions = np.flatnonzero(mask)
+            approx = self.quantizer.score(self.codes[positions], query)
+            candidates = positions[top_k_positions(approx, n_candidates)]
+        exact = self.matrix[candidates] @ query
+        best = top_k_positions(exact, k)
+        return candidates[best], exact[best]
+
+
+# Create the configured search backend for a freshly loaded matrix
+def make_searcher(matrix: np.ndarray, ids: np.ndarray, backend: str = INDEX_BACKEND):
+    if backend == "ivf" and matrix.shape[0] > 0:
+        searcher = IVFSearcher.load(IVF_INDEX_PATH, matrix, ids)
+        if searcher is None:
+            print(f"🧭 Building IVF index for {matrix.shape[0]} jobs...")
+            searcher = IVFSearcher.build(matrix)
+            searcher.save(IVF_INDEX_PATH, ids)
+        elif searcher.new_rows:
+            print(f"🧭 Assigned {searcher.new_rows} new jobs to the existing IVF clusters.")
+            searcher.save(IVF_INDEX_PATH, ids)
+        return searcher
+    if backend == "int8" and matrix.shape[0] > 0:
+        return Int8Searcher.build(matrix)
+    if backend not in ("exact", "ivf", "int8"):
+        print(f"⚠️ Unknown index backend '{backend}', falling back to exact search.")
+    return ExactSearcher(matrix)
@@ -0,0 +1,225 @@
+# This module implements a BM25 inverted index over job skills, titles and descriptions.
+# It complements the embedding index with exact term matching ("kubernetes", "pyspark").
+# The index grows incrementally: new jobs are appended and updated jobs replace their old
+# document, so it never has to be rebuilt while jobs are being loaded.
+import math
+import re
+import threading
+import time
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.db.database import SessionLocal
+from app.models.job import JobPosting
+
+# Constants
+BM25_K1 = 1.2
+BM25_B = 0.75
+FIELD_WEIGHTS = {"skills": 3.0, "title": 2.0, "description": 1.0}
+LOAD_BATCH_SIZE = 2000
+REFRESH_CHECK_SECONDS = 5.0
+# Updates stamped this long before the last one seen are re-read, in case their transaction
+# committed late; rows already indexed at the same stamp are skipped
+UPDATE_OVERLAP_SECONDS = 30.0
+
+# Tokens keep "+", "#" and inner "." so c++, c# and node.js survive
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of",
+    "on", "or", "our", "that", "the", "this", "to", "we", "will", "with", "you", "your",
+}
+
+
+# Lower-case a text and split it into index terms
+def tokenize(text) -> list[str]:
+    if not isinstance(text, str):
+        return []
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+# Weighted term frequencies of one job document
+def job_term_weights(skills, title, description) -> dict:
+    weights = {}
+    skill_text = " ".join(s for s in skills if isinstance(s, str)) if isinstance(skills, list) else skills
+    for field, text in (("skills", skill_text), ("title", title), ("description", description)):
+        for token in tokenize(text):
+            weights[token] = weights.get(token, 0.0) + FIELD_WEIGHTS[field]
+    return weights
+
+
+# Append-only BM25 index; a replaced or removed document is marked dead instead of rewritten
+class BM25Index:
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.doc_ids = []
+        self.doc_lengths = []
+        self.alive = []
+        self.row_of = {}
+        self.postings = {}
+        self._cache = {}
+        self._doc_arrays = None
+
+    def __len__(self):
+        return len(self.row_of)
+
+    # Add (or replace) a document from its weighted term frequencies
+    def add(self, doc_id: int, term_weights: dict):
+        self.remove(doc_id)
+        row = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self.doc_lengths.append(sum(term_weights.values()))
+        self.alive.append(True)
+        self.row_of[doc_id] = row
+        for term, weight in term_weights.items():
+            rows, weights = self.postings.setdefault(term, ([], []))
+            rows.append(row)
+            weights.append(weight)
+        # Every idf depends on the document count, so no cached term survives an add
+        self._cache.clear()
+        self._doc_arrays = None
+
+    # Remove a document; its postings are skipped from now on
+    def remove(self, doc_id: int):
+        row = self.row_of.pop(doc_id, None)
+        if row is not None:
+            self.alive[row] = False
+            self._cache.clear()
+            self._doc_arrays = None
+
+    # Per-document arrays used by the scorer, rebuilt after the index changes
+    def _documents(self):
+        if self._doc_arrays is None:
+            lengths = np.asarray(self.doc_lengths, dtype=np.float32)
+            alive = np.asarray(self.alive, dtype=bool)
+            average = float(lengths[alive].mean()) if alive.any() else 1.0
+            norms = self.k1 * (1 - self.b + self.b * lengths / max(average, 1e-6))
+            self._doc_arrays = (np.asarray(self.doc_ids, dtype=np.int64), alive, norms.astype(np.float32))
+        return self._doc_arrays
+
+    # Live postings of a term as (rows, term weights, idf)
+    def _term(self, term: str):
+        if term not in self._cache:
+            _, alive, _ = self._documents()
+            rows, weights = self.postings.get(term, ([], []))
+            rows = np.asarray(rows, dtype=np.int64)
+            weights = np.asarray(weights, dtype=np.float32)
+            live = alive[rows] if rows.shape[0] else np.zeros(0, dtype=bool)
+            rows, weights = rows[live], weights[live]
+            n_docs = len(self.row_of)
+            idf = math.log(1 + (n_docs - rows.shape[0] + 0.5) / (rows.shape[0] + 0.5))
+            self._cache[term] = (rows, weights, idf)
+        return self._cache[term]
+
+    # Return (doc ids, scores) of the best k documents for a list of query terms
+    def search(self, terms: list[str], k: int = 100):
+        doc_ids, _, norms = self._documents()
+        scores = np.zeros(doc_ids.shape[0], dtype=np.float32)
+        for term in set(terms):
+            rows, weights, idf = self._term(term)
+            if rows.shape[0]:
+                scores[rows] += idf * weights * (self.k1 + 1) / (weights + norms[rows])
+        hits = np.flatnonzero(scores > 0)
+        best = hits[np.argsort(-scores[hits], kind="stable")[:k]]
+        return doc_ids[best], scores[best]
+
+
+# Process-wide BM25 index over the job_postings table, kept up to date incrementally
+class JobTextIndex:
+    def __init__(self):
+        self.index = BM25Index()
+        self._max_id = 0
+        self._updated_at = 0.0      # <- newest updated_at stamp seen
+        self._indexed_stamps = {}   # <- job id -> updated_at of the indexed version
+        self._count = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    # Index one job (new or updated); before the first load the catch-up picks it up instead
+    def add_job(self, job: JobPosting):
+        with self._lock:
+            if self._count is None:
+                return
+            self.index.add(job.id, job_term_weights(job.skills, job.job_title, job.job_description))
+            self._max_id = max(self._max_id, job.id)
+            self._indexed_stamps[job.id] = job.updated_at
+
+    # Drop a deleted job
+    def remove_job(self, job_id: int):
+        with self._lock:
+            self.index.remove(job_id)
+            self._indexed_stamps.pop(job_id, None)
+
+    # Index (or re-index) one row and remember which version of it is indexed
+    def _add_row(self, job_id, skills, title, description, updated_at):
+        self.index.add(job_id, job_term_weights(skills, title, description))
+        self._indexed_stamps[job_id] = updated_at
+        if updated_at is not None:
+            self._updated_at = max(self._updated_at, updated_at)
+
+    # Index every job with an id above the last one seen, in keyset-paginated batches
+    def _catch_up(self, db: Session):
+        while True:
+            rows = (
+                db.query(JobPosting.id, JobPosting.skills, JobPosting.job_title, JobPosting.job_description,
+                         JobPosting.updated_at)
+                .filter(JobPosting.id > self._max_id)
+                .order_by(JobPosting.id)
+                .limit(LOAD_BATCH_SIZE)
+                .all()
+            )
+            if not rows:
+                break
+            for row in rows:
+                self._add_row(*row)
+            self._max_id = rows[-1][0]
+
+    # Re-index jobs edited since the last check (by any process); returns how many changed
+    def _catch_up_updates(self, db: Session) -> int:
+        rows = (
+            db.query(JobPosting.id, JobPosting.skills, JobPosting.job_title, JobPosting.job_description,
+                     JobPosting.updated_at)
+            .filter(JobPosting.updated_at > self._updated_at - UPDATE_OVERLAP_SECONDS)
+            .filter(JobPosting.id <= self._max_id)
+            .all()
+        )
+        changed = [row for row in rows if self._indexed_stamps.get(row[0]) != row[4]]
+        for row in changed:
+            self._add_row(*row)
+        return len(changed)
+
+    # Pick up jobs added or edited by other processes; rebuild only if rows disappeared
+    def ensure_fresh(self):
+        now = time.monotonic()
+        if self._count is not None and now - self._last_check < REFRESH_CHECK_SECONDS:
+            return
+        with self._lock:
+            db: Session = SessionLocal()
+            try:
+                count, max_id, updated_at = db.query(
+                    func.count(JobPosting.id), func.max(JobPosting.id), func.max(JobPosting.updated_at)
+                ).one()
+                if self._count is not None and count < len(self.index):
+                    self.index, self._max_id, self._updated_at, self._indexed_stamps = BM25Index(), 0, 0.0, {}
+                if (max_id or 0) > self._max_id or self._count is None:
+                    self._catch_up(db)
+                    print(f"🔤 Job text index holds {len(self.index)} jobs.")
+                if updated_at is not None and updated_at > self._updated_at - UPDATE_OVERLAP_SECONDS:
+                    updated = self._catch_up_updates(db)
+                    if updated:
+                        print(f"🔤 Re-indexed {updated} edited jobs.")
+                self._count = count
+                self._last_check = time.monotonic()
+            finally:
+                db.close()
+
+    # Return (job ids, BM25 scores) of the best k jobs for a list of skills
+    def search(self, skills: list[str], k: int = 100):
+        self.ensure_fresh()
+        terms = [term for skill in skills for term in tokenize(skill)]
+        with self._lock:
+            return self.index.search(terms, k)
+
+
+# Shared instance used by hybrid retrieval
+job_text_index = JobTextIndex()
@@ -0,0 +1,134 @@
+# Content-addressed cache for text embeddings.
+# Skill lists are normalized (lower-case, trimmed, deduplicated, sorted) before they are encoded,
+# so reordered or repeated lists share one vector. Vectors are keyed by a hash of the model name
+# and the normalized text. They live in a bounded in-memory LRU backed by a SQLite table of
+# packed blobs that every process and script shares.
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+import numpy as np
+from app.db.types import pack_embedding, unpack_embedding
+
+# Constants
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "data/embedding_cache.sqlite")  # "" disables the disk tier
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "50000"))
+SQLITE_MAX_VARIABLES = 900
+
+
+# Normalized text for a skill list; this is both the cache key and the text given to the model
+def normalize_skills(skills) -> str:
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    cleaned = {" ".join(s.lower().split()) for s in skills if isinstance(s, str)}
+    return ", ".join(sorted(s for s in cleaned if s))
+
+
+# Normalized text for free text: lower-case with single spaces (the MiniLM tokenizer is uncased)
+def normalize_text(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+# Two-tier (memory LRU + SQLite) cache of embeddings for one model
+class EmbeddingCache:
+    def __init__(self, model_name: str, path: str = EMBEDDING_CACHE_PATH, max_items: int = EMBEDDING_CACHE_SIZE):
+        self.model_name = model_name
+        self.path = path
+        self.max_items = max_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._memory)
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).digest()
+
+    # SQLite connection for the disk tier, opened on first use (None when disabled)
+    def _connection(self):
+        if self._db is None and self.path:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)")
+            self._db.commit()
+        return self._db
+
+    def _remember(self, key: bytes, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    # Embed already-normalized texts; only texts missing from both tiers reach encode_fn
+    def encode(self, texts: list[str], encode_fn) -> np.ndarray:
+        keys = [self._key(text) for text in texts]
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    found[key] = self._memory[key]
+                    self._memory.move_to_end(key)
+
+            in_memory = set(found)
+
+            # Second tier: one SELECT per slice of missing keys
+            missing = list(dict.fromkeys(key for key in keys if key not in found))
+            db = self._connection()
+            if db is not None:
+                for start in range(0, len(missing), SQLITE_MAX_VARIABLES):
+                    chunk = missing[start:start + SQLITE_MAX_VARIABLES]
+                    placeholders = ",".join("?" * len(chunk))
+                    for key, blob in db.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk):
+                        found[key] = unpack_embedding(blob)
+                        self._remember(key, found[key])
+            disk_hits = sum(1 for key in keys if key in found and key not in in_memory)
+
+        # Encode every distinct missing text with one model call
+        to_encode = {key: text for key, text in zip(keys, texts) if key not in found}
+        if to_encode:
+            vectors = np.asarray(encode_fn(list(to_encode.values())), dtype=np.float32)
+            with self._lock:
+                for key, vector in zip(to_encode, vectors):
+                    found[key] = vector
+                    self._remember(key, vector)
+                db = self._connection()
+                if db is not None:
+                    db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                        [(key, pack_embedding(found[key])) for key in to_encode],
+                    )
+                    db.commit()
+
+        # Repeats of a text within one call count as memory hits; only model calls are misses
+        with self._lock:
+            self.memory_hits += len(keys) - disk_hits - len(to_encode)
+            self.disk_hits += disk_hits
+            self.misses += len(to_encode)
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+
+    # Embed skill lists (one vector per list) through the cache
+    def encode_skill_lists(self, skill_lists: list, encode_fn) -> np.ndarray:
+        return self.encode([normalize_skills(skills) for skills in skill_lists], encode_fn)
+
+    # Hit counters and rates since the process started
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "model": self.model_name,
+            "lookups": lookups,
+            "memoryHits": self.memory_hits,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "hitRate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "memoryItems": len(self._memory),
+            "memoryCapacity": self.max_items,
+        }
+
@@ -0,0 +1,137 @@
+# This module implements the on-disk job embedding store shared by all API workers.
+# Vectors are kept as normalized float32 .npy segments with an id sidecar per segment and
+# are opened with np.memmap, so every worker process reads the same page-cache copy.
+# New embeddings are appended as a new segment; compaction rewrites everything as one.
+import json
+import os
+import numpy as np
+
+# Location of the store (relative to the backend directory, like the other data files)
+EMBEDDING_STORE_DIR = os.getenv("EMBEDDING_STORE_DIR", "data/embedding_store")
+MANIFEST_NAME = "manifest.json"
+
+
+# Read-only view over several memory-mapped segments that behaves like one matrix.
+# `rows` selects the live rows (an id re-embedded in a later segment hides its old row).
+class SegmentedMatrix:
+    def __init__(self, segments: list, rows: np.ndarray = None):
+        self.segments = segments
+        self.offsets = np.concatenate(([0], np.cumsum([s.shape[0] for s in segments]))).astype(np.int64)
+        self.rows = rows
+        self.dim = segments[0].shape[1] if segments else 0
+
+    @property
+    def shape(self):
+        n_rows = self.rows.shape[0] if self.rows is not None else int(self.offsets[-1])
+        return n_rows, self.dim
+
+    def __len__(self):
+        return self.shape[0]
+
+    # Score every live row against a vector (d,) or a matrix of column vectors (d, m)
+    def __matmul__(self, other):
+        scores = np.concatenate([segment @ other for segment in self.segments], axis=0)
+        return scores[self.rows] if self.rows is not None else scores
+
+    # Gather rows by position (array or slice) into a regular in-memory array
+    def __getitem__(self, positions):
+        if isinstance(positions, slice):
+            positions = np.arange(*positions.indices(len(self)))
+        positions = np.asarray(positions, dtype=np.int64)
+        global_positions = self.rows[positions] if self.rows is not None else positions
+        segment_of = np.searchsorted(self.offsets, global_positions, side="right") - 1
+        out = np.empty((global_positions.shape[0], self.dim), dtype=np.float32)
+        for s in np.unique(segment_of):
+            mask = segment_of == s
+            out[mask] = self.segments[s][global_positions[mask] - self.offsets[s]]
+        return out
+
+
+# Manifest-driven collection of embedding segments in one directory
+class EmbeddingStore:
+    def __init__(self, directory: str = EMBEDDING_STORE_DIR):
+        self.directory = directory
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST_NAME)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.manifest_path)
+
+    def read_manifest(self) -> dict:
+        if not self.exists():
+            return {"version": 0, "dim": None, "segments": []}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    # Replace the manifest atomically so readers never see a partial file
+    def _write_manifest(self, manifest: dict):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    # Write one segment (vectors + id sidecar) and return its manifest entry
+    def _write_segment(self, name: str, ids: np.ndarray, vectors: np.ndarray) -> dict:
+        for suffix, array in ((".npy", vectors), (".ids.npy", ids)):
+            tmp_path = os.path.join(self.directory, name + ".tmp" + suffix)
+            np.save(tmp_path, array)
+            os.replace(tmp_path, os.path.join(self.directory, name + suffix))
+        return {"name": name, "rows": int(ids.shape[0])}
+
+    @staticmethod
+    def _prepare(ids, vectors):
+        ids = np.ascontiguousarray(ids, dtype=np.int64)
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[0] != ids.shape[0]:
+            raise ValueError(f"Expected one vector per id, got {vectors.shape} for {ids.shape[0]} ids")
+        return ids, vectors
+
+    # Append normalized vectors for the given job ids as a new segment
+    def append(self, ids, vectors):
+        ids, vectors = self._prepare(ids, vectors)
+        if ids.shape[0] == 0:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        manifest = self.read_manifest()
+        if manifest["dim"] not in (None, vectors.shape[1]):
+            raise ValueError(f"Store holds {manifest['dim']}-d vectors, got {vectors.shape[1]}-d")
+
+        version = manifest["version"] + 1
+        manifest["segments"].append(self._write_segment(f"segment_{version:05d}", ids, vectors))
+        manifest.update(version=version, dim=int(vectors.shape[1]))
+        self._write_manifest(manifest)
+
+    # Replace the whole store with a single segment (used for the initial export and compaction)
+    def rewrite(self, ids, vectors):
+        ids, vectors = self._prepare(ids, vectors)
+        os.makedirs(self.directory, exist_ok=True)
+        old_segments = self.read_manifest()["segments"]
+        version = self.read_manifest()["version"] + 1
+
+        segment = self._write_segment(f"segment_{version:05d}", ids, vectors)
+        self._write_manifest({"version": version, "dim": int(vectors.shape[1]), "segments": [segment]})
+
+        # Workers that still map the old files keep reading them until they reopen the store
+        for old in old_segments:
+            for suffix in (".npy", ".ids.npy"):
+                path = os.path.join(self.directory, old["name"] + suffix)
+                if os.path.exists(path):
+                    os.remove(path)
+
+    # Memory-map every segment; returns (live ids, matrix view, manifest version)
+    def open(self):
+        manifest = self.read_manifest()
+        segments, id_parts = [], []
+        for entry in manifest["segments"]:
+            base = os.path.join(self.directory, entry["name"])
+            segments.append(np.load(base + ".npy", mmap_mode="r"))
+            id_parts.append(np.load(base + ".ids.npy"))
+
+        all_ids = np.concatenate(id_parts) if id_parts else np.empty(0, dtype=np.int64)
+        # Keep only the newest row of every id
+        _, last_from_end = np.unique(all_ids[::-1], return_index=True)
+        live = np.sort(all_ids.shape[0] - 1 - last_from_end)
+        rows = None if live.shape[0] == all_ids.shape[0] else live
+        return all_ids[live], SegmentedMatrix(segments, rows), manifest["version"]
@@ -0,0 +1,126 @@
+# Shared text-embedding backends and the factory every module uses to get one.
+# "torch" runs all-MiniLM-L6-v2 through sentence-transformers. "onnx" runs the same model
+# exported to ONNX with int8 dynamic quantization (see scripts/export_onnx_model.py) from local
+# files. Both return L2-normalized float32 vectors. Encodes go through the embedding cache,
+# which is keyed per backend because the quantized vectors differ slightly.
+import os
+import threading
+import numpy as np
+from app.services.embedding_cache import EmbeddingCache
+from app.services.inference_sidecar import INFERENCE_SIDECAR_SOCKET
+from app.services.model_registry import models
+
+# Constants
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()  # torch or onnx
+EMBEDDING_ONNX_DIR = os.getenv("EMBEDDING_ONNX_DIR", f"data/onnx/{EMBEDDING_MODEL_NAME}")
+ONNX_MODEL_FILE = "model_quantized.onnx"
+ONNX_TOKENIZER_FILE = "tokenizer.json"
+MAX_SEQUENCE_LENGTH = 256  # same truncation as the sentence-transformers model
+ENCODE_BATCH_SIZE = 64
+
+
+# sentence-transformers on CPU (PyTorch)
+class TorchEmbeddingBackend:
+    name = "torch"
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL_NAME):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name, device="cpu")
+
+    @property
+    def dim(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: list[str], batch_size: int = ENCODE_BATCH_SIZE) -> np.ndarray:
+        return self.model.encode(texts, batch_size=batch_size, device="cpu", convert_to_numpy=True,
+                                 normalize_embeddings=True)
+
+
+# int8-quantized ONNX export of the same model, run with onnxruntime
+class OnnxEmbeddingBackend:
+    name = "onnx-int8"
+
+    def __init__(self, model_dir: str = EMBEDDING_ONNX_DIR):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_path = os.path.join(model_dir, ONNX_MODEL_FILE)
+        tokenizer_path = os.path.join(model_dir, ONNX_TOKENIZER_FILE)
+        if not os.path.exists(model_path) or not os.path.exists(tokenizer_path):
+            raise RuntimeError(
+                f"ONNX embedding model not found in {model_dir}; run python -m app.scripts.export_onnx_model"
+            )
+        self.session = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length=MAX_SEQUENCE_LENGTH)
+        self.tokenizer.enable_padding()
+
+    @property
+    def dim(self) -> int:
+        return self.session.get_outputs()[0].shape[-1]
+
+    # Mean-pool the token embeddings over the attention mask and normalize, like the
+    # Pooling + Normalize modules of the sentence-transformers model
+    def _encode_batch(self, texts: list[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        tokens = self.session.run(None, feeds)[0]
+        mask = attention_mask[:, :, None].astype(np.float32)
+        pooled = (tokens * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        return pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+
+    def encode(self, texts: list[str], batch_size: int = ENCODE_BATCH_SIZE) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+        # Batch texts of similar length together to keep padding short
+        order = np.argsort([len(t) for t in texts], kind="stable")
+        vectors = np.empty((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            positions = order[start:start + batch_size]
+            vectors[positions] = self._encode_batch([texts[p] for p in positions])
+        return vectors
+
+
+EMBEDDING_BACKENDS = {"torch": TorchEmbeddingBackend, "onnx": OnnxEmbeddingBackend}
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+# Shared backend instance; the model is loaded on first use
+def get_embedding_backend(name: str = EMBEDDING_BACKEND):
+    if name not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend {name!r}; expected one of {sorted(EMBEDDING_BACKENDS)}")
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = EMBEDDING_BACKENDS[name]()
+        return _backends[name]
+
+
+# Cache namespace for a backend: the torch vectors keep the plain model name
+def embedding_cache_key(name: str = EMBEDDING_BACKEND) -> str:
+    return EMBEDDING_MODEL_NAME if name == "torch" else f"{EMBEDDING_MODEL_NAME}:{name}"
+
+
+# Shared cache used by every encode call site
+embedding_cache = EmbeddingCache(embedding_cache_key())
+
+# The configured backend, loaded on first encode or by the startup warmup (not warmed up when
+# API workers share an inference sidecar; it is then only loaded as a fallback)
+models.register("embedding", get_embedding_backend, warmup=not INFERENCE_SIDECAR_SOCKET)
+
+
+# Raw model call with the configured backend (no cache)
+def encode_texts(texts: list[str], batch_size: int = ENCODE_BATCH_SIZE) -> np.ndarray:
+    return models.get("embedding").encode(texts, batch_size=batch_size)
+
+
+# One vector per skill list, through the cache
+def encode_skill_lists(skill_lists: list) -> np.ndarray:
+    return embedding_cache.encode_skill_lists(skill_lists, encode_texts)
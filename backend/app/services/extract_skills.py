@@ -1,40 +1,38 @@
-import spacy
-import nltk
 import csv
+from app.services.model_registry import models
+from app.services.skill_automaton import SkillAutomaton
 
-# Additional libraries
-nltk.download('punkt')
+# Constants
+SKILLS_CSV_PATH = 'data/newSkills.csv'
 
-# Load the spaCy model for English
-nlp = spacy.load('en_core_web_sm')
+# spaCy pipelines are loaded on first use, in whichever process runs the word cloud
+def load_spacy_model(name):
+    import spacy
+    return spacy.load(name)
+
+# The spaCy model for English
+models.register("spacy_en", lambda: load_spacy_model('en_core_web_sm'), warmup=False)
 
 def load_keywords(file_path):
     with open(file_path, 'r') as file:
         reader = csv.reader(file)
         return set(row[0] for row in reader)
 
-def csv_skills(doc):
-    skills_keywords = load_keywords('data/newSkills.csv')
-    skills = {}
-
-    # Loop through each keyword in the skills list
-    for keyword in skills_keywords:
-        if keyword.lower() in doc.text.lower():
-            # If the keyword is found, increment its count in the dictionary
-            if keyword in skills:
-                skills[keyword] += 1
-            else:
-                skills[keyword] = 1
+# The skills vocabulary as an Aho-Corasick automaton, read and built once per process
+models.register("skills_vocabulary", lambda: SkillAutomaton(sorted(load_keywords(SKILLS_CSV_PATH))), warmup=False)
 
-    return skills
+# Occurrences of each vocabulary skill in the document, matched as whole words in one pass
+def csv_skills(doc):
+    return models.get("skills_vocabulary").count(doc.text)
 
-nlp_skills = spacy.load('data/skills')  # Load the trained NER model for skills
+# The trained NER model for skills (only used by extract_skills_from_ner)
+models.register("spacy_skills", lambda: load_spacy_model('data/skills'), warmup=False)
 
 def extract_skills_from_ner(doc):
     non_skill_labels = {'DATE', 'TIME', 'PERCENT', 'MONEY', 'QUANTITY', 'ORDINAL', 'CARDINAL', 'EMAIL'}
     
     skills = set()
-    for ent in nlp_skills(doc.text).ents:
+    for ent in models.get("spacy_skills")(doc.text).ents:
         if ent.label_ == 'SKILL':
             # Check if the entity text is not in the non-skill labels set
             if ent.label_ not in non_skill_labels and not ent.text.isdigit():
@@ -49,7 +47,7 @@ def is_valid_skill(skill_text):
     return len(skill_text) > 1 and not any(char.isdigit() for char in skill_text)
 
 def extract_skills(resume_text):
-    doc = nlp(resume_text)
+    doc = models.get("spacy_en")(resume_text)
     skills_csv = csv_skills(doc)
     # skills_ner = extract_skills_from_ner(doc)
     
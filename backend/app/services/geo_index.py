@@ -0,0 +1,155 @@
+# This module provides a grid-based spatial index over job latitude/longitude.
+# Points are bucketed into fixed-size lat/lon cells; a radius query only visits the cells
+# overlapping the radius' bounding box and then checks the exact haversine distance.
+import threading
+import time
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.db.database import SessionLocal
+from app.models.job import JobPosting
+
+# Constants
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180.0
+CELL_DEGREES = 0.5
+REFRESH_CHECK_SECONDS = 5.0
+
+
+# Great-circle distance (km) from one point to arrays of points
+def haversine_km(lat, lon, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+# Rows with usable coordinates; (0, 0) is what the loaders write when a location is unknown
+def valid_coordinates(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    known = np.isfinite(lats) & np.isfinite(lons) & ~((lats == 0) & (lons == 0))
+    return known & (np.abs(lats) <= 90) & (np.abs(lons) <= 180)
+
+
+# Fixed grid of lat/lon cells over a set of points (positions refer to the input arrays)
+class GeoGridIndex:
+    def __init__(self, lats: np.ndarray, lons: np.ndarray, cell_degrees: float = CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self.n_rows = int(np.floor(180 / cell_degrees)) + 1
+        self.n_cols = int(np.floor(360 / cell_degrees))
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+
+        # Sort the valid points by cell id and remember where each cell starts (CSR layout)
+        positions = np.flatnonzero(valid_coordinates(self.lats, self.lons))
+        cells = self._cell_ids(self.lats[positions], self.lons[positions])
+        order = np.argsort(cells, kind="stable")
+        self.positions = positions[order]
+        self.cell_keys, starts = np.unique(cells[order], return_index=True)
+        self.cell_bounds = np.append(starts, self.positions.shape[0])
+
+    def __len__(self):
+        return self.positions.shape[0]
+
+    def _cell_ids(self, lats, lons) -> np.ndarray:
+        rows = np.floor((np.asarray(lats) + 90) / self.cell_degrees).astype(np.int64)
+        cols = np.floor((np.asarray(lons) + 180) / self.cell_degrees).astype(np.int64) % self.n_cols
+        return rows * self.n_cols + cols
+
+    # Cell ids overlapping the bounding box of a radius around a point
+    def _candidate_cells(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        lat_span = radius_km / KM_PER_DEGREE
+        row_low = int(np.floor((max(lat - lat_span, -90) + 90) / self.cell_degrees))
+        row_high = int(np.floor((min(lat + lat_span, 90) + 90) / self.cell_degrees))
+        rows = np.arange(row_low, row_high + 1)
+
+        # Longitude degrees shrink with latitude; near the poles every column is a candidate
+        max_abs_lat = min(90.0, abs(lat) + lat_span)
+        cos_lat = np.cos(np.radians(max_abs_lat))
+        if cos_lat < 1e-6 or radius_km / (KM_PER_DEGREE * cos_lat) >= 180:
+            cols = np.arange(self.n_cols)
+        else:
+            lon_span = radius_km / (KM_PER_DEGREE * cos_lat)
+            col_low = int(np.floor((lon - lon_span + 180) / self.cell_degrees))
+            col_high = int(np.floor((lon + lon_span + 180) / self.cell_degrees))
+            cols = np.arange(col_low, col_high + 1) % self.n_cols
+        return (rows[:, None] * self.n_cols + np.unique(cols)[None, :]).ravel()
+
+    # Return (positions, distances in km) of the points within radius_km, nearest first
+    def query_radius(self, lat: float, lon: float, radius_km: float):
+        cells = self._candidate_cells(lat, lon, radius_km)
+        found = np.searchsorted(self.cell_keys, cells)
+        present = found < self.cell_keys.shape[0]
+        found, cells = found[present], cells[present]
+        found = found[self.cell_keys[found] == cells]
+        if found.shape[0] == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        candidates = np.concatenate([self.positions[self.cell_bounds[c]:self.cell_bounds[c + 1]] for c in found])
+        distances = haversine_km(lat, lon, self.lats[candidates], self.lons[candidates])
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.argsort(distances, kind="stable")
+        return candidates[order], distances[order]
+
+    # Boolean mask over all input rows selecting the points within radius_km
+    def radius_mask(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        mask = np.zeros(self.lats.shape[0], dtype=bool)
+        mask[self.query_radius(lat, lon, radius_km)[0]] = True
+        return mask
+
+
+# Process-wide spatial index over every job posting (with or without an embedding)
+class JobGeoIndex:
+    def __init__(self):
+        self._snapshot = (np.empty(0, dtype=np.int64), GeoGridIndex(np.empty(0), np.empty(0)))
+        self._signature = None
+        self._stale = True
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    # Cheap fingerprint of the table used to notice inserts, deletes and moved jobs
+    def _table_signature(self, db: Session):
+        return tuple(db.query(
+            func.count(JobPosting.id), func.max(JobPosting.id),
+            func.sum(JobPosting.latitude), func.sum(JobPosting.longitude),
+        ).one())
+
+    # Load all coordinates and build the grid
+    def build(self, db: Session):
+        signature = self._table_signature(db)
+        rows = db.query(JobPosting.id, JobPosting.latitude, JobPosting.longitude).yield_per(5000).all()
+        ids = np.array([r[0] for r in rows], dtype=np.int64)
+        lats = np.array([r[1] if r[1] is not None else np.nan for r in rows], dtype=np.float64)
+        lons = np.array([r[2] if r[2] is not None else np.nan for r in rows], dtype=np.float64)
+        self._snapshot = (ids, GeoGridIndex(lats, lons))
+        self._signature = signature
+        self._stale = False
+
+    # Mark the index as outdated; it is rebuilt on the next query
+    def invalidate(self):
+        self._stale = True
+
+    # Rebuild the index if it was never built or the table changed
+    def ensure_fresh(self):
+        now = time.monotonic()
+        if not self._stale and now - self._last_check < REFRESH_CHECK_SECONDS:
+            return
+        with self._lock:
+            db: Session = SessionLocal()
+            try:
+                if self._stale or self._table_signature(db) != self._signature:
+                    self.build(db)
+                self._last_check = time.monotonic()
+            finally:
+                db.close()
+
+    # Return (job ids, distances in km) within radius_km of a point, nearest first
+    def query_radius(self, lat: float, lon: float, radius_km: float):
+        self.ensure_fresh()
+        ids, grid = self._snapshot
+        positions, distances = grid.query_radius(lat, lon, radius_km)
+        return ids[positions], distances
+
+
+# Shared instance used by the /jobs/nearby endpoint
+job_geo_index = JobGeoIndex()
@@ -0,0 +1,66 @@
+# First-stage candidate retrieval for resume matching.
+# Dense (embedding) and lexical (BM25) candidates are merged and ranked by a weighted sum
+# of the cosine score and the normalized BM25 score, so jobs that name the resume's exact
+# tools are not lost, and only a short, better list has to go to the Gemini rerank.
+import os
+import numpy as np
+from app.services.bm25_index import job_text_index
+from app.services.job_index import job_index
+from app.schemas.job import JobMatchFilters
+
+# "hybrid" fuses BM25 with the embedding scores, "dense" keeps the embedding-only top 100
+RETRIEVAL_MODE = os.getenv("MATCH_RETRIEVAL_MODE", "hybrid").lower()
+HYBRID_DENSE_WEIGHT = float(os.getenv("HYBRID_DENSE_WEIGHT", "0.7"))
+HYBRID_LEXICAL_CANDIDATES = int(os.getenv("HYBRID_LEXICAL_CANDIDATES", "200"))
+HYBRID_RERANK_CANDIDATES = int(os.getenv("HYBRID_RERANK_CANDIDATES", "40"))
+
+# Cosine cut-offs: dense candidates keep the original threshold, lexical hits may sit a bit lower
+DENSE_CANDIDATES = 100
+DENSE_MIN_SCORE = 0.3
+LEXICAL_MIN_SCORE = 0.2
+
+
+# Merge dense results with BM25 results for one resume.
+# Returns (job ids, cosine scores) ordered by the fused score, best first.
+def fuse_candidates(resume_skills: list[str], resume_embedding: np.ndarray, dense_ids: np.ndarray,
+                    dense_scores: np.ndarray, filters: JobMatchFilters = None, k: int = HYBRID_RERANK_CANDIDATES):
+    lexical_ids, lexical_scores = job_text_index.search(resume_skills, k=HYBRID_LEXICAL_CANDIDATES)
+    if lexical_ids.shape[0] == 0:
+        return dense_ids[:k], dense_scores[:k]
+
+    # Cosine scores of lexical hits that the dense stage did not return
+    extra = ~np.isin(lexical_ids, dense_ids)
+    extra_ids, extra_scores = job_index.score_ids(resume_embedding, lexical_ids[extra], filters=filters)
+    keep = extra_scores > LEXICAL_MIN_SCORE
+    ids = np.concatenate([dense_ids, extra_ids[keep]])
+    cosine = np.concatenate([dense_scores, extra_scores[keep]]).astype(np.float32)
+
+    # BM25 scores normalized to [0, 1] by the best hit; jobs without a term match get 0
+    bm25 = np.zeros(ids.shape[0], dtype=np.float32)
+    order = np.argsort(lexical_ids)
+    found = np.minimum(np.searchsorted(lexical_ids[order], ids), lexical_ids.shape[0] - 1)
+    hit = lexical_ids[order][found] == ids
+    bm25[hit] = lexical_scores[order][found[hit]] / lexical_scores.max()
+
+    fused = HYBRID_DENSE_WEIGHT * cosine + (1 - HYBRID_DENSE_WEIGHT) * bm25
+    best = np.argsort(-fused, kind="stable")[:k]
+    return ids[best], cosine[best]
+
+
+# Candidate jobs for one resume as (job ids, cosine scores)
+def retrieve_candidates(resume_skills: list[str], resume_embedding: np.ndarray, filters: JobMatchFilters = None):
+    dense_ids, dense_scores = job_index.search(resume_embedding, k=DENSE_CANDIDATES, min_score=DENSE_MIN_SCORE, filters=filters)
+    if RETRIEVAL_MODE != "hybrid":
+        return dense_ids, dense_scores
+    return fuse_candidates(resume_skills, resume_embedding, dense_ids, dense_scores, filters)
+
+
+# Candidate jobs for many resumes; the dense stage scores all of them in one batch
+def retrieve_candidates_batch(skill_lists: list[list[str]], embeddings: np.ndarray, filters: JobMatchFilters = None):
+    dense = job_index.search_batch(embeddings, k=DENSE_CANDIDATES, min_score=DENSE_MIN_SCORE, filters=filters)
+    if RETRIEVAL_MODE != "hybrid":
+        return dense
+    return [
+        fuse_candidates(skills, embedding, dense_ids, dense_scores, filters)
+        for skills, embedding, (dense_ids, dense_scores) in zip(skill_lists, embeddings, dense)
+    ]
@@ -0,0 +1,236 @@
+# Shared inference process for all API workers, reached over a Unix socket.
+# Without it, every uvicorn worker holds its own embedding model and spaCy pipeline, and the
+# one-resume encodes of concurrent requests never batch together. The sidecar loads the
+# models once. Encode requests that arrive from any worker within a short window are
+# joined into one model call and the vectors are split back per request.
+# Messages are length-prefixed: a JSON header, then an optional float32 payload.
+import json
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+
+# Constants
+INFERENCE_SIDECAR_SOCKET = os.getenv("INFERENCE_SIDECAR_SOCKET", "")  # "" keeps inference in-process
+INFERENCE_SIDECAR_TIMEOUT_SECONDS = float(os.getenv("INFERENCE_SIDECAR_TIMEOUT_SECONDS", "10"))
+SIDECAR_BATCH_WINDOW_MS = float(os.getenv("SIDECAR_BATCH_WINDOW_MS", "5"))
+SIDECAR_MAX_BATCH_TEXTS = int(os.getenv("SIDECAR_MAX_BATCH_TEXTS", "256"))
+SIDECAR_RETRY_SECONDS = 5.0  # how long a client stays on the in-process fallback after a failure
+FRAME = struct.Struct("!II")  # header length, payload length
+
+
+# Raised when the sidecar answers with an error
+class SidecarError(RuntimeError):
+    pass
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Inference sidecar connection closed")
+        data.extend(chunk)
+    return bytes(data)
+
+def send_message(sock: socket.socket, header: dict, payload: bytes = b""):
+    encoded = json.dumps(header).encode("utf-8")
+    sock.sendall(FRAME.pack(len(encoded), len(payload)) + encoded + payload)
+
+# Returns (header, payload), or (None, b"") when the peer closed the connection between messages
+def recv_message(sock: socket.socket):
+    first = sock.recv(FRAME.size)
+    if not first:
+        return None, b""
+    header_size, payload_size = FRAME.unpack(first + _recv_exact(sock, FRAME.size - len(first)))
+    header = json.loads(_recv_exact(sock, header_size))
+    return header, _recv_exact(sock, payload_size)
+
+
+# Joins encode requests that arrive within the batch window into one model call
+class EncodeBatcher:
+    def __init__(self, encode, window_ms: float = SIDECAR_BATCH_WINDOW_MS, max_texts: int = SIDECAR_MAX_BATCH_TEXTS):
+        self.encode = encode
+        self.window = window_ms / 1000
+        self.max_texts = max_texts
+        self.requests = 0
+        self.batches = 0
+        self._queue = queue.Queue()
+        threading.Thread(target=self._loop, name="encode-batcher", daemon=True).start()
+
+    # Vectors for texts, encoded together with any other requests in the same window
+    def submit(self, texts: list[str]) -> np.ndarray:
+        future = Future()
+        self._queue.put((texts, future))
+        return future.result()
+
+    def _loop(self):
+        while True:
+            batch = [self._queue.get()]
+            n_texts = len(batch[0][0])
+            deadline = time.monotonic() + self.window
+            while n_texts < self.max_texts:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                n_texts += len(batch[-1][0])
+
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            try:
+                vectors = self.encode(texts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.requests += len(batch)
+            self.batches += 1
+            start = 0
+            for request_texts, future in batch:
+                future.set_result(vectors[start:start + len(request_texts)])
+                start += len(request_texts)
+
+
+# One thread per API worker connection; requests on a connection are answered in order
+class SidecarRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server
+        while True:
+            try:
+                header, payload = recv_message(self.request)
+            except (ConnectionError, OSError):
+                return
+            if header is None:
+                return
+            try:
+                op = header.get("op")
+                if op == "encode":
+                    vectors = np.ascontiguousarray(server.batcher.submit(header["texts"]), dtype=np.float32)
+                    send_message(self.request, {"shape": list(vectors.shape)}, vectors.tobytes())
+                elif op == "word_cloud":
+                    send_message(self.request, {"result": server.word_cloud(header["text"])})
+                elif op == "hello":
+                    send_message(self.request, {"cacheKey": server.cache_key, "pid": os.getpid(),
+                                                "requests": server.batcher.requests, "batches": server.batcher.batches})
+                else:
+                    send_message(self.request, {"error": f"Unknown op {op!r}"})
+            except (ConnectionError, OSError):
+                return
+            except Exception as e:
+                send_message(self.request, {"error": str(e)})
+
+
+class SidecarServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128  # every API worker thread may connect at once
+
+
+# Load the models and serve until interrupted
+def serve(socket_path: str = INFERENCE_SIDECAR_SOCKET, window_ms: float = SIDECAR_BATCH_WINDOW_MS,
+          max_texts: int = SIDECAR_MAX_BATCH_TEXTS):
+    from app.services.embeddings import embedding_cache_key, get_embedding_backend
+    from app.services.extract_skills import extract_skills
+
+    backend = get_embedding_backend()
+    extract_skills("warmup")  # load spaCy now rather than on the first request
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    server = SidecarServer(socket_path, SidecarRequestHandler)
+    server.batcher = EncodeBatcher(backend.encode, window_ms, max_texts)
+    server.word_cloud = extract_skills
+    server.cache_key = embedding_cache_key()
+    print(f"🛰️ Inference sidecar ({backend.name}) listening on {socket_path}, batch window {window_ms:g} ms")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+# Client used by the API workers; one connection per thread
+class InferenceClient:
+    def __init__(self, socket_path: str = INFERENCE_SIDECAR_SOCKET, timeout: float = INFERENCE_SIDECAR_TIMEOUT_SECONDS):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+        return sock
+
+    # Send one request and return (header, payload); a broken connection is dropped and re-raised
+    def request(self, header: dict):
+        sock = self._connection()
+        try:
+            send_message(sock, header)
+            response, payload = recv_message(sock)
+            if response is None:
+                raise ConnectionError("Inference sidecar closed the connection")
+        except (OSError, ConnectionError):
+            sock.close()
+            self._local.sock = None
+            raise
+        if "error" in response:
+            raise SidecarError(response["error"])
+        return response, payload
+
+    def hello(self) -> dict:
+        return self.request({"op": "hello"})[0]
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        response, payload = self.request({"op": "encode", "texts": list(texts)})
+        return np.frombuffer(payload, dtype=np.float32).reshape(response["shape"]).copy()
+
+    def word_cloud(self, text: str) -> dict:
+        return self.request({"op": "word_cloud", "text": text})[0]["result"]
+
+
+# Calls fn(client, ...) on the sidecar and falls back to fallback(...) while it is unreachable.
+# The sidecar is only used once it has confirmed that its vectors match the local cache key.
+class SidecarWithFallback:
+    def __init__(self, client: InferenceClient, cache_key: str):
+        self.client = client
+        self.cache_key = cache_key
+        self._retry_at = 0.0
+        self._checked = False
+        self._lock = threading.Lock()
+
+    def _usable(self) -> bool:
+        if time.monotonic() < self._retry_at:
+            return False
+        if not self._checked:
+            with self._lock:
+                if not self._checked:
+                    sidecar_key = self.client.hello()["cacheKey"]
+                    if sidecar_key != self.cache_key:
+                        raise SidecarError(f"Sidecar serves {sidecar_key!r} but this worker uses {self.cache_key!r}")
+                    self._checked = True
+        return True
+
+    def call(self, fn, fallback, *args):
+        try:
+            if self._usable():
+                return fn(*args)
+        except (OSError, ConnectionError, SidecarError) as e:
+            self._retry_at = time.monotonic() + SIDECAR_RETRY_SECONDS
+            print(f"⚠️ Inference sidecar unavailable ({e}); running in-process for {SIDECAR_RETRY_SECONDS:g}s")
+        return fallback(*args)
@@ -2,6 +2,9 @@
 from sqlalchemy.orm import Session
 from app.models.job import JobPosting
 from app.schemas.job import JobCreate, JobUpdate
+from app.services.bm25_index import job_text_index
+from app.services.geo_index import job_geo_index
+from app.services.job_index import job_index
 
 # Methods for CRUD operations
 # Get a job by ID
@@ -18,6 +21,9 @@ def create_job(db: Session, job_data: JobCreate):
     db.add(job)
     db.commit()
     db.refresh(job)
+    job_index.invalidate()
+    job_geo_index.invalidate()
+    job_text_index.add_job(job)
     return job
 
 # Update an existing job
@@ -29,6 +35,9 @@ def update_job(db: Session, job_id: int, job_data: JobUpdate):
         setattr(job, field, value)
     db.commit()
     db.refresh(job)
+    job_index.invalidate()
+    job_geo_index.invalidate()
+    job_text_index.add_job(job)
     return job
 
 # Delete a job
@@ -38,4 +47,14 @@ def delete_job(db: Session, job_id: int):
         return None
     db.delete(job)
     db.commit()
+    job_index.invalidate()
+    job_geo_index.invalidate()
+    job_text_index.remove_job(job_id)
     return job
+
+# Get jobs within radius_km of a point, nearest first, as (job, distance) pairs
+def get_jobs_near(db: Session, latitude: float, longitude: float, radius_km: float, skip: int = 0, limit: int = 10):
+    job_ids, distances = job_geo_index.query_radius(latitude, longitude, radius_km)
+    job_ids, distances = job_ids[skip:skip + limit].tolist(), distances[skip:skip + limit].tolist()
+    jobs_by_id = {job.id: job for job in db.query(JobPosting).filter(JobPosting.id.in_(job_ids))}
+    return [(jobs_by_id[job_id], distance) for job_id, distance in zip(job_ids, distances) if job_id in jobs_by_id]
@@ -0,0 +1,51 @@
+# Numeric facts derived from the free-text job columns, computed once when a job is written.
+# salary_range, experience and location are parsed into salary_min/max (dollars),
+# experience_min/max (years) and state, so salary analytics can aggregate in SQL instead of
+# loading and regex-parsing every row per request.
+import re
+from app.services.salary import parse_salary_range
+
+# Constants
+EXPERIENCE_YEARS = re.compile(r"\d+")
+
+
+# "2 to 5 Years" -> (2, 5); "5+ Years" -> (5, None); no number, or more than two -> (None, None).
+# Like the old per-request salary progression, only values with exactly two numbers form a range.
+def parse_experience_range(text):
+    if not isinstance(text, str):
+        return None, None
+    years = [int(y) for y in EXPERIENCE_YEARS.findall(text)]
+    if len(years) == 1:
+        return years[0], None
+    if len(years) == 2:
+        return years[0], years[1]
+    return None, None
+
+
+# State of a "City, ST" location: its last two characters, or the whole value when it is that
+# short already (the rule the salary-by-state chart has always used). Unlike the old chart,
+# surrounding spaces are ignored and empty locations have no state.
+def location_state(location):
+    if not isinstance(location, str) or not location.strip():
+        return None
+    location = location.strip()
+    return location[-2:] if len(location) > 2 else location
+
+
+# Column values for one job's raw fields
+def job_facts(salary_range, experience, location) -> dict:
+    salary_min, salary_max = parse_salary_range(salary_range)
+    experience_min, experience_max = parse_experience_range(experience)
+    return {
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+        "experience_min": experience_min,
+        "experience_max": experience_max,
+        "state": location_state(location),
+    }
+
+
+# Refresh the derived columns of a JobPosting from its raw fields
+def apply_job_facts(job):
+    for column, value in job_facts(job.salary_range, job.experience, job.location).items():
+        setattr(job, column, value)
@@ -0,0 +1,97 @@
+# This module holds the structured job attributes used to prefilter matches.
+# Every column is a numpy array aligned with the rows of the embedding index, so a set of
+# filters becomes one boolean mask and only the allowed jobs are scored.
+from datetime import date
+import numpy as np
+from sqlalchemy.orm import Session
+from app.models.job import JobPosting
+from app.schemas.job import JobMatchFilters
+from app.services.geo_index import GeoGridIndex
+
+
+# Lower-cased, trimmed key used for categorical columns
+def category_key(value) -> str:
+    return value.strip().lower() if isinstance(value, str) else ""
+
+
+# Encode a list of strings as integer codes plus the code lookup table
+def encode_categories(values: list):
+    vocabulary = {}
+    codes = np.array([vocabulary.setdefault(category_key(v), len(vocabulary)) for v in values], dtype=np.int32)
+    return codes, vocabulary
+
+
+# Structured attributes of the indexed jobs, aligned with the index ids
+class JobFeatureColumns:
+    def __init__(self, work_type_codes, work_types, country_codes, countries,
+                 salary_min, salary_max, posted_ordinal, latitude, longitude):
+        self.work_type_codes = work_type_codes
+        self.work_types = work_types
+        self.country_codes = country_codes
+        self.countries = countries
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        self.posted_ordinal = posted_ordinal
+        self.geo = GeoGridIndex(latitude, longitude)
+
+    # Read the filterable columns for the given ids
+    @classmethod
+    def load(cls, db: Session, ids: np.ndarray) -> "JobFeatureColumns":
+        n_rows = ids.shape[0]
+        work_types, countries = [""] * n_rows, [""] * n_rows
+        salary_min = np.full(n_rows, np.nan, dtype=np.float32)
+        salary_max = np.full(n_rows, np.nan, dtype=np.float32)
+        posted_ordinal = np.full(n_rows, -1, dtype=np.int32)
+        latitude = np.full(n_rows, np.nan, dtype=np.float64)
+        longitude = np.full(n_rows, np.nan, dtype=np.float64)
+
+        order = np.argsort(ids)
+        sorted_ids = ids[order]
+        rows = db.query(
+            JobPosting.id, JobPosting.work_type, JobPosting.country,
+            JobPosting.salary_min, JobPosting.salary_max, JobPosting.job_posting_date,
+            JobPosting.latitude, JobPosting.longitude,
+        ).yield_per(5000)
+        for job_id, work_type, country, low, high, posted, lat, lon in rows:
+            found = np.searchsorted(sorted_ids, job_id)
+            if found == n_rows or sorted_ids[found] != job_id:
+                continue  # job has no embedding
+            row = order[found]
+            work_types[row], countries[row] = work_type, country
+            if low is not None and high is not None:
+                salary_min[row], salary_max[row] = low, high
+            if isinstance(posted, date):
+                posted_ordinal[row] = posted.toordinal()
+            if lat is not None and lon is not None:
+                latitude[row], longitude[row] = lat, lon
+
+        work_type_codes, work_type_vocab = encode_categories(work_types)
+        country_codes, country_vocab = encode_categories(countries)
+        return cls(work_type_codes, work_type_vocab, country_codes, country_vocab,
+                   salary_min, salary_max, posted_ordinal, latitude, longitude)
+
+    # Combine the requested filters into one boolean mask (None when nothing is filtered)
+    def mask(self, filters: JobMatchFilters):
+        if filters is None:
+            return None
+        mask = None
+
+        def narrow(condition):
+            nonlocal mask
+            mask = condition if mask is None else mask & condition
+
+        if filters.work_type:
+            code = self.work_types.get(category_key(filters.work_type), -1)
+            narrow(self.work_type_codes == code)
+        if filters.country:
+            code = self.countries.get(category_key(filters.country), -1)
+            narrow(self.country_codes == code)
+        if filters.min_salary is not None:
+            # Keep jobs whose range reaches the requested minimum; unknown salaries are dropped
+            narrow(self.salary_max >= filters.min_salary)
+        if filters.posted_after is not None:
+            narrow(self.posted_ordinal >= filters.posted_after.toordinal())
+        if filters.radius_km is not None and filters.latitude is not None and filters.longitude is not None:
+            # Only the grid cells around the point are visited
+            narrow(self.geo.radius_mask(filters.latitude, filters.longitude, filters.radius_km))
+        return mask
@@ -0,0 +1,241 @@
+# This module keeps every job embedding in memory as one normalized float32 matrix,
+# so a resume can be scored against the whole catalog with a single matrix-vector product.
+# When the shared on-disk embedding store exists, the matrix is memory-mapped from it
+# instead of being loaded from the database.
+import threading
+import time
+from typing import NamedTuple
+import numpy as np
+from sqlalchemy import func, type_coerce, LargeBinary
+from sqlalchemy.orm import Session
+from app.db.database import SessionLocal
+from app.db.types import unpack_embedding
+from app.models.job import JobPosting
+from app.services.ann_index import ExactSearcher, make_searcher
+from app.services.embedding_store import EmbeddingStore, SegmentedMatrix
+from app.services.job_filters import JobFeatureColumns
+from app.schemas.job import JobMatchFilters
+
+# How often (seconds) the index checks the table for changes made by other processes
+REFRESH_CHECK_SECONDS = 5.0
+
+
+# Normalize vectors to unit length so that a dot product equals cosine similarity
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+# Read every embedding blob from the job_postings table into (ids, normalized matrix).
+# only_ids restricts the read to those jobs (read in chunks to stay under SQLite's variable limit).
+def load_embeddings_from_db(db: Session, only_ids: np.ndarray = None):
+    ids, vectors = [], []
+    # Read the raw blobs so one corrupt row is skipped instead of aborting the scan
+    raw_embedding = type_coerce(JobPosting.embedding, LargeBinary)
+    query = db.query(JobPosting.id, raw_embedding).filter(JobPosting.embedding != None)
+    if only_ids is None:
+        batches = [query.yield_per(1000)]
+    else:
+        only_ids = [int(i) for i in only_ids]
+        batches = (query.filter(JobPosting.id.in_(only_ids[i:i + 500])).all() for i in range(0, len(only_ids), 500))
+    for rows in batches:
+        for job_id, blob in rows:
+            try:
+                vectors.append(unpack_embedding(blob))
+                ids.append(job_id)
+            except Exception as e:
+                print(f"⚠️ Skipping job {job_id}: {e}")
+
+    if vectors:
+        matrix = normalize_rows(np.vstack(vectors))
+    else:
+        matrix = np.empty((0, 0), dtype=np.float32)
+    return np.asarray(ids, dtype=np.int64), matrix
+
+
+# Everything a search reads, swapped as one object when the index is rebuilt
+class IndexSnapshot(NamedTuple):
+    ids: np.ndarray
+    matrix: np.ndarray
+    searcher: object
+    columns: JobFeatureColumns
+    id_order: np.ndarray
+
+
+# Process-wide embedding index over the job_postings table
+class JobEmbeddingIndex:
+    def __init__(self, store: EmbeddingStore = None):
+        self.store = store or EmbeddingStore()
+        empty = np.empty((0, 0), dtype=np.float32)
+        no_ids = np.empty(0, dtype=np.int64)
+        self._snapshot = IndexSnapshot(no_ids, empty, ExactSearcher(empty), None, no_ids)
+        self._signature = None
+        self._stale = True
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.ids.shape[0]
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._snapshot.ids
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._snapshot.matrix
+
+    @property
+    def searcher(self):
+        return self._snapshot.searcher
+
+    @property
+    def columns(self) -> JobFeatureColumns:
+        return self._snapshot.columns
+
+    # Cheap fingerprint of the source, used to notice inserts and deletes.
+    # The table is checked even when the store exists, so embeddings written only to the
+    # database (e.g. by a loader) still trigger a rebuild.
+    def _table_signature(self, db: Session):
+        count, max_id = (
+            db.query(func.count(JobPosting.id), func.max(JobPosting.id))
+            .filter(JobPosting.embedding != None)
+            .one()
+        )
+        if self.store.exists():
+            return "store", self.store.read_manifest()["version"], count, max_id
+        return "db", count, max_id
+
+    # Store vectors restricted to the jobs still embedded in the database, plus the embedded
+    # jobs the store does not have yet (read from the database)
+    def _open_store_with_missing(self, db: Session):
+        ids, matrix, _ = self.store.open()
+        db_ids = np.fromiter((row[0] for row in db.query(JobPosting.id).filter(JobPosting.embedding != None)), dtype=np.int64)
+        live_rows = matrix.rows if matrix.rows is not None else np.arange(matrix.shape[0], dtype=np.int64)
+
+        # Drop store rows whose job was deleted from the table
+        keep = np.isin(ids, db_ids)
+        if not keep.all():
+            print(f"📚 {int((~keep).sum())} store embeddings belong to deleted jobs; leaving them out.")
+            ids, live_rows = ids[keep], live_rows[keep]
+            matrix = SegmentedMatrix(matrix.segments, live_rows)
+
+        missing = np.setdiff1d(db_ids, ids)
+        if missing.shape[0] == 0:
+            return ids, matrix
+        missing_ids, missing_matrix = load_embeddings_from_db(db, missing)
+        if missing_ids.shape[0] == 0:
+            return ids, matrix
+        if matrix.dim and missing_matrix.shape[1] != matrix.dim:
+            print(f"⚠️ Ignoring {missing_ids.shape[0]} database embeddings with dimension {missing_matrix.shape[1]} (store has {matrix.dim})")
+            return ids, matrix
+        print(f"📚 {missing_ids.shape[0]} embedded jobs are not in the store yet; reading them from the database.")
+        rows = np.concatenate([live_rows, matrix.offsets[-1] + np.arange(missing_ids.shape[0], dtype=np.int64)])
+        return np.concatenate([ids, missing_ids]), SegmentedMatrix(matrix.segments + [missing_matrix], rows)
+
+    # Load every embedding into one matrix, from the shared store if present
+    def build(self, db: Session):
+        signature = self._table_signature(db)
+        if self.store.exists():
+            # Memory-map the normalized vectors written by compute_job_embeddings
+            ids, matrix = self._open_store_with_missing(db)
+        else:
+            ids, matrix = load_embeddings_from_db(db)
+
+        # Swap everything at once so concurrent searches never see a half-built index
+        columns = JobFeatureColumns.load(db, ids)
+        self._snapshot = IndexSnapshot(ids, matrix, make_searcher(matrix, ids), columns, np.argsort(ids))
+        self._signature = signature
+        self._stale = False
+        print(f"📚 Job embedding index built with {ids.shape[0]} jobs.")
+
+    # Mark the index as outdated; it is rebuilt on the next search
+    def invalidate(self):
+        self._stale = True
+
+    # Rebuild the index if it was never built or the table changed since the last build
+    def ensure_fresh(self):
+        now = time.monotonic()
+        if not self._stale and now - self._last_check < REFRESH_CHECK_SECONDS:
+            return
+        with self._lock:
+            db: Session = SessionLocal()
+            try:
+                if self._stale or self._table_signature(db) != self._signature:
+                    self.build(db)
+                self._last_check = time.monotonic()
+            finally:
+                db.close()
+
+    # Return (job ids, scores) of the best matches for a query embedding, best first.
+    # Optional filters are turned into a row mask so only matching jobs are scored.
+    def search(self, query: np.ndarray, k: int = 100, min_score: float = None, filters: JobMatchFilters = None):
+        self.ensure_fresh()
+        snapshot = self._snapshot
+        empty = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        if snapshot.ids.shape[0] == 0:
+            return empty
+
+        mask = snapshot.columns.mask(filters) if filters is not None and not filters.is_empty() else None
+        if mask is not None and not mask.any():
+            return empty
+        positions, scores = snapshot.searcher.search(normalize_rows(query), k, mask=mask)
+        if min_score is not None:
+            keep = scores > min_score
+            positions, scores = positions[keep], scores[keep]
+        return snapshot.ids[positions], scores
+
+
+    # Search many query embeddings at once; returns one (job ids, scores) pair per query.
+    # The exact backend scores all of them with a single matrix-matrix product.
+    def search_batch(self, queries: np.ndarray, k: int = 100, min_score: float = None, filters: JobMatchFilters = None):
+        self.ensure_fresh()
+        snapshot = self._snapshot
+        queries = normalize_rows(np.atleast_2d(queries))
+        empty = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        if snapshot.ids.shape[0] == 0:
+            return [empty for _ in range(queries.shape[0])]
+
+        mask = snapshot.columns.mask(filters) if filters is not None and not filters.is_empty() else None
+        if mask is not None and not mask.any():
+            return [empty for _ in range(queries.shape[0])]
+        if hasattr(snapshot.searcher, "search_batch"):
+            results = snapshot.searcher.search_batch(queries, k, mask=mask)
+        else:
+            results = [snapshot.searcher.search(query, k, mask=mask) for query in queries]
+
+        output = []
+        for positions, scores in results:
+            if min_score is not None:
+                keep = scores > min_score
+                positions, scores = positions[keep], scores[keep]
+            output.append((snapshot.ids[positions], scores))
+        return output
+
+    # Exact scores of a query against specific jobs (e.g. lexical candidates).
+    # Jobs without an embedding or outside the filters are dropped; input order is kept.
+    def score_ids(self, query: np.ndarray, job_ids: np.ndarray, filters: JobMatchFilters = None):
+        self.ensure_fresh()
+        snapshot = self._snapshot
+        job_ids = np.asarray(job_ids, dtype=np.int64)
+        if snapshot.ids.shape[0] == 0 or job_ids.shape[0] == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        sorted_ids = snapshot.ids[snapshot.id_order]
+        found = np.minimum(np.searchsorted(sorted_ids, job_ids), sorted_ids.shape[0] - 1)
+        known = sorted_ids[found] == job_ids
+        positions = snapshot.id_order[found[known]]
+        job_ids = job_ids[known]
+
+        mask = snapshot.columns.mask(filters) if filters is not None and not filters.is_empty() else None
+        if mask is not None:
+            allowed = mask[positions]
+            positions, job_ids = positions[allowed], job_ids[allowed]
+        scores = np.asarray(snapshot.matrix[positions] @ normalize_rows(query), dtype=np.float32)
+        return job_ids, scores
+
+
+# Shared instance used by the matching service
+job_index = JobEmbeddingIndex()
@@ -0,0 +1,171 @@
+# Disk-backed cache of parsed LLM responses, keyed by (model, prompt hash).
+# The same resume uploaded twice, or a loader script re-run over the same rows, then costs one
+# SQLite lookup instead of a full LLM round-trip. Only results that parsed successfully (and
+# are not empty) are stored. Entries expire after a TTL, and the least recently used ones are
+# evicted on every write that takes the cache over its entry or byte limit. SQLite triggers keep
+# the entry count and total size in a one-row table, so the check costs one lookup even when
+# several processes share the file.
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Constants
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "data/llm_cache.sqlite")  # "" disables the cache
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))  # stored JSON payloads
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+
+# SQLite table of JSON-encoded responses shared by the API and the loader scripts
+class LLMResponseCache:
+    def __init__(self, path: str = LLM_CACHE_PATH, max_entries: int = LLM_CACHE_MAX_ENTRIES,
+                 ttl_seconds: float = LLM_CACHE_TTL_SECONDS, max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._db = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(model: str, prompt: str) -> bytes:
+        return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).digest()
+
+    # SQLite connection, opened on first use (None when the cache is disabled)
+    def _connection(self):
+        if self._db is None and self.path:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key BLOB PRIMARY KEY, model TEXT NOT NULL, value TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL, size INTEGER NOT NULL DEFAULT 0)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS ix_responses_accessed ON responses (accessed)")
+            # Caches written before sizes were tracked
+            columns = [row[1] for row in self._db.execute("PRAGMA table_info(responses)")]
+            if "size" not in columns:
+                self._db.execute("ALTER TABLE responses ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+                self._db.execute("UPDATE responses SET size = length(CAST(value AS BLOB))")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS totals ("
+                "id INTEGER PRIMARY KEY CHECK (id = 1), entries INTEGER NOT NULL, bytes INTEGER NOT NULL)"
+            )
+            self._db.execute(
+                "INSERT OR IGNORE INTO totals (id, entries, bytes) "
+                "SELECT 1, COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            )
+            self._db.executescript("""
+                CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses BEGIN
+                    UPDATE totals SET entries = entries + 1, bytes = bytes + NEW.size WHERE id = 1;
+                END;
+                CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses BEGIN
+                    UPDATE totals SET entries = entries - 1, bytes = bytes - OLD.size WHERE id = 1;
+                END;
+                CREATE TRIGGER IF NOT EXISTS responses_update AFTER UPDATE OF size ON responses BEGIN
+                    UPDATE totals SET bytes = bytes - OLD.size + NEW.size WHERE id = 1;
+                END;
+            """)
+            self._db.commit()
+        return self._db
+
+    # Return (True, value) for a live entry, (False, None) otherwise
+    def get(self, model: str, prompt: str):
+        with self._lock:
+            db = self._connection()
+            if db is None:
+                return False, None
+            key = self._key(model, prompt)
+            row = db.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                db.commit()
+                self.expired += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return False, None
+            db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            db.commit()
+            self.hits += 1
+            return True, json.loads(row[0])
+
+    # Evict least recently used entries until the cache is within both limits (caller holds the lock)
+    def _evict(self, db):
+        entries, total_bytes = db.execute("SELECT entries, bytes FROM totals WHERE id = 1").fetchone()
+        excess_entries, excess_bytes = entries - self.max_entries, total_bytes - self.max_bytes
+        if excess_entries <= 0 and excess_bytes <= 0:
+            return
+        victims, freed = [], 0
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if len(victims) >= excess_entries and freed >= excess_bytes:
+                break
+            victims.append((key,))
+            freed += size
+        db.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    # Store a parsed response and evict old entries if the cache is now over its limits.
+    # A single response larger than the whole byte budget is not stored.
+    def put(self, model: str, prompt: str, value):
+        with self._lock:
+            db = self._connection()
+            if db is None:
+                return
+            encoded = json.dumps(value)
+            size = len(encoded.encode("utf-8"))
+            if size > self.max_bytes:
+                return
+            now = time.time()
+            db.execute(
+                "INSERT INTO responses (key, model, value, created, accessed, size) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET model = excluded.model, value = excluded.value, "
+                "created = excluded.created, accessed = excluded.accessed, size = excluded.size",
+                (self._key(model, prompt), model, encoded, now, now, size),
+            )
+            self._evict(db)
+            db.commit()
+
+    # Return the cached value or call fetch() (which must raise if the response does not parse)
+    # and store its non-empty result
+    def get_or_call(self, model: str, prompt: str, fetch):
+        found, value = self.get(model, prompt)
+        if found:
+            return value
+        value = fetch()
+        if value:
+            self.put(model, prompt, value)
+        return value
+
+    # Hit/miss counters since the process started
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        with self._lock:
+            db = self._connection()
+            entries, total_bytes = db.execute("SELECT entries, bytes FROM totals WHERE id = 1").fetchone() if db is not None else (0, 0)
+        return {
+            "lookups": lookups,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "maxEntries": self.max_entries,
+            "bytes": total_bytes,
+            "maxBytes": self.max_bytes,
+            "ttlSeconds": self.ttl_seconds,
+        }
+
+
+# Shared instance
+llm_cache = LLMResponseCache()
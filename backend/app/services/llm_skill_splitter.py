@@ -1,4 +1,5 @@
 import ollama
+from app.services.llm_cache import llm_cache
 
 # This function uses the Mistral LLM to split a string of skills into a list of individual skills.
 def split_skills_with_llm(skill_text: str) -> list[str]:
@@ -13,7 +14,7 @@ Text:
 {skill_text}
 """
 
-    try:
+    def call():
         # Call the Mistral LLM to process the prompt
         response = ollama.chat(
             model='mistral',
@@ -24,8 +25,13 @@ Text:
         skills = eval(content) # Evaluate the content to convert it into a Python object
 
         # Check if the evaluated content is a list
-        if isinstance(skills, list):
-            return [s.strip() for s in skills if isinstance(s, str)]
+        if not isinstance(skills, list):
+            raise ValueError(f"Expected a list, got {type(skills).__name__}")
+        return [s.strip() for s in skills if isinstance(s, str)]
+
+    try:
+        # Identical skill texts (e.g. on a rerun) are answered from the cache
+        return llm_cache.get_or_call("mistral", prompt, call)
     except Exception as e:
         print(f"❌ Error parsing LLM response: {e}")
 
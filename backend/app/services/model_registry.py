@@ -0,0 +1,81 @@
+# Registry of the heavy models (embedding backend, KeyBERT, spaCy), loaded on first use.
+# Modules register a loader under a name instead of building the model at import time, so the
+# API imports and starts serving in well under a second. A model is loaded once, by whichever
+# thread needs it first. An optional background warmup loads the models right after startup,
+# and /ready reports when it has finished.
+import os
+import threading
+import time
+
+# Constants
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "1") != "0"  # load the models in the background at startup
+
+
+# Lazily loaded models by name
+class ModelRegistry:
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._info = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._warmup_thread = None
+
+    # Register loader() under name; warmup=False keeps the model out of the startup warmup
+    def register(self, name: str, loader, warmup: bool = True):
+        with self._lock:
+            self._loaders[name] = (loader, warmup)
+            self._locks.setdefault(name, threading.Lock())
+            self._info.setdefault(name, {"loaded": False, "warmup": warmup, "seconds": None, "error": None})
+
+    # The model, loaded on first use (concurrent callers wait for the same load)
+    def get(self, name: str):
+        if name in self._models:
+            return self._models[name]
+        if name not in self._loaders:
+            raise KeyError(f"No model registered as {name!r}")
+        with self._locks[name]:
+            if name not in self._models:
+                loader, _ = self._loaders[name]
+                start = time.perf_counter()
+                try:
+                    model = loader()
+                except Exception as e:
+                    self._info[name]["error"] = str(e)
+                    raise
+                seconds = time.perf_counter() - start
+                self._info[name].update(loaded=True, seconds=round(seconds, 3), error=None)
+                self._models[name] = model
+                print(f"📦 Loaded model {name} in {seconds:.2f}s")
+        return self._models[name]
+
+    # Load every warmup model; failures are logged and left for the first real use to retry
+    def warmup(self):
+        start = time.perf_counter()
+        for name, (_, warmup) in list(self._loaders.items()):
+            if warmup:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    print(f"❌ Warmup of model {name} failed:", e)
+        print(f"🔥 Model warmup finished in {time.perf_counter() - start:.2f}s")
+
+    # Run warmup() on a daemon thread (once)
+    def start_warmup(self):
+        with self._lock:
+            if self._warmup_thread is None:
+                self._warmup_thread = threading.Thread(target=self.warmup, name="model-warmup", daemon=True)
+                self._warmup_thread.start()
+
+    # Ready once the warmup has finished (failed models are reported by status()); without a
+    # warmup the models load on first use, so the registry is always ready
+    def ready(self) -> bool:
+        return self._warmup_thread is None or not self._warmup_thread.is_alive()
+
+    # Load state, load time and last error per model
+    def status(self) -> dict:
+        return {name: dict(info) for name, info in self._info.items()}
+
+
+# Shared registry
+models = ModelRegistry()
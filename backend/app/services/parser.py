@@ -1,10 +1,12 @@
 import docx
 import re
+from app.services.skill_automaton import SkillAutomaton
 
 known_skills = [
     "python", "java", "react", "django", "sql", "git", "docker", "fastapi",
     "machine learning", "data analysis", "html", "css", "linux", "aws"
 ]
+known_skills_matcher = SkillAutomaton(known_skills)
 
 def extract_text_from_pdf(file_bytes: bytes) -> str:
     import fitz
@@ -21,8 +23,8 @@ def extract_text_from_docx(file_bytes: bytes) -> str:
     return "\n".join(p.text for p in doc.paragraphs)
 
 def parse_skills(text: str) -> list:
-    text = text.lower()
-    return [skill for skill in known_skills if skill in text]
+    found = known_skills_matcher.count(text)
+    return [skill for skill in known_skills if skill in found]
 
 def smart_split_skills(raw_skills: str) -> list[str]:
     # Handle None or NaNs
@@ -0,0 +1,100 @@
+# A small dependency graph of pipeline stages run on a thread pool.
+# Each stage is submitted as soon as the stages it depends on have finished, so independent
+# work (e.g. two LLM calls over the same resume) overlaps. End-to-end latency becomes the
+# critical path instead of the sum of all stages. Stages are never blocked waiting on
+# other stages, so any pool size works.
+import threading
+import time
+from concurrent.futures import Executor
+
+
+# Stages by name; each receives the results of its dependencies as positional arguments
+class StageGraph:
+    def __init__(self, name: str = "pipeline"):
+        self.name = name
+        self.stages = {}
+
+    # Register a stage; dependencies are stage names or input names given to run()
+    def stage(self, name: str, fn, deps=()):
+        self.stages[name] = (fn, tuple(deps))
+        return self
+
+    # Run every stage and return all results (inputs included) by name.
+    # on_stage(name, result), if given, is called as each stage finishes, before its dependents
+    # start; calls never overlap. The first failing stage's exception is raised once the running stages have settled.
+    def run(self, executor: Executor, inputs: dict, on_stage=None) -> dict:
+        for name, (_, deps) in self.stages.items():
+            unknown = [d for d in deps if d not in self.stages and d not in inputs]
+            if unknown:
+                raise ValueError(f"Stage {name!r} depends on unknown stages {unknown}")
+
+        results = dict(inputs)
+        timings = {}
+        waiting = {name: {d for d in deps if d not in inputs} for name, (_, deps) in self.stages.items()}
+        lock = threading.Lock()
+        callback_lock = threading.Lock()
+        finished = threading.Event()
+        state = {"running": 0, "error": None}
+        started = time.perf_counter()
+
+        def call(name, fn, args):
+            start = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                timings[name] = time.perf_counter() - start
+
+        def launch(name):
+            fn, deps = self.stages[name]
+            future = executor.submit(call, name, fn, [results[d] for d in deps])
+            future.add_done_callback(lambda f: on_done(name, f))
+
+        # on_stage runs (one call at a time) before the stage counts as finished for its
+        # dependents, so callbacks always see a stage after every stage it depends on
+        def on_done(name, future):
+            error = future.exception()
+            if on_stage is not None and error is None:
+                with callback_lock:
+                    try:
+                        on_stage(name, future.result())
+                    except Exception as e:
+                        print(f"❌ {self.name}: on_stage callback failed for {name!r}:", e)
+            ready = []
+            with lock:
+                state["running"] -= 1
+                if error is not None:
+                    state["error"] = state["error"] or error
+                else:
+                    results[name] = future.result()
+                    if state["error"] is None:
+                        for other in list(waiting):
+                            waiting[other].discard(name)
+                            if not waiting[other]:
+                                ready.append(other)
+                                del waiting[other]
+                        state["running"] += len(ready)
+                all_done = state["running"] == 0
+            if all_done:
+                finished.set()
+            for other in ready:
+                launch(other)
+
+        with lock:
+            ready = [name for name, deps in waiting.items() if not deps]
+            for name in ready:
+                del waiting[name]
+            state["running"] = len(ready)
+            if not ready:
+                finished.set()
+        for name in ready:
+            launch(name)
+        finished.wait()
+
+        if state["error"] is not None:
+            raise state["error"]
+        if waiting:
+            raise ValueError(f"Stages {sorted(waiting)} never became ready (dependency cycle?)")
+
+        stage_times = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
+        print(f"⏱️ {self.name}: {stage_times} | total {time.perf_counter() - started:.2f}s")
+        return results
@@ -0,0 +1,114 @@
+# Token-budgeted prompt builder for the Gemini rerank.
+# Candidates below a score cutoff are dropped first. Each remaining job becomes a compact
+# snippet (trimmed description, top skills, no JSON indentation), and snippets are added
+# best-first until the estimated prompt size reaches the budget. The prompt size is
+# reported for every request so context can be traded for latency deliberately.
+import json
+import math
+import os
+from app.services.skill_matcher import canonical_skill, job_skill_list
+
+# Constants
+RERANK_TOKEN_BUDGET = int(os.getenv("RERANK_TOKEN_BUDGET", "6000"))
+RERANK_MIN_SCORE = float(os.getenv("RERANK_MIN_SCORE", "0.35"))
+RERANK_DESCRIPTION_CHARS = int(os.getenv("RERANK_DESCRIPTION_CHARS", "400"))
+RERANK_TOP_SKILLS = int(os.getenv("RERANK_TOP_SKILLS", "12"))
+CHARS_PER_TOKEN = 4  # rough average for English text and JSON
+
+PROMPT_HEADER = """
+You are an AI assistant evaluating job matches for a candidate.
+
+Candidate Skills:
+{skills}
+
+Candidate Profile:
+{profile}
+
+Here are job postings (one JSON object per line):
+"""
+
+PROMPT_FOOTER = """
+Return up to 15 best matches as valid JSON list. Use this format:
+
+[
+  {
+    "jobId": 123,
+    "matchReason": "Clear explanation of alignment",
+    "matchedSkills": ["python", "sql"],
+    "skillMatchPercent": 87.5,
+    "industryMatchPercent": 100,
+    "experienceMatchPercent": 75.0
+  },
+  ...
+]
+
+Return ONLY the JSON array. No explanation or markdown.
+"""
+
+
+# Approximate token count (no Gemini tokenizer is available locally)
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+# Cut text at a word boundary
+def trim_text(text, max_chars: int) -> str:
+    text = " ".join((text or "").split())
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + "…"
+
+
+# Job skills with the ones the resume shares first, limited to top_n
+def top_skills(job_skills, resume_keys: set, top_n: int) -> list[str]:
+    skills = job_skill_list(job_skills)
+    shared = [s for s in skills if canonical_skill(s) in resume_keys]
+    others = [s for s in skills if canonical_skill(s) not in resume_keys]
+    return (shared + others)[:top_n]
+
+
+# One compact JSON line per job
+def job_snippet(job, resume_keys: set, description_chars: int, top_n: int) -> str:
+    return json.dumps({
+        "jobId": job.id,
+        "title": job.job_title or "",
+        "company": job.company or "",
+        "description": trim_text(job.job_description, description_chars),
+        "skills": top_skills(job.skills, resume_keys, top_n),
+    }, separators=(",", ":"), ensure_ascii=False)
+
+
+# Build the rerank prompt for (score, job) candidates, best first.
+# Returns (prompt, job ids included, size report).
+def build_rerank_prompt(resume_skills: list[str], resume_profile: dict, candidates: list,
+                        token_budget: int = RERANK_TOKEN_BUDGET, min_score: float = RERANK_MIN_SCORE,
+                        description_chars: int = RERANK_DESCRIPTION_CHARS, top_n_skills: int = RERANK_TOP_SKILLS):
+    header = PROMPT_HEADER.format(
+        skills=", ".join(resume_skills),
+        profile=json.dumps(resume_profile, separators=(",", ":"), ensure_ascii=False),
+    )
+    used = estimate_tokens(header) + estimate_tokens(PROMPT_FOOTER)
+    resume_keys = {canonical_skill(s) for s in resume_skills}
+
+    above_cutoff = [(score, job) for score, job in candidates if score >= min_score]
+    lines, job_ids = [], []
+    for _, job in above_cutoff:
+        line = job_snippet(job, resume_keys, description_chars, top_n_skills)
+        cost = estimate_tokens(line) + 1
+        # Always keep the best job, even if the header alone fills the budget
+        if lines and used + cost > token_budget:
+            break
+        lines.append(line)
+        job_ids.append(job.id)
+        used += cost
+
+    prompt = header + "\n".join(lines) + "\n" + PROMPT_FOOTER
+    report = {
+        "jobs": len(job_ids),
+        "droppedBelowScore": len(candidates) - len(above_cutoff),
+        "droppedOverBudget": len(above_cutoff) - len(job_ids),
+        "estimatedTokens": estimate_tokens(prompt),
+        "tokenBudget": token_budget,
+        "chars": len(prompt),
+    }
+    return prompt, job_ids, report
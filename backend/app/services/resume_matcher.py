@@ -3,33 +3,143 @@ import traceback
 import json
 import re
 import os
-import numpy as np
-from sentence_transformers import SentenceTransformer, util
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from sqlalchemy import and_, func, literal, select, union_all
 from sqlalchemy.orm import Session
-from keybert import KeyBERT
 from app.db.database import SessionLocal
 from app.models.job import JobPosting
-from dotenv import load_dotenv
 import google.generativeai as genai
 import ollama
+from app.services.embedding_cache import normalize_text
+from app.services.embeddings import embedding_cache, encode_texts as encode_texts_in_process
 from app.services.extract_skills import extract_skills
-from wordcloud import WordCloud
+from app.services.inference_sidecar import INFERENCE_SIDECAR_SOCKET, InferenceClient, SidecarWithFallback
+from app.services.parser import extract_text_from_pdf
+from app.services.pipeline import StageGraph
+from app.services.llm_cache import llm_cache
+from app.services.model_registry import models
+from app.services.rerank_prompt import RERANK_MIN_SCORE, build_rerank_prompt
+from app.services.hybrid_retrieval import retrieve_candidates, retrieve_candidates_batch
+from app.services.skill_matcher import SkillEmbeddingCache, score_skill_overlap
+from app.schemas.job import JobMatchFilters
 
-# Load environment variables
-load_dotenv()
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-
-# Models
-embedding_model = SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
-kw_model = KeyBERT(embedding_model)
+GEMINI_MODEL = "gemini-2.0-flash"
+
+# Models (see model_registry; nothing is loaded at import time)
+# KeyBERT over the shared embedding backend (or the sidecar); only used by extract_keywords_for_wordcloud
+def load_keybert():
+    from keybert import KeyBERT
+    from keybert.backend import BaseEmbedder
+
+    # Adapter for encoders that are not a SentenceTransformer
+    class BackendEmbedder(BaseEmbedder):
+        def __init__(self, encode):
+            super().__init__()
+            self.encode = encode
+
+        def embed(self, documents, verbose=False):
+            return self.encode(list(documents))
+
+    if sidecar is not None:
+        return KeyBERT(BackendEmbedder(encode_texts))
+    backend = models.get("embedding")
+    return KeyBERT(getattr(backend, "model", None) or BackendEmbedder(backend.encode))
+
+models.register("keybert", load_keybert, warmup=False)
+
+# Encodes and the word cloud go to the shared inference sidecar when INFERENCE_SIDECAR_SOCKET
+# is set, and run in this process while it is unreachable
+sidecar = SidecarWithFallback(InferenceClient(), embedding_cache.model_name) if INFERENCE_SIDECAR_SOCKET else None
+
+def encode_texts(texts: list[str]):
+    if sidecar is None:
+        return encode_texts_in_process(texts)
+    return sidecar.call(sidecar.client.encode, encode_texts_in_process, texts)
+
+# One vector per skill list, through the cache
+def encode_skill_lists(skill_lists: list):
+    return embedding_cache.encode_skill_lists(skill_lists, encode_texts)
+
+skill_embeddings = SkillEmbeddingCache(
+    lambda skills: embedding_cache.encode([normalize_text(s) for s in skills], encode_texts)
+)
+
+# The Gemini rerank only enriches the matches (reasons, industry/experience fit); set to 0 to skip it
+LLM_RERANK_ENABLED = os.getenv("LLM_RERANK_ENABLED", "1") != "0"
+
+# "single" sends one rerank prompt; "sharded" reranks shards of candidates in parallel
+RERANK_MODE = os.getenv("RERANK_MODE", "single").lower()
+RERANK_SHARD_SIZE = int(os.getenv("RERANK_SHARD_SIZE", "20"))
+RERANK_SHARD_CONCURRENCY = int(os.getenv("RERANK_SHARD_CONCURRENCY", "5"))
+RERANK_SHARD_TIMEOUT_SECONDS = float(os.getenv("RERANK_SHARD_TIMEOUT_SECONDS", "20"))  # from when the shard starts running
+RERANK_SHARD_POLL_SECONDS = 0.05  # how often shards still queued on the shared pool are checked
+rerank_pool = ThreadPoolExecutor(max_workers=RERANK_SHARD_CONCURRENCY, thread_name_prefix="rerank-shard")
+RERANK_FIELDS = ("matchReason", "industryMatchPercent", "experienceMatchPercent")  # filled in by Gemini
+
+# Single-resume pipeline: "parallel" runs the Gemini skill and profile calls side by side,
+# "fused" asks for both in one prompt. Stages share one thread pool across requests.
+RESUME_EXTRACTION_MODE = os.getenv("RESUME_EXTRACTION_MODE", "parallel").lower()
+PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", "16"))
+pipeline_pool = ThreadPoolExecutor(max_workers=PIPELINE_WORKERS, thread_name_prefix="resume-stage")
+
+# PDF parsing and the spaCy word cloud are CPU-bound; they run in worker processes so they do
+# not hold this process's GIL while the API serves other requests (0 runs them in-process).
+# Every worker process loads its own spaCy model, and every uvicorn worker has its own pool,
+# so the default stays small
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", os.getenv("PDF_WORKERS", "2")))
+BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", "8"))
+_cpu_pool = None
+
+# Match requests are driven from their own threads, off the event loop and off the shared
+# threadpool that FastAPI uses for the sync routes (/jobs, /auth)
+MATCH_REQUEST_WORKERS = int(os.getenv("MATCH_REQUEST_WORKERS", "8"))
+match_request_pool = ThreadPoolExecutor(max_workers=MATCH_REQUEST_WORKERS, thread_name_prefix="match-request")
+
+# Process pool for the CPU-bound stages, created on first use
+def get_cpu_pool() -> ProcessPoolExecutor:
+    global _cpu_pool
+    if _cpu_pool is None:
+        # spawn keeps the model threads of this process out of the workers
+        _cpu_pool = ProcessPoolExecutor(max_workers=CPU_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _cpu_pool
+
+# Submit fn(*args) to the CPU pool; with CPU_WORKERS=0 it runs right away in this thread
+def submit_cpu_bound(fn, *args) -> Future:
+    if CPU_WORKERS > 0:
+        return get_cpu_pool().submit(fn, *args)
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
 
 def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
-    import fitz
-    text = ""
-    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
-        for page in doc:
-            text += page.get_text()
-    return text.strip()
+    return submit_cpu_bound(extract_text_from_pdf, pdf_bytes).result().strip()
+
+# spaCy word cloud keywords with their frequencies
+def extract_word_cloud(text: str) -> dict:
+    if sidecar is not None:
+        return sidecar.call(sidecar.client.word_cloud, extract_word_cloud_locally, text)
+    return extract_word_cloud_locally(text)
+
+def extract_word_cloud_locally(text: str) -> dict:
+    return submit_cpu_bound(extract_skills, text).result()
+
+# Start the CPU worker processes and load spaCy in each of them (in this process with CPU_WORKERS=0).
+# With a sidecar, spaCy lives there and the workers only start if it becomes unreachable.
+def warm_word_cloud_workers():
+    if sidecar is not None:
+        return None
+    futures = [submit_cpu_bound(extract_skills, "warmup") for _ in range(max(CPU_WORKERS, 1))]
+    for future in futures:
+        future.result()
+    return get_cpu_pool() if CPU_WORKERS > 0 else None
+
+models.register("word_cloud_workers", warm_word_cloud_workers)
 
 def extract_resume_profile(text: str) -> dict:
     prompt = f"""
@@ -55,13 +165,16 @@ Only return valid JSON. Do not add ```json or any extra formatting.
 Resume:
 {text}
 """
-    try:
-        model = genai.GenerativeModel("gemini-2.0-flash")
+    def call():
+        model = genai.GenerativeModel(GEMINI_MODEL)
         response = model.generate_content(prompt)
         content = response.text.strip()
         if content.startswith("```"):
             content = re.sub(r"^```[a-zA-Z]*", "", content).strip().rstrip("```").strip()
         return json.loads(content)
+
+    try:
+        return llm_cache.get_or_call(GEMINI_MODEL, prompt, call)
     except Exception as e:
         print(f"❌ Resume profile extraction failed: {e}")
         return {}
@@ -75,16 +188,65 @@ Resume:
 
 Return only the list. No explanation, no code block, no comments.
 """
-    try:
-        response = genai.GenerativeModel("gemini-2.0-flash").generate_content(prompt)
+    def call():
+        response = genai.GenerativeModel(GEMINI_MODEL).generate_content(prompt)
         return [s.lower().strip() for s in ast.literal_eval(response.text.strip()) if isinstance(s, str)]
+
+    try:
+        return llm_cache.get_or_call(GEMINI_MODEL, prompt, call)
     except Exception as e:
         print(f"❌ Gemini skill extraction failed: {e}")
         return []
 
+# Fused mode: skills and profile from one Gemini call; falls back to the two separate calls
+def extract_resume_skills_and_profile(text: str):
+    prompt = f"""
+Extract the professional skills and a detailed profile from this resume as one JSON object:
+
+{{
+  "skills": ["python", "sql"],
+  "profile": {{
+    "name": "Full Name",
+    "totalYearsExperience": 4.5,
+    "totalYearsEducation": 6,
+    "latestExperienceTitle": "...",
+    "latestEducationLevel": "Masters",
+    "experienceByDomain": {{ "Data Science": 2, "Software": 3 }},
+    "pastEmployers": ["Company A", "Company B"],
+    "education": [...],
+    "experience": [...],
+    "industriesWorkedIn": ["..."],
+    "publications": 2,
+    "patents": 0
+  }}
+}}
+
+Only return valid JSON. Do not add ```json or any extra formatting.
+
+Resume:
+{text}
+"""
+    def call():
+        model = genai.GenerativeModel(GEMINI_MODEL)
+        response = model.generate_content(prompt)
+        content = response.text.strip()
+        if content.startswith("```"):
+            content = re.sub(r"^```[a-zA-Z]*", "", content).strip().rstrip("```").strip()
+        result = json.loads(content)
+        skills = [s.lower().strip() for s in result["skills"] if isinstance(s, str)]
+        profile = result["profile"] if isinstance(result["profile"], dict) else {}
+        return [skills, profile]
+
+    try:
+        skills, profile = llm_cache.get_or_call(GEMINI_MODEL, prompt, call)
+        return skills, profile
+    except Exception as e:
+        print(f"❌ Fused resume extraction failed, using separate calls: {e}")
+        return extract_skills_with_gemini(text), extract_resume_profile(text)
+
 def extract_keywords_for_wordcloud(text: str, top_n: int = 25):
     try:
-        keywords = kw_model.extract_keywords(
+        keywords = models.get("keybert").extract_keywords(
             text,
             keyphrase_ngram_range=(1, 3),
             stop_words="english",
@@ -95,80 +257,147 @@ def extract_keywords_for_wordcloud(text: str, top_n: int = 25):
         print("❌ Error extracting word cloud keywords:", e)
         return []
 
-def rank_with_gemini(resume_skills, resume_profile, job_snippets):
-    prompt = f"""
-You are an AI assistant evaluating job matches for a candidate.
-
-Candidate Skills:
-{', '.join(resume_skills)}
-
-Candidate Profile:
-{json.dumps(resume_profile, indent=2)}
-
-Here are job postings:
-{json.dumps(job_snippets, indent=2)}
-
-Return up to 15 best matches as valid JSON list. Use this format:
-
-[
-  {{
-    "jobId": 123,
-    "matchReason": "Clear explanation of alignment",
-    "matchedSkills": ["python", "sql"],
-    "skillMatchPercent": 87.5,
-    "industryMatchPercent": 100,
-    "experienceMatchPercent": 75.0
-  }},
-  ...
-]
+# Rerank (score, job) candidates with Gemini, using a compact prompt within the token budget.
+# Raises if the call fails or the answer does not parse.
+def request_gemini_rerank(resume_skills, resume_profile, candidates):
+    prompt, job_ids, report = build_rerank_prompt(resume_skills, resume_profile, candidates)
+    print(f"🧾 Rerank prompt: {report['jobs']} jobs, ~{report['estimatedTokens']}/{report['tokenBudget']} tokens "
+          f"({report['chars']} chars); dropped {report['droppedBelowScore']} below score cutoff, "
+          f"{report['droppedOverBudget']} over budget")
+    if not job_ids:
+        return []
 
-Return ONLY the JSON array. No explanation or markdown.
-"""
-    try:
-        model = genai.GenerativeModel("gemini-2.0-flash")
+    def call():
+        model = genai.GenerativeModel(GEMINI_MODEL)
         response = model.generate_content(prompt)
         content = response.text.strip()
         if content.startswith("```"):
             content = re.sub(r"^```[a-zA-Z]*", "", content).strip().rstrip("```").strip()
         return json.loads(content)
+
+    return llm_cache.get_or_call(GEMINI_MODEL, prompt, call)
+
+# Gemini rerank entries for the candidates, or [] if the rerank fails
+def rank_with_gemini(resume_skills, resume_profile, candidates):
+    if RERANK_MODE == "sharded":
+        return rank_with_gemini_sharded(resume_skills, resume_profile, candidates)
+    try:
+        return request_gemini_rerank(resume_skills, resume_profile, candidates)
     except Exception as e:
         print("❌ Gemini rerank failed:", e)
         return []
 
-def get_top_job_matches(resume_skills: list[str], resume_profile: dict, top_n: int = 10):
+# Common score for merging shards: mean of the Gemini match percents, in [0, 1]
+def gemini_entry_score(entry: dict) -> float:
+    percents = [entry.get(key) for key in ("skillMatchPercent", "industryMatchPercent", "experienceMatchPercent")]
+    percents = [float(p) for p in percents if isinstance(p, (int, float))]
+    return sum(percents) / (100 * len(percents)) if percents else 0.0
+
+# Wait until every shard is done or has run for RERANK_SHARD_TIMEOUT_SECONDS. The pool is shared
+# by all requests, so time a shard spends queued behind other requests' shards does not count.
+def wait_for_shards(futures: list, started: list):
+    pending = set(range(len(futures)))
+    while pending:
+        now = time.monotonic()
+        pending = {i for i in pending if not futures[i].done()
+                   and (started[i] is None or now - started[i] < RERANK_SHARD_TIMEOUT_SECONDS)}
+        if not pending:
+            return
+        deadlines = [started[i] + RERANK_SHARD_TIMEOUT_SECONDS for i in pending if started[i] is not None]
+        timeout = min(deadlines) - now if deadlines else RERANK_SHARD_POLL_SECONDS
+        if any(started[i] is None for i in pending):
+            timeout = min(timeout, RERANK_SHARD_POLL_SECONDS)
+        wait([futures[i] for i in pending], timeout=max(timeout, 0.0), return_when=FIRST_COMPLETED)
+
+# Rerank shards of about RERANK_SHARD_SIZE candidates in parallel (bounded by the shared pool).
+# Entries from every shard are merged by "rerankScore". A shard that fails, times out or
+# returns nothing falls back to its embedding order: its jobs are marked "rerankFallback" and
+# ranked after every Gemini-scored job, since cosine scores are not on the Gemini scale.
+def rank_with_gemini_sharded(resume_skills, resume_profile, candidates):
+    candidates = [(score, job) for score, job in candidates if score >= RERANK_MIN_SCORE]
+    shards = [candidates[i:i + RERANK_SHARD_SIZE] for i in range(0, len(candidates), RERANK_SHARD_SIZE)]
+    started = [None] * len(shards)  # <- monotonic time each shard started running on the pool
+
+    def run_shard(i, shard):
+        started[i] = time.monotonic()
+        return request_gemini_rerank(resume_skills, resume_profile, shard)
+
+    futures = [rerank_pool.submit(run_shard, i, shard) for i, shard in enumerate(shards)]
+    wait_for_shards(futures, started)
+
+    merged, failed = [], 0
+    for shard, future in zip(shards, futures):
+        shard_ids = {job.id for _, job in shard}
+        entries = []
+        if future.done() and future.exception() is None:
+            entries = [e for e in future.result() if isinstance(e, dict) and e.get("jobId") in shard_ids]
+        if entries:
+            merged.extend({**entry, "rerankScore": gemini_entry_score(entry)} for entry in entries)
+        else:
+            failed += 1
+            if not future.done():
+                future.cancel()
+            elif future.exception() is not None:
+                print(f"❌ Gemini rerank shard failed: {future.exception()}")
+            merged.extend({"jobId": job.id, "rerankScore": score, "rerankFallback": True} for score, job in shard)
+
+    print(f"🧩 Sharded rerank: {len(shards)} shards of <= {RERANK_SHARD_SIZE}, {failed} fell back to embedding order")
+    return sorted(merged, key=lambda entry: (entry.get("rerankFallback", False), -entry["rerankScore"]))
+
+# Load the JobPosting rows of the surviving candidates as (score, job) pairs, best first
+def load_candidate_jobs(db: Session, job_ids, scores):
+    jobs_by_id = {job.id: job for job in db.query(JobPosting).filter(JobPosting.id.in_(job_ids.tolist()))}
+    return [(float(score), jobs_by_id[job_id]) for job_id, score in zip(job_ids.tolist(), scores) if job_id in jobs_by_id]
+
+# Embedding and BM25 first stage; only the fused top candidates are loaded, as (score, job) pairs
+def find_candidate_jobs(resume_skills: list[str], filters: JobMatchFilters = None):
+    resume_embedding = encode_skill_lists([resume_skills])[0]
+    job_ids, scores = retrieve_candidates(resume_skills, resume_embedding, filters=filters)
     db: Session = SessionLocal()
-    jobs = db.query(JobPosting).filter(JobPosting.embedding != None).yield_per(100)
-
-    resume_embedding = embedding_model.encode(", ".join(resume_skills), device="cpu", convert_to_tensor=True)
-    scored_jobs = []
-
-    for job in jobs:
-        try:
-            job_embedding = np.array(job.embedding, dtype=np.float32)
-            score = util.cos_sim(resume_embedding, job_embedding).item()
-            if score > 0.3:
-                scored_jobs.append((score, job))
-        except Exception as e:
-            print(f"⚠️ Skipping job {job.id}: {e}")
-
-    top_jobs = sorted(scored_jobs, key=lambda x: x[0], reverse=True)[:100]
-
-    job_snippets = [{
-        "jobId": job.id,
-        "title": job.job_title or "",
-        "company": job.company or "",
-        "description": job.job_description or "",
-        "skills": job.skills or [],
-    } for _, job in top_jobs]
-
-    ranked = rank_with_gemini(resume_skills, resume_profile, job_snippets)
-    ranked_lookup = {entry["jobId"]: entry for entry in ranked if "jobId" in entry}
-
+    try:
+        return load_candidate_jobs(db, job_ids, scores)
+    finally:
+        db.close()
+
+def get_top_job_matches(resume_skills: list[str], resume_profile: dict, top_n: int = 10, filters: JobMatchFilters = None):
+    top_jobs = find_candidate_jobs(resume_skills, filters)
+    return rerank_job_matches(resume_skills, resume_profile, top_jobs, top_n)
+
+# Build the response entries for (score, job) candidates. Skill overlap is computed locally
+# for every candidate; Gemini adds match reasons and moves the jobs it picked to the front
+# (ordered by merged score in sharded mode, with jobs of failed shards after the scored ones). Jobs Gemini omits (or all jobs, if the call fails)
+# keep their retrieval order.
+def rerank_job_matches(resume_skills: list[str], resume_profile: dict, top_jobs: list, top_n: int = 10):
+    overlaps = candidate_skill_overlaps(resume_skills, top_jobs)
+    ranked = rerank_candidates(resume_skills, resume_profile, top_jobs)
+    return build_match_entries(top_jobs, overlaps, ranked, top_n)
+
+# Local (matched skills, percent) for each (score, job) candidate
+def candidate_skill_overlaps(resume_skills: list[str], top_jobs: list):
+    return score_skill_overlap(resume_skills, [job.skills for _, job in top_jobs], skill_embeddings)
+
+# Gemini rerank entries for the candidates ([] when the rerank is disabled)
+def rerank_candidates(resume_skills: list[str], resume_profile: dict, top_jobs: list):
+    if LLM_RERANK_ENABLED and top_jobs:
+        return rank_with_gemini(resume_skills, resume_profile, top_jobs)
+    return []
+
+# Response entries for the candidates; with ranked=[] this is the embedding-only order
+def build_match_entries(top_jobs: list, overlaps: list, ranked: list, top_n: int = 10):
+    ranked_lookup = {entry["jobId"]: entry for entry in ranked if isinstance(entry, dict) and "jobId" in entry}
+
+    # Ranked jobs first: by merged shard score when sharded (Gemini-scored jobs before the
+    # cosine-scored jobs of failed shards), otherwise in retrieval order
+    def order(item):
+        match_info = ranked_lookup.get(item[0][1].id)
+        if match_info is None:
+            return (True, False, 0.0)
+        return (False, match_info.get("rerankFallback", False), -match_info.get("rerankScore", 0.0))
+
+    candidates = sorted(zip(top_jobs, overlaps), key=order)
     final_jobs = []
-    for score, job in top_jobs:
-        match_info = ranked_lookup.get(job.id)
-        if not match_info:
-            continue
+    for (score, job), (matched_skills, skill_percent) in candidates[:top_n]:
+        match_info = ranked_lookup.get(job.id, {})
 
         final_jobs.append({
             "jobId": job.id,
@@ -195,97 +424,62 @@ def get_top_job_matches(resume_skills: list[str], resume_profile: dict, top_n: i
             "company": job.company,
             "companyProfile": job.company_profile,
             "matchScore": round(score, 2),
-            "matchedSkills": match_info.get("matchedSkills", []),
+            "matchedSkills": matched_skills,
             "matchReason": match_info.get("matchReason", ""),
-            "skillMatchPercent": match_info.get("skillMatchPercent", 0),
+            "skillMatchPercent": skill_percent,
             "industryMatchPercent": match_info.get("industryMatchPercent", 0),
             "experienceMatchPercent": match_info.get("experienceMatchPercent", 0),
         })
 
-    db.close()
-    return final_jobs[:top_n]
-
-def parse_salary(text):
-    try:
-        return int(re.sub(r"[^\d]", "", text))
-    except:
-        return None
+    return final_jobs
+
+# Changes between the embedding-only matches and the reranked ones, for streaming clients.
+# Each final match gets its "rank"; jobs already sent carry only the Gemini fields, new ones
+# are sent in full. Jobs missing from the list have dropped out of the top matches.
+def rerank_patch(draft_matches: list, matches: list) -> list:
+    draft_ids = {match["jobId"] for match in draft_matches}
+    patch = []
+    for rank, match in enumerate(matches):
+        if match["jobId"] in draft_ids:
+            patch.append({"jobId": match["jobId"], "rank": rank,
+                          **{field: match[field] for field in RERANK_FIELDS}})
+        else:
+            patch.append({**match, "rank": rank})
+    return patch
+
+# Mean salary (in thousands) by mean years of experience and by state, for every title at once.
+# One grouped query over the columns parsed at ingestion (see job_facts); both trends come
+# back from the same statement.
+def get_salary_trend(job_matches: list[dict]):
+    titles = list(dict.fromkeys(match["jobTitle"] for match in job_matches))
+    trend = {title: {"progression": {}, "location": {}} for title in titles}
+    if not titles:
+        return trend
+
+    mean_salary = func.avg((JobPosting.salary_min + JobPosting.salary_max) / 2) / 1000
+    has_salary = and_(JobPosting.job_title.in_(titles), JobPosting.salary_min.isnot(None))
+    mean_experience = (JobPosting.experience_min + JobPosting.experience_max) / 2.0
+    progression = (
+        select(literal("progression").label("kind"), JobPosting.job_title, mean_experience.label("bucket"), mean_salary)
+        .where(has_salary, JobPosting.experience_min.isnot(None), JobPosting.experience_max.isnot(None))
+        .group_by(JobPosting.job_title, mean_experience)
+    )
+    location = (
+        select(literal("location").label("kind"), JobPosting.job_title, JobPosting.state.label("bucket"), mean_salary)
+        .where(has_salary, JobPosting.state.isnot(None))
+        .group_by(JobPosting.job_title, JobPosting.state)
+    )
 
-def get_salary_progression_trend(job_title: str):
     db = SessionLocal()
-    jobs = db.query(JobPosting).filter(JobPosting.job_title == job_title).all()
-    trends = {}
-
-    for job in jobs:
-        try:
-            exp_range = re.findall(r'\d+', job.experience)
-            if len(exp_range) == 2:
-                mean_exp = (int(exp_range[0]) + int(exp_range[1])) / 2
-            else:
-                continue
-
-            salary = job.salary_range.split("-")
-            if len(salary) == 2:
-                min_sal = parse_salary(salary[0])
-                max_sal = parse_salary(salary[1])
-                if min_sal is None or max_sal is None:
-                    continue
-                mean_salary = (min_sal + max_sal) / 2
-
-                if mean_exp not in trends:
-                    trends[mean_exp] = []
-                trends[mean_exp].append(mean_salary)
-        except:
-            continue
-
-    db.close()
-    return {k: sum(v)/len(v) for k, v in trends.items()}
-
-def get_salary_location_trend(job_title: str):
-    db = SessionLocal()
-    jobs = db.query(JobPosting).filter(JobPosting.job_title == job_title).all()
-    trends = {}
-
-    for job in jobs:
-        try:
-            salary = job.salary_range.split("-")
-            if len(salary) == 2:
-                min_sal = parse_salary(salary[0])
-                max_sal = parse_salary(salary[1])
-                if min_sal is None or max_sal is None:
-                    continue
-                mean_salary = (min_sal + max_sal) / 2
-
-                if job.location not in trends:
-                    trends[job.location] = []
-                trends[job.location].append(mean_salary)
-        except:
-            continue
-
-    db.close()
-    for k in list(trends.keys()):
-        if len(k) > 2:
-            state = k[-2:]
-            if state not in trends:
-                trends[state] = []
-            trends[state].extend(trends[k])
-            del trends[k]
-    return {k: sum(v)/len(v) for k, v in trends.items()}
-
-def get_salary_trend(job_matches: list[dict]):
-    titles = []
-    for match in job_matches:
-        if match["jobTitle"] not in titles:
-            titles.append(match["jobTitle"])
-    trend = {}
-    for title in titles:
-        trend[title] = {
-            "progression": get_salary_progression_trend(title),
-            "location": get_salary_location_trend(title)
-        }
+    try:
+        for kind, title, bucket, salary in db.execute(union_all(progression, location)):
+            trend[title][kind][float(bucket) if kind == "progression" else bucket] = salary
+    finally:
+        db.close()
     return trend
 
 def show_skills_wordcloud(skill_freq):
+    from wordcloud import WordCloud
     wordcloud = WordCloud(
         width=1000,
         height=500,
@@ -299,23 +493,130 @@ def show_skills_wordcloud(skill_freq):
     ).generate_from_frequencies(skill_freq)
     wordcloud.to_file("wordcloud.png")
 
-def process_resume_and_match_jobs(pdf_bytes: bytes) -> dict:
+# Stage graph of the single-resume pipeline. Retrieval only needs the skills, so it runs
+# while the profile call is still in flight; the word cloud runs alongside everything.
+def build_resume_pipeline(filters: JobMatchFilters = None) -> StageGraph:
+    graph = StageGraph("Resume pipeline")
+    if RESUME_EXTRACTION_MODE == "fused":
+        graph.stage("extraction", extract_resume_skills_and_profile, ["text"])
+        graph.stage("skills", lambda extraction: extraction[0], ["extraction"])
+        graph.stage("profile", lambda extraction: extraction[1], ["extraction"])
+    else:
+        graph.stage("skills", extract_skills_with_gemini, ["text"])
+        graph.stage("profile", extract_resume_profile, ["text"])
+    graph.stage("word_cloud", extract_word_cloud, ["text"])
+    graph.stage("candidates", lambda skills: find_candidate_jobs(skills, filters), ["skills"])
+    graph.stage("overlaps", candidate_skill_overlaps, ["skills", "candidates"])
+    graph.stage("draft_matches", lambda candidates, overlaps: build_match_entries(candidates, overlaps, []),
+                ["candidates", "overlaps"])
+    graph.stage("ranked", rerank_candidates, ["skills", "profile", "candidates"])
+    # Also waits for draft_matches, so streamed rerank patches always follow the draft
+    graph.stage("matches", lambda candidates, overlaps, ranked, _draft: build_match_entries(candidates, overlaps, ranked),
+                ["candidates", "overlaps", "ranked", "draft_matches"])
+    graph.stage("salary_trend", get_salary_trend, ["matches"])
+    return graph
+
+# Response sections streamed as their stages finish, by stage name
+STREAMED_SECTIONS = {
+    "skills": "resume_skills",
+    "profile": "resumeProfile",
+    "word_cloud": "word_cloud_skills_freq",
+    "draft_matches": "matches",
+    "salary_trend": "salaryTrend",
+}
+
+# emit(section, data), if given, receives each response section as soon as it is ready:
+# the embedding-only "matches" first, then a "rerank" patch (see rerank_patch)
+def process_resume_and_match_jobs(pdf_bytes: bytes, filters: JobMatchFilters = None, emit=None) -> dict:
     try:
         resume_text = extract_text_from_pdf_bytes(pdf_bytes)
-        resume_skills = extract_skills_with_gemini(resume_text)
-        resume_profile = extract_resume_profile(resume_text)
-        matches = get_top_job_matches(resume_skills, resume_profile)
-        word_cloud_skills_freq = extract_skills(resume_text)
-        salary_trend = get_salary_trend(matches)
+        on_stage = None
+        if emit is not None:
+            draft = {}
+
+            def on_stage(name, result):
+                if name == "draft_matches":
+                    draft["matches"] = result
+                if name == "matches":
+                    emit("rerank", rerank_patch(draft["matches"], result))
+                elif name in STREAMED_SECTIONS:
+                    emit(STREAMED_SECTIONS[name], result)
+
+        results = build_resume_pipeline(filters).run(pipeline_pool, {"text": resume_text}, on_stage)
 
         return {
-            "resume_skills": resume_skills,
-            "matches": matches,
-            "word_cloud_skills_freq": word_cloud_skills_freq,
-            "salaryTrend": salary_trend,
-            "resumeProfile": resume_profile
+            "resume_skills": results["skills"],
+            "matches": results["matches"],
+            "word_cloud_skills_freq": results["word_cloud"],
+            "salaryTrend": results["salary_trend"],
+            "resumeProfile": results["profile"]
         }
     except Exception as e:
         print("❌ Error in resume processing:", e)
         traceback.print_exc()
         raise
+
+# Match many resumes at once. Text extraction runs in parallel processes, all skill lists are
+# encoded with one model call and scored against the job matrix with one matrix-matrix product.
+# Each entry has the same keys as process_resume_and_match_jobs, or an "error" key.
+def process_resumes_batch(pdf_files: list[bytes], filters: JobMatchFilters = None) -> list[dict]:
+    n_resumes = len(pdf_files)
+    results = [None] * n_resumes
+
+    # 1. PDF text extraction in worker processes
+    texts = [None] * n_resumes
+    futures = [submit_cpu_bound(extract_text_from_pdf, pdf_bytes) for pdf_bytes in pdf_files]
+    for i, future in enumerate(futures):
+        try:
+            texts[i] = future.result().strip()
+        except Exception as e:
+            results[i] = {"error": f"Could not read PDF: {e}"}
+    valid = [i for i in range(n_resumes) if texts[i] is not None]
+
+    with ThreadPoolExecutor(max_workers=BATCH_LLM_CONCURRENCY) as pool:
+        # 2. Independent per-resume extraction calls, all in flight together
+        word_cloud_futures = {i: pool.submit(extract_word_cloud, texts[i]) for i in valid}
+        if RESUME_EXTRACTION_MODE == "fused":
+            fused_futures = {i: pool.submit(extract_resume_skills_and_profile, texts[i]) for i in valid}
+            resume_skills = {i: fused_futures[i].result()[0] for i in valid}
+            resume_profiles = {i: fused_futures[i].result()[1] for i in valid}
+        else:
+            skills_futures = {i: pool.submit(extract_skills_with_gemini, texts[i]) for i in valid}
+            profile_futures = {i: pool.submit(extract_resume_profile, texts[i]) for i in valid}
+            resume_skills = {i: skills_futures[i].result() for i in valid}
+            resume_profiles = {i: profile_futures[i].result() for i in valid}
+
+        # 3. One batched encode and one matrix-matrix scoring pass for every resume
+        candidates = {}
+        if valid:
+            skill_lists = [resume_skills[i] for i in valid]
+            embeddings = encode_skill_lists(skill_lists)
+            for i, found in zip(valid, retrieve_candidates_batch(skill_lists, embeddings, filters=filters)):
+                candidates[i] = found
+
+        # 4. Per-resume rerank and salary trends
+        def finish(i):
+            db: Session = SessionLocal()
+            try:
+                top_jobs = load_candidate_jobs(db, *candidates[i])
+                matches = rerank_job_matches(resume_skills[i], resume_profiles[i], top_jobs)
+            finally:
+                db.close()
+            return {
+                "resume_skills": resume_skills[i],
+                "matches": matches,
+                "word_cloud_skills_freq": word_cloud_futures[i].result(),
+                "salaryTrend": get_salary_trend(matches),
+                "resumeProfile": resume_profiles[i]
+            }
+
+        finish_futures = {i: pool.submit(finish, i) for i in valid}
+        for i in valid:
+            try:
+                results[i] = finish_futures[i].result()
+            except Exception as e:
+                print(f"❌ Error in batch resume {i}:", e)
+                traceback.print_exc()
+                results[i] = {"error": f"Error processing resume: {e}"}
+
+    return results
@@ -0,0 +1,21 @@
+# Helpers to turn the free-text salary_range values into numbers.
+import re
+
+# Amounts like "$59K", "85,000" or "120000.00"
+SALARY_AMOUNT = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*([kK])?")
+
+
+# Parse a salary range into (min, max) in dollars, or (None, None) if there is no amount.
+# Bare numbers below 1000 are read as thousands, like the "$59K-$99K" style ranges.
+def parse_salary_range(text):
+    if not isinstance(text, str):
+        return None, None
+    amounts = []
+    for number, thousands in SALARY_AMOUNT.findall(text):
+        value = float(number.replace(",", ""))
+        if thousands or value < 1000:
+            value *= 1000
+        amounts.append(value)
+    if not amounts:
+        return None, None
+    return min(amounts), max(amounts)
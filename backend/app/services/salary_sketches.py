@@ -0,0 +1,194 @@
+# Salary distributions per (title, state) and per (title, experience), kept as quantile sketches.
+# Each sketch is a DDSketch: salaries are counted in logarithmic buckets, so every quantile it
+# returns is within SALARY_SKETCH_ACCURACY (relative) of the true value. Buckets are plain
+# counts, which makes the sketches mergeable and lets a deleted or edited job be subtracted
+# exactly. Sketches are updated in the same transaction as the job rows. They are stored as a
+# few bytes per bucket, so reading the percentiles of a title costs the same at any catalog size.
+import math
+import struct
+from collections import defaultdict
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.salary_sketch import SalarySketch
+from app.services.job_facts import job_facts
+
+# Constants
+SALARY_SKETCH_ACCURACY = 0.01  # relative error of the quantiles
+SALARY_HISTOGRAM_BIN = 10000   # dollars per histogram bin
+QUANTILES = {"p10": 0.1, "p50": 0.5, "p90": 0.9}
+HEADER = struct.Struct("<fI")  # accuracy, number of buckets
+
+
+# DDSketch over positive values; bucket counts keyed by ceil(log_gamma(value))
+class DDSketch:
+    def __init__(self, accuracy: float = SALARY_SKETCH_ACCURACY, counts: dict = None):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.counts = counts or {}
+        self.count = sum(self.counts.values())
+
+    def key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self.log_gamma)
+
+    # Representative value of a bucket (within the accuracy of every value in it)
+    def value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1):
+        if value is None or value <= 0:
+            return
+        key = self.key(value)
+        remaining = self.counts.get(key, 0) + count
+        if remaining > 0:
+            self.counts[key] = remaining
+        else:
+            self.counts.pop(key, None)
+        self.count = sum(self.counts.values())
+
+    def remove(self, value: float):
+        self.add(value, -1)
+
+    def quantile(self, q: float):
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen > rank:
+                return self.value(key)
+        return self.value(max(self.counts))
+
+    # Counts per fixed-width salary bin, lowest bin first
+    def histogram(self, bin_width: float = SALARY_HISTOGRAM_BIN) -> list[dict]:
+        bins = defaultdict(int)
+        for key, count in self.counts.items():
+            bins[int(self.value(key) // bin_width)] += count
+        return [{"min": b * bin_width, "max": (b + 1) * bin_width, "count": bins[b]} for b in sorted(bins)]
+
+    # Accuracy and bucket count, then (int16 key, uint32 count) pairs: 6 bytes per bucket
+    def to_bytes(self) -> bytes:
+        keys = sorted(self.counts)
+        return HEADER.pack(self.accuracy, len(keys)) + b"".join(
+            struct.pack("<hI", key, self.counts[key]) for key in keys
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "DDSketch":
+        accuracy, n_buckets = HEADER.unpack_from(data)
+        pairs = struct.iter_unpack("<hI", data[HEADER.size:HEADER.size + 6 * n_buckets])
+        return cls(accuracy, dict(pairs))
+
+
+# Sketch keys and the salary a job contributes to them, from its title and raw fields
+def sketch_entries(job_title, salary_range, experience, location):
+    facts = job_facts(salary_range, experience, location)
+    if not job_title or facts["salary_min"] is None or facts["salary_max"] is None:
+        return []
+    salary = (facts["salary_min"] + facts["salary_max"]) / 2
+    entries = []
+    if facts["state"]:
+        entries.append(((job_title, "state", facts["state"]), salary))
+    if facts["experience_min"] is not None and facts["experience_max"] is not None:
+        mean_years = (facts["experience_min"] + facts["experience_max"]) / 2
+        entries.append(((job_title, "experience", str(mean_years)), salary))
+    return entries
+
+
+# Apply the salary changes of the jobs about to be flushed to their sketches.
+# Old values are read from the database (still unchanged before the flush), so edits and
+# deletes are subtracted exactly even if the session never loaded the previous values.
+def update_salary_sketches(session: Session, new_jobs: list, dirty_jobs: list, deleted_jobs: list):
+    from app.models.job import JobPosting
+    deltas = defaultdict(list)
+
+    def collect(job_fields, sign):
+        for key, salary in sketch_entries(*job_fields):
+            deltas[key].append((salary, sign))
+
+    raw_fields = lambda job: (job.job_title, job.salary_range, job.experience, job.location)
+    with session.no_autoflush:
+        old_ids = [job.id for job in dirty_jobs + deleted_jobs if job.id is not None]
+        old_rows = {}
+        if old_ids:
+            rows = session.execute(
+                select(JobPosting.id, JobPosting.job_title, JobPosting.salary_range,
+                       JobPosting.experience, JobPosting.location).where(JobPosting.id.in_(old_ids))
+            )
+            old_rows = {row[0]: tuple(row[1:]) for row in rows}
+
+        for job in new_jobs:
+            collect(raw_fields(job), +1)
+        for job in dirty_jobs:
+            old, new = old_rows.get(job.id), raw_fields(job)
+            if old != new:
+                if old is not None:
+                    collect(old, -1)
+                collect(new, +1)
+        for job in deleted_jobs:
+            if job.id in old_rows:
+                collect(old_rows[job.id], -1)
+        if not deltas:
+            return
+
+        titles = {key[0] for key in deltas}
+        stored = {
+            (row.job_title, row.kind, row.bucket): row
+            for row in session.scalars(select(SalarySketch).where(SalarySketch.job_title.in_(titles)))
+        }
+        for key, changes in deltas.items():
+            row = stored.get(key)
+            sketch = DDSketch.from_bytes(row.data) if row is not None else DDSketch()
+            for salary, sign in changes:
+                sketch.add(salary, sign)
+            if sketch.count == 0:
+                if row is not None:
+                    session.delete(row)
+                continue
+            if row is None:
+                row = SalarySketch(job_title=key[0], kind=key[1], bucket=key[2])
+                session.add(row)
+            row.count, row.data = sketch.count, sketch.to_bytes()
+
+
+# Recompute every sketch from the job rows (initial build, or repair after bulk SQL edits)
+def rebuild_salary_sketches(db: Session, batch_size: int = 5000) -> int:
+    from app.models.job import JobPosting
+    sketches = defaultdict(DDSketch)
+    rows = db.execute(
+        select(JobPosting.job_title, JobPosting.salary_range, JobPosting.experience, JobPosting.location)
+        .execution_options(yield_per=batch_size)
+    )
+    for row in rows:
+        for key, salary in sketch_entries(*row):
+            sketches[key].add(salary)
+
+    db.query(SalarySketch).delete()
+    db.add_all(
+        SalarySketch(job_title=title, kind=kind, bucket=bucket, count=sketch.count, data=sketch.to_bytes())
+        for (title, kind, bucket), sketch in sketches.items()
+    )
+    db.commit()
+    return len(sketches)
+
+
+# Count, percentiles and histogram of one sketch
+def summarize_sketch(sketch: DDSketch) -> dict:
+    summary = {"count": sketch.count}
+    for name, q in QUANTILES.items():
+        summary[name] = round(sketch.quantile(q), 2)
+    summary["histogram"] = sketch.histogram()
+    return summary
+
+
+# Salary distributions of a title by state and by mean years of experience (None if unknown)
+def get_salary_distribution(db: Session, job_title: str):
+    rows = db.scalars(select(SalarySketch).where(SalarySketch.job_title == job_title)).all()
+    if not rows:
+        return None
+    result = {"jobTitle": job_title, "accuracy": SALARY_SKETCH_ACCURACY, "byState": {}, "byExperience": {}}
+    for row in rows:
+        section = "byState" if row.kind == "state" else "byExperience"
+        result[section][row.bucket] = summarize_sketch(DDSketch.from_bytes(row.data))
+    return result
@@ -0,0 +1,82 @@
+# Aho-Corasick matcher for a fixed skills vocabulary.
+# The automaton is built once from the keywords. It then finds every keyword in a text in
+# a single pass, whatever the size of the vocabulary, instead of one substring search per
+# keyword. A match only counts when it stands as a whole word ("java" is not found in
+# "javascript"), and every occurrence is counted.
+from collections import deque
+
+
+# A character that continues a word; "+" and "#" keep c++ and c# whole
+def is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch in "_+#"
+
+
+class SkillAutomaton:
+    def __init__(self, keywords):
+        self.keywords = []   # <- keyword spelling reported in the counts, first one wins
+        self._goto = [{}]    # <- trie transitions per state
+        self._fail = [0]
+        self._output = [[]]  # <- (keyword index, length) of every keyword ending in a state
+        seen = {}
+        for keyword in keywords:
+            if not isinstance(keyword, str) or not keyword.strip():
+                continue
+            lowered = keyword.strip().lower()
+            if lowered in seen:
+                continue
+            seen[lowered] = len(self.keywords)
+            self.keywords.append(keyword.strip())
+            self._insert(lowered, seen[lowered])
+        self._link()
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def _insert(self, keyword: str, index: int):
+        state = 0
+        for ch in keyword:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((index, len(keyword)))
+
+    # Failure links in breadth-first order; each state also inherits the outputs of its fallback
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+                queue.append(child)
+
+    # Number of whole-word occurrences of each keyword found in text
+    def count(self, text: str) -> dict:
+        if not isinstance(text, str) or not text:
+            return {}
+        text = text.lower()
+        goto, fail, output = self._goto, self._fail, self._output
+        last = len(text) - 1
+        counts = {}
+        state = 0
+        for end, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for index, length in output[state]:
+                start = end - length + 1
+                if start > 0 and is_word_char(text[start - 1]):
+                    continue
+                if end < last and is_word_char(text[end + 1]):
+                    continue
+                keyword = self.keywords[index]
+                counts[keyword] = counts.get(keyword, 0) + 1
+        return counts
@@ -0,0 +1,161 @@
+# Local skill-overlap scoring between a resume and candidate jobs.
+# Skill strings are canonicalized (case, spacing, common aliases). A job skill counts as
+# matched when the resume has the same canonical skill or a close embedding neighbour
+# ("postgres" ~ "postgresql database"). All candidates are scored together with one
+# similarity matrix, so matchedSkills and skillMatchPercent no longer depend on the LLM.
+import os
+import re
+import threading
+import numpy as np
+from app.services.job_index import normalize_rows
+
+# Cosine similarity at which two different skill strings count as synonyms
+SKILL_SYNONYM_THRESHOLD = float(os.getenv("SKILL_SYNONYM_THRESHOLD", "0.75"))
+# Distinct skills kept in the embedding cache before it starts over
+SKILL_EMBEDDING_CACHE_MAX = int(os.getenv("SKILL_EMBEDDING_CACHE_MAX", "50000"))
+SKILL_BUFFER_INITIAL_ROWS = 1024
+
+# Common spellings mapped to one canonical name
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue.js",
+    "golang": "go",
+    "py": "python",
+    "python3": "python",
+    "postgres": "postgresql",
+    "mssql": "sql server",
+    "ms sql server": "sql server",
+    "k8s": "kubernetes",
+    "gcp": "google cloud",
+    "google cloud platform": "google cloud",
+    "amazon web services": "aws",
+    "ms excel": "excel",
+    "microsoft excel": "excel",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "cv": "computer vision",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "tf": "tensorflow",
+    "ci/cd": "continuous integration",
+    "ci cd": "continuous integration",
+    "oop": "object-oriented programming",
+    "power bi": "powerbi",
+}
+
+
+# Canonical form of a skill string: lower-case, single spaces, no edge punctuation, aliases applied
+def canonical_skill(skill) -> str:
+    if not isinstance(skill, str):
+        return ""
+    key = re.sub(r"\s+", " ", skill.lower()).strip(" .,;:-()[]'\"")
+    return SKILL_ALIASES.get(key, key)
+
+
+# Job skills are stored as a list; older rows may hold one comma-separated string
+def job_skill_list(skills) -> list[str]:
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    if not isinstance(skills, list):
+        return []
+    return [s.strip() for s in skills if isinstance(s, str) and canonical_skill(s)]
+
+
+# Normalized embedding for every distinct canonical skill, encoded once per process.
+# Rows live in a preallocated buffer that doubles when full, so adding skills is amortized O(1).
+# Past max_entries the cache starts over, keeping only the skills of the current lookup.
+# Readers keep the matrix they were given: rows are only appended, and a reset or a growth
+# switches to a new buffer.
+class SkillEmbeddingCache:
+    def __init__(self, encode, max_entries: int = SKILL_EMBEDDING_CACHE_MAX):
+        self._encode = encode
+        self.max_entries = max_entries
+        self._rows = {}
+        self._buffer = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    # Write vectors for new skills, resetting or growing the buffer first (caller holds the lock)
+    def _insert(self, needed: list[str], vectors: dict):
+        count = len(self._rows)
+        if vectors and count + len(vectors) > self.max_entries:
+            kept = [s for s in needed if s in self._rows]
+            old = self._buffer
+            self._buffer = np.empty((max(SKILL_BUFFER_INITIAL_ROWS, len(kept) + len(vectors)), old.shape[1]), dtype=np.float32)
+            self._buffer[:len(kept)] = old[[self._rows[s] for s in kept]]
+            self._rows = {s: row for row, s in enumerate(kept)}
+            count = len(kept)
+            print(f"🧹 Skill embedding cache reached {self.max_entries} skills; kept the {count} in use.")
+        if not vectors:
+            return
+        dim = next(iter(vectors.values())).shape[0]
+        if self._buffer is None:
+            self._buffer = np.empty((max(SKILL_BUFFER_INITIAL_ROWS, len(vectors)), dim), dtype=np.float32)
+        if count + len(vectors) > self._buffer.shape[0]:
+            grown = np.empty((max(2 * self._buffer.shape[0], count + len(vectors)), dim), dtype=np.float32)
+            grown[:count] = self._buffer[:count]
+            self._buffer = grown
+        for offset, (skill, vector) in enumerate(vectors.items()):
+            self._buffer[count + offset] = vector
+            self._rows[skill] = count + offset
+
+    # Return (matrix, row per skill); unseen skills are encoded together in one call
+    def lookup(self, skills: list[str]):
+        unique = list(dict.fromkeys(skills))
+        encoded = {}
+        while True:
+            with self._lock:
+                absent = [s for s in unique if s not in self._rows]
+                todo = [s for s in absent if s not in encoded]
+                if not todo:
+                    self._insert(unique, {s: encoded[s] for s in absent})
+                    matrix = self._buffer[:len(self._rows)] if self._buffer is not None else np.empty((0, 0), dtype=np.float32)
+                    return matrix, np.array([self._rows[s] for s in skills], dtype=np.int64)
+            # Encode outside the lock; skills dropped by a concurrent reset come back here
+            encoded.update(zip(todo, normalize_rows(self._encode(todo))))
+
+
+# Matched job skills and skill match percent for every candidate job at once.
+# Returns one (matched skills, percent of the job's skills covered) pair per job.
+def score_skill_overlap(resume_skills: list[str], job_skill_lists: list, cache: SkillEmbeddingCache,
+                        threshold: float = SKILL_SYNONYM_THRESHOLD):
+    resume = list(dict.fromkeys(c for c in map(canonical_skill, resume_skills) if c))
+
+    # One entry per distinct canonical skill of each job, remembering the original spelling
+    names, canonical, owners = [], [], []
+    for job_number, skills in enumerate(job_skill_lists):
+        unique = {}
+        for skill in job_skill_list(skills):
+            unique.setdefault(canonical_skill(skill), skill)
+        for key, name in unique.items():
+            names.append(name)
+            canonical.append(key)
+            owners.append(job_number)
+    n_jobs = len(job_skill_lists)
+    if not resume or not canonical:
+        return [([], 0.0) for _ in range(n_jobs)]
+
+    matrix, rows = cache.lookup(resume + canonical)
+    resume_rows, job_rows = rows[:len(resume)], rows[len(resume):]
+    exact = np.isin(job_rows, resume_rows)
+    nearest = (matrix[job_rows] @ matrix[resume_rows].T).max(axis=1)
+    matched = exact | (nearest >= threshold)
+
+    owners = np.asarray(owners, dtype=np.int64)
+    totals = np.bincount(owners, minlength=n_jobs)
+    hits = np.bincount(owners, weights=matched, minlength=n_jobs)
+    percents = np.round(100.0 * hits / np.maximum(totals, 1), 1)
+
+    matched_names = [[] for _ in range(n_jobs)]
+    for position in np.flatnonzero(matched):
+        matched_names[owners[position]].append(names[position])
+    return [(matched_names[j], float(percents[j])) for j in range(n_jobs)]
@@ -0,0 +1,140 @@
+# Queue for resume matching tasks (no external broker).
+# A submit returns a task id at once. A bounded pool of worker threads in the receiving process
+# runs the task, and the client polls for the status and result. Task records live in a small
+# SQLite file, so with several uvicorn workers the poll can land on any of them. Submits are
+# rejected once too many tasks are queued or running in the process, so load beyond the pool's
+# capacity becomes backpressure instead of piled-up HTTP connections. Finished tasks are kept
+# for a while and then expire.
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Constants
+RESUME_TASK_WORKERS = int(os.getenv("RESUME_TASK_WORKERS", "4"))
+RESUME_TASK_MAX_PENDING = int(os.getenv("RESUME_TASK_MAX_PENDING", "100"))  # queued + running, per process
+RESUME_TASK_RESULT_TTL_SECONDS = float(os.getenv("RESUME_TASK_RESULT_TTL_SECONDS", "3600"))
+RESUME_TASK_DB_PATH = os.getenv("RESUME_TASK_DB_PATH", "data/resume_tasks.sqlite")  # "" keeps tasks in memory (one worker only)
+RETRY_AFTER_SECONDS = 5  # hint sent with 429 responses
+LOST_TASK_ERROR = "Task was lost: the worker running it stopped"
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+# Raised by submit() when the queue is full
+class QueueFullError(Exception):
+    pass
+
+
+# JSON for task results; numpy scalars and arrays become plain numbers and lists
+def _to_json(value) -> str:
+    return json.dumps(value, default=lambda v: v.tolist() if hasattr(v, "tolist") else str(v))
+
+
+# Task records by id in a SQLite table shared by every worker process
+class TaskQueue:
+    def __init__(self, name: str = "tasks", workers: int = RESUME_TASK_WORKERS,
+                 max_pending: int = RESUME_TASK_MAX_PENDING, ttl_seconds: float = RESUME_TASK_RESULT_TTL_SECONDS,
+                 path: str = RESUME_TASK_DB_PATH):
+        self.max_pending = max_pending
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._db = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    # SQLite connection, opened on first use (caller holds the lock)
+    def _connection(self):
+        if self._db is None:
+            if self.path:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path or ":memory:", check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, created REAL NOT NULL, "
+                "started REAL, finished REAL, result TEXT, error TEXT)"
+            )
+            self._db.commit()
+        return self._db
+
+    # Drop finished tasks older than the TTL. Tasks still unfinished after the TTL belonged to
+    # a worker that stopped, so they are marked failed (caller holds the lock)
+    def _expire(self, db, now: float):
+        cutoff = now - self.ttl_seconds
+        db.execute("DELETE FROM tasks WHERE finished IS NOT NULL AND finished < ?", (cutoff,))
+        db.execute(
+            "UPDATE tasks SET status = ?, error = ?, finished = ? WHERE finished IS NULL AND created < ?",
+            (FAILED, LOST_TASK_ERROR, now, cutoff),
+        )
+
+    # Run one task on a worker thread and record its outcome
+    def _run(self, task_id: str, fn, args):
+        with self._lock:
+            db = self._connection()
+            db.execute("UPDATE tasks SET status = ?, started = ? WHERE id = ?", (RUNNING, time.time(), task_id))
+            db.commit()
+        try:
+            result, error, status = _to_json(fn(*args)), None, DONE
+        except Exception as e:
+            result, error, status = None, str(e), FAILED
+            print(f"❌ Task {task_id} failed:", e)
+        with self._lock:
+            db = self._connection()
+            db.execute(
+                "UPDATE tasks SET status = ?, result = ?, error = ?, finished = ? WHERE id = ?",
+                (status, result, error, time.time(), task_id),
+            )
+            db.commit()
+            self._pending -= 1
+
+    # Queue fn(*args) and return the task id; raises QueueFullError when at capacity
+    def submit(self, fn, *args) -> str:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFullError(f"{self._pending} tasks pending (limit {self.max_pending})")
+            db = self._connection()
+            now = time.time()
+            self._expire(db, now)
+            task_id = uuid.uuid4().hex
+            db.execute("INSERT INTO tasks (id, status, created) VALUES (?, ?, ?)", (task_id, QUEUED, now))
+            db.commit()
+            self._pending += 1
+        self._pool.submit(self._run, task_id, fn, args)
+        return task_id
+
+    # Snapshot of a task (status, timings and the result once done), or None if unknown or expired
+    def get(self, task_id: str):
+        with self._lock:
+            db = self._connection()
+            self._expire(db, time.time())
+            db.commit()
+            row = db.execute(
+                "SELECT status, created, started, finished, result, error FROM tasks WHERE id = ?", (task_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            status, created, started, finished, result, error = row
+            info = {"taskId": task_id, "status": status, "pendingTasks": self._pending,
+                    "created": created, "started": started, "finished": finished}
+            if status == DONE:
+                info["result"] = json.loads(result)
+            elif status == FAILED:
+                info["error"] = error
+            return info
+
+    # Task counts by status (all workers) and this process's pending count
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {status: 0 for status in (QUEUED, RUNNING, DONE, FAILED)}
+            rows = self._connection().execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+            counts.update(dict(rows))
+            return {**counts, "pending": self._pending, "maxPending": self.max_pending}
+
+
+# Shared queue for /resume/tasks
+resume_tasks = TaskQueue("resume-task")
@@ -0,0 +1,55 @@
+# Tests for the job embedding index built on top of the shared embedding store
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db.database import Base
+from app.models.job import JobPosting
+from app.services.embedding_store import EmbeddingStore
+from app.services.job_index import JobEmbeddingIndex, normalize_rows
+
+
+# In-memory database holding three embedded jobs, and a store exported from it
+def make_index(tmp_path):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    vectors = normalize_rows(np.eye(3, 4, dtype=np.float32) + 0.1)
+    for job_id, vector in zip((1, 2, 3), vectors):
+        db.add(JobPosting(id=job_id, job_title=f"Job {job_id}", embedding=vector))
+    db.commit()
+
+    store = EmbeddingStore(str(tmp_path / "store"))
+    store.rewrite(np.array([1, 2, 3]), vectors)
+    index = JobEmbeddingIndex(store)
+    index.build(db)
+    return db, index, vectors
+
+
+# A job deleted from the table must not come back from the store on the next build
+def test_deleted_job_is_not_returned_from_store(tmp_path):
+    db, index, vectors = make_index(tmp_path)
+    ids, _ = index.searcher.search(vectors[0], 3)
+    assert 1 in index.ids[ids].tolist()
+
+    db.delete(db.get(JobPosting, 1))
+    db.commit()
+    index.build(db)
+
+    assert sorted(index.ids.tolist()) == [2, 3]
+    positions, scores = index.searcher.search(normalize_rows(vectors[0]), 3)
+    assert sorted(index.ids[positions].tolist()) == [2, 3]
+    assert np.allclose(index.matrix[np.arange(2)], vectors[index.ids - 1])
+
+
+# Jobs embedded only in the table are still added next to the store rows
+def test_jobs_missing_from_store_are_read_from_database(tmp_path):
+    db, index, vectors = make_index(tmp_path)
+    db.add(JobPosting(id=4, job_title="Job 4", embedding=vectors[2]))
+    db.delete(db.get(JobPosting, 2))
+    db.commit()
+    index.build(db)
+
+    assert sorted(index.ids.tolist()) == [1, 3, 4]
+    positions, _ = index.searcher.search(normalize_rows(vectors[2]), 2)
+    assert sorted(index.ids[positions].tolist()) == [3, 4]
@@ -0,0 +1,50 @@
+# Tests for the StageGraph callback ordering used by the streamed resume analysis
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.services.pipeline import StageGraph
+
+
+# "c" needs "a" and "b"; "a"'s callback is slow, so "b" and "c" could overtake it
+def test_on_stage_runs_before_dependents_with_slow_sibling():
+    graph = (StageGraph("test")
+             .stage("a", lambda x: time.sleep(0.01) or x + 1, ["x"])
+             .stage("b", lambda x: time.sleep(0.05) or x + 2, ["x"])
+             .stage("c", lambda a, b: a + b, ["a", "b"]))
+    order, active = [], []
+
+    def on_stage(name, result):
+        active.append(name)
+        assert len(active) == 1, "on_stage calls overlapped"
+        if name == "a":
+            time.sleep(0.2)
+        order.append(name)
+        active.remove(name)
+
+    with ThreadPoolExecutor(4) as pool:
+        results = graph.run(pool, {"x": 1}, on_stage)
+
+    assert results["c"] == 5
+    assert order.index("c") > order.index("a")
+    assert order.index("c") > order.index("b")
+
+
+# A dependent's callback always sees its dependency's callback first, across many runs
+def test_on_stage_order_matches_dependencies():
+    graph = (StageGraph("test")
+             .stage("draft", lambda x: x, ["x"])
+             .stage("ranked", lambda x: time.sleep(0.001) or x, ["x"])
+             .stage("final", lambda ranked, draft: ranked + draft, ["ranked", "draft"]))
+    with ThreadPoolExecutor(8) as pool:
+        for _ in range(50):
+            seen = []
+            lock = threading.Lock()
+
+            def on_stage(name, result):
+                if name == "draft":
+                    time.sleep(0.002)
+                with lock:
+                    seen.append(name)
+
+            graph.run(pool, {"x": 1}, on_stage)
+            assert seen[-1] == "final"
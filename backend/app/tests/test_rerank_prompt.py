@@ -0,0 +1,25 @@
+# Tests for the token-budgeted Gemini rerank prompt
+from types import SimpleNamespace
+from app.services.rerank_prompt import build_rerank_prompt
+
+
+def make_job(job_id):
+    return SimpleNamespace(id=job_id, job_title="Data Engineer", company="Acme",
+                           job_description="Build pipelines", skills=["python", "sql"])
+
+
+# The footer is appended as is, so its JSON example must not keep format-string escapes
+def test_prompt_shows_plain_json_example():
+    prompt, job_ids, _ = build_rerank_prompt(["python"], {"industry": "tech"}, [(0.9, make_job(1))])
+    assert job_ids == [1]
+    assert '{\n    "jobId"' in prompt
+    assert "{{" not in prompt and "}}" not in prompt
+
+
+# Candidates below the cutoff are dropped; the best job is kept even over budget
+def test_prompt_respects_cutoff_and_budget():
+    candidates = [(0.9, make_job(1)), (0.8, make_job(2)), (0.1, make_job(3))]
+    _, job_ids, report = build_rerank_prompt(["python"], {}, candidates, token_budget=1, min_score=0.35)
+    assert job_ids == [1]
+    assert report["droppedBelowScore"] == 1
+    assert report["droppedOverBudget"] == 1